@@ -0,0 +1 @@
+Add an `auto_pipeline` option to `Redis` that sends the commands issued concurrently in a single write.
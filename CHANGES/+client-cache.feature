@@ -0,0 +1 @@
+Add `ClientCache`, a client-side cache of read replies kept coherent with CLIENT TRACKING, enabled with `Redis(client_cache=...)`.
@@ -0,0 +1 @@
+Add `aioredis.cluster.RedisCluster`, a Redis Cluster client with cluster pipelines.
@@ -0,0 +1 @@
+Add the `before_command` and `after_command` instrumentation hooks around every command and pipeline.
@@ -0,0 +1 @@
+Add a `direct_transport` option making connections read and write through an `asyncio.Protocol` instead of stream readers and writers.
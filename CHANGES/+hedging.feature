@@ -0,0 +1 @@
+Add `HedgePolicy` for hedged reads to replicas with `ReadWriteRedis` and `Sentinel.slave_for(hedge=...)`.
@@ -0,0 +1 @@
+Add `Instrumentation` hooks receiving pool and connection timings.
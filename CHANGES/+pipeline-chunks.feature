@@ -0,0 +1 @@
+Add the `chunk_size` argument to `Pipeline.execute`, sending large pipelines in chunks while their replies are read.
@@ -0,0 +1 @@
+Add `Pipeline.execute_iter`, which yields results as their replies arrive.
@@ -0,0 +1 @@
+Add the `parallelism` argument to `Pipeline.execute`, spreading a pipeline over several connections.
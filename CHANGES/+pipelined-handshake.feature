@@ -0,0 +1 @@
+Send the AUTH, CLIENT SETNAME and SELECT commands of a new connection in a single round trip.
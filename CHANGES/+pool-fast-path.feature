@@ -0,0 +1 @@
+Add a `fast_path` option to `ConnectionPool` checking connections out and in without taking its lock.
@@ -0,0 +1 @@
+Add `prewarm` and `min_idle` options to `ConnectionPool` to open connections ahead of their use.
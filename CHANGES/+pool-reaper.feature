@@ -0,0 +1 @@
+Add `max_idle_time` and `max_lifetime` options to `ConnectionPool`, closing idle and aged connections in the background.
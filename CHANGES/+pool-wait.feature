@@ -0,0 +1 @@
+Add `wait` and `wait_timeout` options to `ConnectionPool`, handing released connections to the callers waiting for one in order.
@@ -0,0 +1 @@
+Add `PythonReaderParser`, an incremental pure-Python RESP parser, used by default when hiredis is not installed.
@@ -0,0 +1 @@
+Add `aioredis.readwrite.ReadWriteRedis`, sending read-only commands to replicas, and `Sentinel.read_write_for`.
@@ -0,0 +1 @@
+Add RESP3 support, negotiated with HELLO when a client is created with `protocol=3`.
@@ -0,0 +1 @@
+Query sentinels concurrently, and add the `min_agreeing_sentinels` option to `Sentinel`.
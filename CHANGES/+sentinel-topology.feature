@@ -0,0 +1 @@
+Add the `topology_ttl` and `watch_topology` options to `Sentinel`, caching the topology and following sentinel events.
@@ -0,0 +1 @@
+Add `aioredis.sharding.ShardedRedis`, spreading keys over standalone servers with consistent hashing.
@@ -0,0 +1 @@
+Add pluggable slave selectors to sentinel pools, and the `max_slave_lag` and `max_slave_offset_lag` options to `Sentinel`.
@@ -0,0 +1 @@
+Add `aioredis.slots` to compute the hash slots of keys and group keys by slot.
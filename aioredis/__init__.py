@@ -1,4 +1,6 @@
+from aioredis.cache import ClientCache
 from aioredis.client import Redis, StrictRedis
+from aioredis.cluster import RedisCluster
 from aioredis.connection import (
     BlockingConnectionPool,
     Connection,
@@ -7,20 +9,30 @@ from aioredis.connection import (
     UnixDomainSocketConnection,
 )
 from aioredis.exceptions import (
+    AskError,
     AuthenticationError,
     AuthenticationWrongNumberOfArgsError,
     BusyLoadingError,
     ChildDeadlockedError,
+    ClusterCrossSlotError,
+    ClusterDownError,
+    ClusterError,
     ConnectionError,
     DataError,
     InvalidResponse,
+    MovedError,
     PubSubError,
     ReadOnlyError,
     RedisError,
     ResponseError,
     TimeoutError,
+    TryAgainError,
     WatchError,
 )
+from aioredis.hedging import HedgePolicy
+from aioredis.instrumentation import Instrumentation, Metrics
+from aioredis.readwrite import ReadWriteRedis
+from aioredis.sharding import ShardedRedis
 from aioredis.utils import from_url
 
 
@@ -35,25 +47,38 @@ __version__ = "2.0.1"
 VERSION = tuple(map(int_or_str, __version__.split(".")))
 
 __all__ = [
+    "AskError",
     "AuthenticationError",
     "AuthenticationWrongNumberOfArgsError",
     "BlockingConnectionPool",
     "BusyLoadingError",
     "ChildDeadlockedError",
+    "ClientCache",
+    "ClusterCrossSlotError",
+    "ClusterDownError",
+    "ClusterError",
     "Connection",
     "ConnectionError",
     "ConnectionPool",
     "DataError",
     "from_url",
+    "HedgePolicy",
+    "Instrumentation",
     "InvalidResponse",
+    "Metrics",
+    "MovedError",
     "PubSubError",
     "ReadOnlyError",
+    "ReadWriteRedis",
     "Redis",
+    "RedisCluster",
     "RedisError",
     "ResponseError",
+    "ShardedRedis",
     "SSLConnection",
     "StrictRedis",
     "TimeoutError",
+    "TryAgainError",
     "UnixDomainSocketConnection",
     "WatchError",
 ]
@@ -0,0 +1,337 @@
+import asyncio
+import sys
+from collections import OrderedDict
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from aioredis.connection import Connection, ConnectionPool, Encoder
+from aioredis.exceptions import ConnectionError, RedisError, TimeoutError
+from aioredis.log import logger
+from aioredis.utils import str_if_bytes
+
+INVALIDATE_CHANNEL = "__redis__:invalidate"
+
+#: Read-only commands whose replies may be cached, mapped to the slice of
+#: their arguments that holds the key names they read.
+CACHEABLE_COMMANDS: Mapping[str, slice] = {
+    "EXISTS": slice(1, None),
+    "GET": slice(1, 2),
+    "GETRANGE": slice(1, 2),
+    "HEXISTS": slice(1, 2),
+    "HGET": slice(1, 2),
+    "HGETALL": slice(1, 2),
+    "HKEYS": slice(1, 2),
+    "HLEN": slice(1, 2),
+    "HMGET": slice(1, 2),
+    "HSTRLEN": slice(1, 2),
+    "HVALS": slice(1, 2),
+    "LINDEX": slice(1, 2),
+    "LLEN": slice(1, 2),
+    "LRANGE": slice(1, 2),
+    "MGET": slice(1, None),
+    "SCARD": slice(1, 2),
+    "SISMEMBER": slice(1, 2),
+    "SMEMBERS": slice(1, 2),
+    "STRLEN": slice(1, 2),
+    "TYPE": slice(1, 2),
+    "ZCARD": slice(1, 2),
+    "ZSCORE": slice(1, 2),
+}
+
+CacheKey = Tuple[Any, ...]
+ExecuteCommandT = Callable[..., Awaitable[Any]]
+
+
+def _sizeof(value: Any) -> int:
+    """Approximate the memory held by a decoded reply"""
+    size = sys.getsizeof(value)
+    if isinstance(value, (list, tuple, set)):
+        size += sum(_sizeof(item) for item in value)
+    elif isinstance(value, dict):
+        size += sum(_sizeof(k) + _sizeof(v) for k, v in value.items())
+    return size
+
+
+def _copy(value: Any) -> Any:
+    """Copy a reply so callers cannot mutate what the cache holds"""
+    return value.copy() if isinstance(value, (list, dict, set)) else value
+
+
+class ClientCache:
+    """
+    A bounded LRU near-cache of command replies, kept coherent with the
+    server using CLIENT TRACKING (Redis >= 6.0).
+
+    Pass an instance to ``Redis(client_cache=...)``. Replies to the read
+    commands in ``commands`` are then served from local memory until the
+    server reports that one of the keys they read was modified.
+
+    Invalidations are received by a dedicated listener connection that
+    enables tracking in broadcasting mode, so the pooled connections need no
+    extra state. With ``protocol=3`` they arrive as RESP3 push frames; with
+    RESP2 the listener redirects them to itself and subscribes to the
+    ``__redis__:invalidate`` channel. ``prefixes`` restricts both the
+    notifications and the cached keys to the given key prefixes.
+
+    The cache holds at most ``max_entries`` replies and, if ``max_memory``
+    is set, roughly that many bytes of them; the least recently used ones
+    are evicted first. Everything is dropped whenever the listener
+    connection is lost, since invalidations may have been missed.
+
+    ``hits``, ``misses``, ``evictions`` and ``invalidations`` count what the
+    cache did since it was created.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        max_memory: Optional[int] = None,
+        prefixes: Iterable[str] = (),
+        commands: Mapping[str, slice] = CACHEABLE_COMMANDS,
+    ):
+        if max_entries <= 0:
+            raise ValueError('"max_entries" must be a positive integer')
+        self.max_entries = max_entries
+        self.max_memory = max_memory
+        self.prefixes = tuple(prefixes)
+        self.commands = commands
+        self.memory = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.connection_pool: Optional[ConnectionPool] = None
+        self._encoder: Optional[Encoder] = None
+        self._encoded_prefixes: Tuple[bytes, ...] = ()
+        # cache key -> (reply, keys read, size)
+        self._entries: "OrderedDict[CacheKey, Tuple[Any, Tuple[bytes, ...], int]]"
+        self._entries = OrderedDict()
+        # key name -> cache keys of the replies that read it
+        self._keys: Dict[bytes, Set[CacheKey]] = {}
+        # key name -> [reads in flight, invalidations seen meanwhile]
+        self._inflight: Dict[bytes, List[int]] = {}
+        self._epoch = 0
+        self._listener: Optional["asyncio.Future[None]"] = None
+        self._connection: Optional[Connection] = None
+        self._lock = asyncio.Lock()
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__name__}<entries={len(self._entries)},"
+            f"hits={self.hits},misses={self.misses}>"
+        )
+
+    def __len__(self):
+        return len(self._entries)
+
+    def bind(self, connection_pool: ConnectionPool):
+        """Attach the cache to the pool whose server it mirrors"""
+        if self.connection_pool is connection_pool:
+            return
+        if self.connection_pool is not None:
+            raise ValueError("ClientCache is bound to another connection pool")
+        self.connection_pool = connection_pool
+        encoder = connection_pool.get_encoder()
+        self._encoder = encoder
+        self._encoded_prefixes = tuple(map(encoder.encode, self.prefixes))
+
+    async def execute_command(self, execute: ExecuteCommandT, *args, **options):
+        """
+        Serve a cacheable command from the cache, or run it with ``execute``
+        and cache its reply. Other commands are run with ``execute``, then
+        the replies that may have read what they wrote are dropped.
+        """
+        command = self.commands.get(args[0])
+        if command is None:
+            try:
+                return await execute(*args, **options)
+            finally:
+                self.invalidate_args(args[1:])
+        encode = self._encoder.encode  # type: ignore[union-attr]
+        cache_key = (args[0], *map(encode, args[1:]))
+        entry = self._entries.get(cache_key)
+        if entry is not None:
+            self._entries.move_to_end(cache_key)
+            self.hits += 1
+            return _copy(entry[0])
+
+        keys = cache_key[command]
+        if self._encoded_prefixes and not all(
+            key.startswith(self._encoded_prefixes) for key in keys
+        ):
+            return await execute(*args, **options)
+        self.misses += 1
+        if self._listener is None:
+            await self._start()
+
+        epoch = self._epoch
+        generations = self._begin(keys)
+        try:
+            response = await execute(*args, **options)
+        finally:
+            current = self._end(keys)
+        if epoch == self._epoch and generations == current:
+            self._set(cache_key, keys, _copy(response))
+        return response
+
+    def invalidate(self, key: Any):
+        """Drop every cached reply that read ``key``"""
+        if self._encoder is not None:
+            key = self._encoder.encode(key)
+        pending = self._inflight.get(key)
+        if pending is not None:
+            pending[1] += 1
+        cache_keys = self._keys.pop(key, None)
+        if not cache_keys:
+            return
+        self.invalidations += len(cache_keys)
+        for cache_key in cache_keys:
+            self._remove(cache_key)
+
+    def invalidate_args(self, args: Iterable[Any]):
+        """Drop the replies that read any of a written command's ``args``"""
+        if not self._entries and not self._inflight:
+            return
+        for arg in args:
+            if isinstance(arg, (bytes, str)):
+                self.invalidate(arg)
+
+    def clear(self):
+        """Drop every cached reply"""
+        self._epoch += 1
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+        self._keys.clear()
+        self.memory = 0
+
+    async def close(self):
+        """Stop listening for invalidations and drop every cached reply"""
+        listener, self._listener = self._listener, None
+        self._connection = None
+        if listener is not None:
+            listener.cancel()
+            try:
+                await listener
+            except asyncio.CancelledError:
+                pass
+        self.clear()
+
+    def _begin(self, keys: Tuple[bytes, ...]) -> List[int]:
+        generations = []
+        for key in keys:
+            pending = self._inflight.setdefault(key, [0, 0])
+            pending[0] += 1
+            generations.append(pending[1])
+        return generations
+
+    def _end(self, keys: Tuple[bytes, ...]) -> List[int]:
+        generations = []
+        for key in keys:
+            pending = self._inflight[key]
+            generations.append(pending[1])
+            pending[0] -= 1
+            if not pending[0]:
+                del self._inflight[key]
+        return generations
+
+    def _set(self, cache_key: CacheKey, keys: Tuple[bytes, ...], value: Any):
+        size = _sizeof(cache_key) + _sizeof(value)
+        if self.max_memory is not None and size > self.max_memory:
+            return
+        if cache_key in self._entries:
+            self._remove(cache_key)
+        self._entries[cache_key] = (value, keys, size)
+        self.memory += size
+        for key in keys:
+            self._keys.setdefault(key, set()).add(cache_key)
+        while len(self._entries) > self.max_entries or (
+            self.max_memory is not None and self.memory > self.max_memory
+        ):
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _remove(self, cache_key: CacheKey):
+        entry = self._entries.pop(cache_key, None)
+        if entry is None:
+            return
+        self.memory -= entry[2]
+        for key in entry[1]:
+            cache_keys = self._keys.get(key)
+            if cache_keys is not None:
+                cache_keys.discard(cache_key)
+                if not cache_keys:
+                    del self._keys[key]
+
+    async def _start(self):
+        async with self._lock:
+            if self._listener is not None:
+                return
+            connection = await self._connect()
+            self.clear()
+            self._connection = connection
+            self._listener = asyncio.ensure_future(self._listen(connection))
+
+    async def _connect(self) -> Connection:
+        pool = self.connection_pool
+        if pool is None:
+            raise RedisError("ClientCache is not bound to a connection pool")
+        # the listener idles until a key changes, so it must not time out reads
+        kwargs = dict(pool.connection_kwargs)
+        kwargs["socket_connect_timeout"] = kwargs.get(
+            "socket_connect_timeout"
+        ) or kwargs.get("socket_timeout")
+        kwargs["socket_timeout"] = None
+        connection = pool.connection_class(**kwargs)
+        try:
+            await connection.connect()
+            tracking: List[Any] = ["CLIENT", "TRACKING", "ON", "BCAST"]
+            for prefix in self.prefixes:
+                tracking.extend(("PREFIX", prefix))
+            if connection.protocol == 2:
+                await connection.send_command("CLIENT", "ID")
+                tracking.extend(("REDIRECT", await connection.read_response()))
+            await connection.send_command(*tracking)
+            if str_if_bytes(await connection.read_response()) != "OK":
+                raise ConnectionError("Error enabling client tracking")
+            if connection.protocol == 2:
+                await connection.send_command("SUBSCRIBE", INVALIDATE_CHANNEL)
+                await connection.read_response()
+        except BaseException:
+            await connection.disconnect()
+            raise
+        return connection
+
+    async def _listen(self, connection: Connection):
+        try:
+            while True:
+                response = await connection.read_response()
+                kind = str_if_bytes(response[0])
+                if kind == "invalidate":
+                    keys = response[1]
+                elif kind == "message":
+                    keys = response[2]
+                else:
+                    continue
+                if keys is None:
+                    self.clear()
+                else:
+                    for key in keys:
+                        self.invalidate(key)
+        except (ConnectionError, TimeoutError, OSError) as e:
+            logger.debug("Lost the client cache invalidation connection: %s", e)
+        finally:
+            if self._connection is connection:
+                self._connection = None
+                self._listener = None
+            self.clear()
+            await connection.disconnect()
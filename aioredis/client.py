@@ -5,12 +5,17 @@ import inspect
 import re
 import time as mod_time
 import warnings
+from collections import deque
+from functools import partial
+from itertools import chain
 from typing import (
     AbstractSet,
     Any,
+    AsyncGenerator,
     AsyncIterator,
     Awaitable,
     Callable,
+    Deque,
     Dict,
     Iterable,
     List,
@@ -28,11 +33,14 @@ from typing import (
     cast,
 )
 
+from aioredis.cache import ClientCache
 from aioredis.compat import Protocol, TypedDict
 from aioredis.connection import (
     Connection,
     ConnectionPool,
     EncodableT,
+    EncodedT,
+    PackedCommands,
     SSLConnection,
     UnixDomainSocketConnection,
 )
@@ -48,6 +56,7 @@ from aioredis.exceptions import (
     TimeoutError,
     WatchError,
 )
+from aioredis.instrumentation import Instrumentation, traced
 from aioredis.lock import Lock
 from aioredis.utils import safe_str, str_if_bytes
 
@@ -79,6 +88,40 @@ PubSubHandler = Callable[[Dict[str, str]], Awaitable[None]]
 SYM_EMPTY = b""
 EMPTY_RESPONSE = "EMPTY_RESPONSE"
 
+# commands that block, or change the state of the connection they are sent
+# on, and so can't share a connection with concurrent callers
+AUTO_PIPELINE_EXCLUDED_COMMANDS = frozenset(
+    (
+        "AUTH",
+        "BLMOVE",
+        "BLPOP",
+        "BRPOP",
+        "BRPOPLPUSH",
+        "BZPOPMAX",
+        "BZPOPMIN",
+        "CLIENT REPLY",
+        "CLIENT SETNAME",
+        "CLIENT TRACKING",
+        "DISCARD",
+        "EXEC",
+        "HELLO",
+        "MONITOR",
+        "MULTI",
+        "PSUBSCRIBE",
+        "PUNSUBSCRIBE",
+        "QUIT",
+        "RESET",
+        "SELECT",
+        "SUBSCRIBE",
+        "UNSUBSCRIBE",
+        "UNWATCH",
+        "WAIT",
+        "WATCH",
+        "XREAD",
+        "XREADGROUP",
+    )
+)
+
 _KeyT = TypeVar("_KeyT", bound=KeyT)
 _ArgT = TypeVar("_ArgT", KeyT, EncodableT)
 _RedisT = TypeVar("_RedisT", bound="Redis")
@@ -271,20 +314,26 @@ def parse_sentinel_state(item):
     return result
 
 
+def _str_if_bytes_pairs(response):
+    if isinstance(response, dict):
+        return {str_if_bytes(k): str_if_bytes(v) for k, v in response.items()}
+    return map(str_if_bytes, response)
+
+
 def parse_sentinel_master(response):
-    return parse_sentinel_state(map(str_if_bytes, response))
+    return parse_sentinel_state(_str_if_bytes_pairs(response))
 
 
 def parse_sentinel_masters(response):
     result = {}
     for item in response:
-        state = parse_sentinel_state(map(str_if_bytes, item))
+        state = parse_sentinel_state(_str_if_bytes_pairs(item))
         result[state["name"]] = state
     return result
 
 
 def parse_sentinel_slaves_and_sentinels(response):
-    return [parse_sentinel_state(map(str_if_bytes, item)) for item in response]
+    return [parse_sentinel_state(_str_if_bytes_pairs(item)) for item in response]
 
 
 def parse_sentinel_get_master(response):
@@ -295,6 +344,16 @@ def pairs_to_dict(response, decode_keys=False, decode_string_values=False):
     """Create a dict given a list of key/value pairs"""
     if response is None:
         return {}
+    if isinstance(response, dict):
+        # RESP3 maps are already parsed into a dict
+        if not (decode_keys or decode_string_values):
+            return response
+        return {
+            (str_if_bytes(k) if decode_keys else k): (
+                str_if_bytes(v) if decode_string_values else v
+            )
+            for k, v in response.items()
+        }
     if decode_keys or decode_string_values:
         # the iter form is faster, but I don't know how to make that work
         # with a str_if_bytes() map
@@ -311,9 +370,14 @@ def pairs_to_dict(response, decode_keys=False, decode_string_values=False):
 
 
 def pairs_to_dict_typed(response, type_info):
-    it = iter(response)
+    pairs: Iterable[Tuple[Any, Any]]
+    if isinstance(response, dict):
+        pairs = response.items()
+    else:
+        it = iter(response)
+        pairs = zip(it, it)
     result = {}
-    for key, value in zip(it, it):
+    for key, value in pairs:
         if key in type_info:
             try:
                 value = type_info[key](value)
@@ -333,6 +397,11 @@ def zset_score_pairs(response, **options):
     if not response or not options.get("withscores"):
         return response
     score_cast_func = options.get("score_cast_func", float)
+    if isinstance(response[0], list):
+        # RESP3 replies hold [member, score] pairs with the scores as doubles
+        if score_cast_func is float:
+            return [(member, score) for member, score in response]
+        return [(member, score_cast_func(score)) for member, score in response]
     it = iter(response)
     return list(zip(it, map(score_cast_func, it)))
 
@@ -394,6 +463,8 @@ def parse_xinfo_stream(response):
 def parse_xread(response):
     if response is None:
         return []
+    if isinstance(response, dict):
+        return [[k, parse_stream_list(v)] for k, v in response.items()]
     return [[r[0], parse_stream_list(r[1])] for r in response]
 
 
@@ -441,6 +512,8 @@ def parse_client_list(response, **options):
 
 
 def parse_config_get(response, **options):
+    if isinstance(response, dict):
+        return {str_if_bytes(k): str_if_bytes(v) for k, v in response.items()}
     response = [str_if_bytes(i) if i is not None else None for i in response]
     return response and pairs_to_dict(response) or {}
 
@@ -538,6 +611,8 @@ def parse_georadius_generic(response, **options):
 
 
 def parse_pubsub_numsub(response, **options):
+    if isinstance(response, dict):
+        return list(response.items())
     return list(zip(response[0::2], response[1::2]))
 
 
@@ -827,8 +902,14 @@ class Redis:
         arguments always win.
 
         """
+        client_cache = kwargs.pop("client_cache", None)
+        auto_pipeline = kwargs.pop("auto_pipeline", False)
         connection_pool = ConnectionPool.from_url(url, **kwargs)
-        return cls(connection_pool=connection_pool)
+        return cls(
+            connection_pool=connection_pool,
+            client_cache=client_cache,
+            auto_pipeline=auto_pipeline,
+        )
 
     def __init__(
         self,
@@ -859,6 +940,12 @@ class Redis:
         client_name: Optional[str] = None,
         username: Optional[str] = None,
         auto_close_connection_pool: bool = True,
+        direct_transport: bool = False,
+        protocol: int = 2,
+        client_cache: Optional[ClientCache] = None,
+        auto_pipeline: bool = False,
+        fast_path: bool = False,
+        instrumentation: Optional[Instrumentation] = None,
     ):
         kwargs: Dict[str, Any]
         # auto_close_connection_pool only has an effect if connection_pool is
@@ -879,8 +966,12 @@ class Redis:
                 "decode_responses": decode_responses,
                 "retry_on_timeout": retry_on_timeout,
                 "max_connections": max_connections,
+                "fast_path": fast_path,
+                "instrumentation": instrumentation,
                 "health_check_interval": health_check_interval,
                 "client_name": client_name,
+                "direct_transport": direct_transport,
+                "protocol": protocol,
             }
             # based on input, setup appropriate connection args
             if unix_socket_path is not None:
@@ -917,6 +1008,13 @@ class Redis:
         self.connection_pool = connection_pool
         self.single_connection_client = single_connection_client
         self.connection: Optional[Connection] = None
+        self.instrumentation = connection_pool.instrumentation
+        if client_cache is not None:
+            client_cache.bind(connection_pool)
+        self.client_cache = client_cache
+        self.auto_pipeline: Optional[AutoPipeline] = None
+        if auto_pipeline and not single_connection_client:
+            self.auto_pipeline = AutoPipeline(connection_pool)
 
         self.response_callbacks = CaseInsensitiveDict(self.__class__.RESPONSE_CALLBACKS)
 
@@ -927,8 +1025,11 @@ class Redis:
         return self.initialize().__await__()
 
     async def initialize(self: _RedisT) -> _RedisT:
-        if self.single_connection_client and self.connection is None:
-            self.connection = await self.connection_pool.get_connection("_")
+        if self.single_connection_client:
+            if self.connection is None:
+                self.connection = await self.connection_pool.get_connection("_")
+        elif not self.connection_pool.warmed:
+            await self.connection_pool.warm()
         return self
 
     def set_response_callback(self, command: str, callback: ResponseCallbackT):
@@ -946,7 +1047,11 @@ class Redis:
         between the client and server.
         """
         return Pipeline(
-            self.connection_pool, self.response_callbacks, transaction, shard_hint
+            self.connection_pool,
+            self.response_callbacks,
+            transaction,
+            shard_hint,
+            client_cache=self.client_cache,
         )
 
     async def transaction(
@@ -1054,7 +1159,9 @@ class Redis:
 
     def client(self) -> "Redis":
         return self.__class__(
-            connection_pool=self.connection_pool, single_connection_client=True
+            connection_pool=self.connection_pool,
+            single_connection_client=True,
+            client_cache=self.client_cache,
         )
 
     async def __aenter__(self: _RedisT) -> _RedisT:
@@ -1087,17 +1194,50 @@ class Redis:
         if conn:
             self.connection = None
             await self.connection_pool.release(conn)
+        if self.auto_pipeline is not None:
+            await self.auto_pipeline.close()
         if close_connection_pool or (
             close_connection_pool is None and self.auto_close_connection_pool
         ):
+            if self.client_cache is not None:
+                await self.client_cache.close()
             await self.connection_pool.disconnect()
 
     # COMMAND EXECUTION AND PROTOCOL PARSING
     async def execute_command(self, *args, **options):
         """Execute a command and return a parsed response"""
         await self.initialize()
-        pool = self.connection_pool
+        if self.client_cache is not None:
+            command = self.client_cache.execute_command(
+                self._execute_command, *args, **options
+            )
+        else:
+            command = self._execute_command(*args, **options)
+        if self.instrumentation is None:
+            return await command
+        return await traced(self.instrumentation, args[0], args, command)
+
+    async def _execute_command(self, *args, **options):
         command_name = args[0]
+        if (
+            self.auto_pipeline is not None
+            and command_name not in AUTO_PIPELINE_EXCLUDED_COMMANDS
+        ):
+            try:
+                try:
+                    response = await self.auto_pipeline.execute_command(*args)
+                except TimeoutError:
+                    if not self.connection_pool.connection_kwargs.get(
+                        "retry_on_timeout"
+                    ):
+                        raise
+                    response = await self.auto_pipeline.execute_command(*args)
+            except ResponseError:
+                if EMPTY_RESPONSE in options:
+                    return options[EMPTY_RESPONSE]
+                raise
+            return await self._handle_response(command_name, response, **options)
+        pool = self.connection_pool
         conn = self.connection or await pool.get_connection(command_name, **options)
         try:
             await conn.send_command(*args)
@@ -1122,6 +1262,11 @@ class Redis:
             if EMPTY_RESPONSE in options:
                 return options[EMPTY_RESPONSE]
             raise
+        return await self._handle_response(command_name, response, **options)
+
+    async def _handle_response(
+        self, command_name: Union[str, bytes], response: Any, **options
+    ):
         if command_name in self.response_callbacks:
             # Mypy bug: https://github.com/python/mypy/issues/10977
             command_name = cast(str, command_name)
@@ -3956,11 +4101,12 @@ class PubSub:
         self.shard_hint = shard_hint
         self.ignore_subscribe_messages = ignore_subscribe_messages
         self.connection: Optional[Connection] = None
+        self.instrumentation = connection_pool.instrumentation
         # we need to know the encoding options for this connection in order
         # to lookup channel and pattern names for callback handlers.
         self.encoder = self.connection_pool.get_encoder()
         if self.encoder.decode_responses:
-            self.health_check_response: Iterable[Union[str, bytes]] = [
+            self.health_check_response: List[Union[str, bytes]] = [
                 "pong",
                 self.HEALTH_CHECK_MESSAGE,
             ]
@@ -4039,7 +4185,11 @@ class PubSub:
             self.connection.register_connect_callback(self.on_connect)
         connection = self.connection
         kwargs = {"check_health": not self.subscribed}
-        await self._execute(connection, connection.send_command, *args, **kwargs)
+        command = self._execute(connection, connection.send_command, *args, **kwargs)
+        if self.instrumentation is None:
+            await command
+        else:
+            await traced(self.instrumentation, args[0], args, command)
 
     async def _execute(self, connection, command, *args, **kwargs):
         try:
@@ -4071,7 +4221,11 @@ class PubSub:
             return None
         response = await self._execute(conn, conn.read_response)
 
-        if conn.health_check_interval and response == self.health_check_response:
+        if conn.health_check_interval and (
+            response == self.health_check_response
+            # RESP3 connections reply to PING with just the message
+            or response == self.health_check_response[1]
+        ):
             # ignore the health check message as user might not expect it
             return None
         return response
@@ -4208,6 +4362,10 @@ class PubSub:
         with a message handler, the handler is invoked instead of a parsed
         message being returned.
         """
+        if not isinstance(response, list):
+            # RESP3 connections reply to PING with a regular reply, even
+            # while subscribed
+            response = ["pong", response]
         message_type = str_if_bytes(response[0])
         if message_type == "pmessage":
             message = {
@@ -4327,6 +4485,104 @@ CommandT = Tuple[Tuple[Union[str, bytes], ...], Mapping[str, Any]]
 CommandStackT = List[CommandT]
 
 
+class AutoPipeline:
+    """
+    Multiplexes the commands of concurrent callers over one connection.
+
+    Commands issued during the same iteration of the event loop are packed
+    together and written at once. A single reader task then reads the
+    replies and hands them back in the order the commands were sent, so
+    callers get pipeline throughput without using a ``Pipeline``.
+    """
+
+    def __init__(self, connection_pool: ConnectionPool):
+        self.connection_pool = connection_pool
+        self.connection: Optional[Connection] = None
+        self._pending: List[Tuple[Tuple[EncodableT, ...], asyncio.Future]] = []
+        self._inflight: Deque[asyncio.Future] = deque()
+        self._flusher: Optional[asyncio.Future] = None
+        self._reader: Optional[asyncio.Future] = None
+        self._lock = asyncio.Lock()
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}<{self.connection_pool!r}>"
+
+    async def execute_command(self, *args: EncodableT):
+        """Queue a command for the next write and return its unparsed reply"""
+        future = asyncio.get_event_loop().create_future()
+        self._pending.append((args, future))
+        if self._flusher is None:
+            self._flusher = asyncio.ensure_future(self._flush())
+        return await future
+
+    async def close(self):
+        """Wait for the replies in flight and release the connection"""
+        if self._flusher is not None:
+            await asyncio.wait((self._flusher,))
+        if self._reader is not None:
+            await asyncio.wait((self._reader,))
+        async with self._lock:
+            connection, self.connection = self.connection, None
+            if connection is not None:
+                await self.connection_pool.release(connection)
+
+    async def _flush(self):
+        async with self._lock:
+            self._flusher = None
+            batch = [item for item in self._pending if not item[1].done()]
+            self._pending = []
+            if not batch:
+                return
+            futures = [future for _, future in batch]
+            try:
+                if self.connection is None:
+                    self.connection = await self.connection_pool.get_connection("_")
+                elif not self._inflight and self.connection.is_dirty:
+                    # the server closed the connection while it was idle, as
+                    # the pool checks when it hands a connection out
+                    await self.connection.disconnect()
+                connection = self.connection
+                command = connection.pack_commands(args for args, _ in batch)
+                self._inflight.extend(futures)
+                await connection.send_packed_command(
+                    command, check_health=False, replies=len(batch)
+                )
+            except BaseException as e:
+                self._fail(e, futures)
+                if not isinstance(e, Exception):
+                    raise
+                return
+            if self._reader is None:
+                self._reader = asyncio.ensure_future(self._read(connection))
+
+    async def _read(self, connection: Connection):
+        try:
+            while self._inflight:
+                try:
+                    response = await connection.read_response()
+                except ResponseError as e:
+                    future = self._inflight.popleft()
+                    if not future.done():
+                        future.set_exception(e)
+                else:
+                    future = self._inflight.popleft()
+                    if not future.done():
+                        future.set_result(response)
+        except BaseException as e:
+            self._fail(e)
+            if not isinstance(e, Exception):
+                raise
+        finally:
+            self._reader = None
+
+    def _fail(self, exc: BaseException, futures: Iterable[asyncio.Future] = ()):
+        """Fail the replies in flight, whose order is lost with the connection"""
+        for future in chain(futures, self._inflight):
+            if not future.done():
+                future.set_exception(exc)
+        self._inflight.clear()
+
+
 class Pipeline(Redis):  # lgtm [py/init-calls-subclass]
     """
     Pipelines provide a way to transmit multiple commands to the Redis server
@@ -4347,6 +4603,9 @@ class Pipeline(Redis):  # lgtm [py/init-calls-subclass]
     """
 
     UNWATCH_COMMANDS = {"DISCARD", "EXEC", "UNWATCH"}
+    # the most bytes of commands sent ahead of their replies when a pipeline
+    # is executed in chunks
+    MAX_IN_FLIGHT_BYTES = 1024 * 1024
 
     def __init__(
         self,
@@ -4354,14 +4613,21 @@ class Pipeline(Redis):  # lgtm [py/init-calls-subclass]
         response_callbacks: MutableMapping[Union[str, bytes], ResponseCallbackT],
         transaction: bool,
         shard_hint: Optional[str],
+        client_cache: Optional[ClientCache] = None,
     ):
         self.connection_pool = connection_pool
         self.connection = None
+        self.client_cache = client_cache
+        self.instrumentation = connection_pool.instrumentation
         self.response_callbacks = response_callbacks
         self.is_transaction = transaction
         self.shard_hint = shard_hint
         self.watching = False
         self.command_stack: CommandStackT = []
+        # the commands of command_stack, packed as they are queued
+        self.packed_commands: Optional[PackedCommands] = PackedCommands(
+            connection_pool.get_encoder()
+        )
         self.scripts: Set[Script] = set()
         self.explicit_transaction = False
 
@@ -4388,6 +4654,8 @@ class Pipeline(Redis):  # lgtm [py/init-calls-subclass]
 
     async def reset(self):
         self.command_stack = []
+        if self.packed_commands is not None:
+            self.packed_commands.clear()
         self.scripts = set()
         # make sure to reset the connection state in the event that we were
         # watching something
@@ -4490,19 +4758,35 @@ class Pipeline(Redis):  # lgtm [py/init-calls-subclass]
         At some other point, you can then run: pipe.execute(),
         which will execute all commands queued in the pipe.
         """
+        if self.packed_commands is not None:
+            self.packed_commands.append(args)
         self.command_stack.append((args, options))
         return self
 
     async def _execute_transaction(  # noqa: C901
         self, connection: Connection, commands: CommandStackT, raise_on_error
     ):
-        pre: CommandT = (("MULTI",), {})
-        post: CommandT = (("EXEC",), {})
-        cmds = (pre, *commands, post)
-        all_cmds = connection.pack_commands(
-            args for args, options in cmds if EMPTY_RESPONSE not in options
-        )
-        await connection.send_packed_command(all_cmds)
+        all_cmds: Sequence[EncodedT]
+        replies = len(commands) + 2
+        if self._packed_offset(commands) is not None and not any(
+            EMPTY_RESPONSE in options for _, options in commands
+        ):
+            all_cmds = [
+                *connection.pack_command("MULTI"),
+                cast(PackedCommands, self.packed_commands).view(),
+                *connection.pack_command("EXEC"),
+            ]
+        else:
+            pre: CommandT = (("MULTI",), {})
+            post: CommandT = (("EXEC",), {})
+            cmds = [
+                args
+                for args, options in (pre, *commands, post)
+                if EMPTY_RESPONSE not in options
+            ]
+            replies = len(cmds)
+            all_cmds = connection.pack_commands(cmds)
+        await connection.send_packed_command(all_cmds, replies=replies)
         errors = []
 
         # parse off the response for MULTI
@@ -4568,25 +4852,181 @@ class Pipeline(Redis):  # lgtm [py/init-calls-subclass]
         return data
 
     async def _execute_pipeline(
-        self, connection: Connection, commands: CommandStackT, raise_on_error: bool
+        self,
+        connection: Connection,
+        commands: CommandStackT,
+        raise_on_error: bool,
+        chunk_size: Optional[int] = None,
+        offset: Optional[int] = None,
     ):
-        # build up all commands into a single request to increase network perf
-        all_cmds = connection.pack_commands([args for args, _ in commands])
-        await connection.send_packed_command(all_cmds)
+        response = [
+            reply
+            async for reply in self._iter_pipeline(
+                connection, commands, chunk_size, offset
+            )
+        ]
+        if raise_on_error:
+            self.raise_first_error(commands, response)
+        return response
 
-        response = []
-        for args, options in commands:
-            try:
-                response.append(
-                    await self.parse_response(connection, args[0], **options)
-                )
-            except ResponseError as e:
-                response.append(e)
+    async def _execute_parallel(
+        self,
+        connection: Connection,
+        commands: CommandStackT,
+        raise_on_error: bool,
+        chunk_size: Optional[int],
+        parallelism: int,
+        offset: Optional[int] = None,
+    ):
+        """
+        Execute ``parallelism`` contiguous slices of the commands at once,
+        the first on ``connection`` and the others on connections from the
+        pool
+        """
+        size = -(-len(commands) // parallelism)
+        starts = range(0, len(commands), size)
+
+        def execute_slice(connection: Connection, start: int):
+            return self._execute_pipeline(
+                connection,
+                commands[start : start + size],
+                False,
+                chunk_size,
+                None if offset is None else offset + start,
+            )
 
+        async def execute_slice_from_pool(start: int):
+            conn = await self.connection_pool.get_connection("MULTI", self.shard_hint)
+            try:
+                return await execute_slice(conn, start)
+            finally:
+                await self.connection_pool.release(conn)
+
+        replies = await asyncio.gather(
+            execute_slice(connection, 0),
+            *(execute_slice_from_pool(start) for start in starts[1:]),
+            return_exceptions=True,
+        )
+        slices: List[List[Any]] = []
+        for reply in replies:
+            if isinstance(reply, BaseException):
+                raise reply
+            slices.append(reply)
+        response = list(chain.from_iterable(slices))
         if raise_on_error:
             self.raise_first_error(commands, response)
         return response
 
+    async def _iter_pipeline(
+        self,
+        connection: Connection,
+        commands: CommandStackT,
+        chunk_size: Optional[int] = None,
+        offset: Optional[int] = None,
+    ) -> AsyncGenerator[Any, None]:
+        """
+        Send the commands and yield their replies as they are read, with the
+        ResponseErrors in place of the replies of the commands that failed.
+
+        With ``chunk_size``, the commands are sent that many at a time while
+        the replies are read, with at most ``MAX_IN_FLIGHT_BYTES`` of commands
+        sent but not answered yet.
+
+        ``offset`` is the position of the commands in ``packed_commands``, if
+        they were packed when queued, in which case they are sent from there
+        rather than packed again.
+        """
+        stream = chunk_size is not None and len(commands) > chunk_size
+        step = cast(int, chunk_size) if stream else len(commands)
+        packed = self.packed_commands
+
+        def pack(start: int, stop: int) -> Sequence[EncodedT]:
+            if packed is None or offset is None:
+                return connection.pack_commands(
+                    args for args, _ in commands[start:stop]
+                )
+            return [packed.view(offset + start, offset + stop)]
+
+        sent: "asyncio.Queue[Union[Tuple[int, int], BaseException]]"
+        sent = asyncio.Queue()
+        replied = asyncio.Event()
+        in_flight = 0
+
+        async def write():
+            nonlocal in_flight
+            try:
+                for start in range(0, len(commands), step):
+                    chunk = pack(start, start + step)
+                    size = sum(map(len, chunk))
+                    while in_flight and in_flight + size > self.MAX_IN_FLIGHT_BYTES:
+                        replied.clear()
+                        await replied.wait()
+                    in_flight += size
+                    # once replies are pending, a health check would read one
+                    # of them
+                    await connection.send_packed_command(
+                        chunk,
+                        check_health=not start,
+                        replies=min(step, len(commands) - start),
+                    )
+                    sent.put_nowait((start, size))
+            except BaseException as e:
+                sent.put_nowait(e)
+                raise
+
+        writer: Optional[asyncio.Future] = None
+        if stream:
+            writer = asyncio.ensure_future(write())
+        else:
+            # build up all commands into a single request to increase network perf
+            await connection.send_packed_command(
+                pack(0, len(commands)), replies=len(commands)
+            )
+            sent.put_nowait((0, 0))
+
+        read = 0
+        try:
+            while read < len(commands):
+                item = await sent.get()
+                if isinstance(item, BaseException):
+                    raise item
+                start, size = item
+                for args, options in commands[start : start + step]:
+                    try:
+                        reply = await self.parse_response(
+                            connection, args[0], **options
+                        )
+                    except ResponseError as e:
+                        reply = e
+                    read += 1
+                    yield reply
+                in_flight -= size
+                replied.set()
+        except BaseException:
+            if read < len(commands):
+                # the replies still in flight can't be told apart from those
+                # of the next commands
+                await connection.disconnect()
+            raise
+        finally:
+            if writer is not None:
+                if not writer.done():
+                    writer.cancel()
+                await asyncio.wait([writer])
+                if not writer.cancelled():
+                    writer.exception()
+
+    def _packed_offset(self, commands: CommandStackT) -> Optional[int]:
+        """0 if ``commands`` are those packed in ``packed_commands``, or None"""
+        packed = self.packed_commands
+        if (
+            packed is None
+            or commands is not self.command_stack
+            or len(packed) != len(commands)
+        ):
+            return None
+        return 0
+
     def raise_first_error(self, commands: CommandStackT, response: Iterable[Any]):
         for i, r in enumerate(response):
             if isinstance(r, ResponseError):
@@ -4623,17 +5063,147 @@ class Pipeline(Redis):  # lgtm [py/init-calls-subclass]
                 if not exist:
                     s.sha = await immediate("SCRIPT LOAD", s.script)
 
-    async def execute(self, raise_on_error: bool = True):
-        """Execute all the commands in the current pipeline"""
+    async def execute(
+        self,
+        raise_on_error: bool = True,
+        chunk_size: Optional[int] = None,
+        parallelism: Optional[int] = None,
+    ):
+        """
+        Execute all the commands in the current pipeline
+
+        With ``chunk_size``, the commands of a pipeline that is not a
+        transaction are sent that many at a time while the replies of those
+        already sent are read, so that very large pipelines don't have to be
+        packed in memory at once nor fill the output buffer of the server.
+        At most ``MAX_IN_FLIGHT_BYTES`` of commands are sent ahead of their
+        replies.
+
+        With ``parallelism``, the commands of a pipeline that is not a
+        transaction are split in that many contiguous slices, sent on as
+        many connections of the pool at once. The commands of different
+        slices may then run in any order on the server, but the replies are
+        returned in the order the commands were queued.
+        """
+        if chunk_size is not None and chunk_size < 1:
+            raise DataError("chunk_size must be a positive integer")
+        if parallelism is not None:
+            if parallelism < 1:
+                raise DataError("parallelism must be a positive integer")
+            if self.is_transaction or self.explicit_transaction or self.watching:
+                raise RedisError("Transactions can't be executed in parallel")
         stack = self.command_stack
         if not stack and not self.watching:
             return []
+        if self.instrumentation is None:
+            return await self._execute_stack(
+                stack, raise_on_error, chunk_size, parallelism
+            )
+        return await traced(
+            self.instrumentation,
+            "PIPELINE",
+            tuple(args for args, _ in stack),
+            self._execute_stack(stack, raise_on_error, chunk_size, parallelism),
+        )
+
+    async def execute_iter(
+        self, raise_on_error: bool = True, chunk_size: Optional[int] = None
+    ) -> AsyncIterator[Any]:
+        """
+        Execute all the commands in the current pipeline and yield their
+        results in order, as soon as each reply is read
+
+        >>> async with redis.pipeline(transaction=False) as pipe:
+        ...     for key in keys:
+        ...         pipe.get(key)
+        ...     async for value in pipe.execute_iter(chunk_size=1000):
+        ...         process(value)
+
+        This is only supported by pipelines that are not transactions, as
+        the replies of a transaction all come at once. With
+        ``raise_on_error``, the first command that failed raises its error
+        when its result is reached, after the replies of the remaining
+        commands were read. ``chunk_size`` is as for :meth:`execute`.
+
+        If the iteration is stopped early, the connection is closed, but the
+        commands already sent are still executed by the server.
+        """
+        if self.is_transaction or self.explicit_transaction or self.watching:
+            raise RedisError("Transactions can't be executed iteratively")
+        if chunk_size is not None and chunk_size < 1:
+            raise DataError("chunk_size must be a positive integer")
+        stack = self.command_stack
+        if not stack:
+            return
+        instrumentation = self.instrumentation
+        if instrumentation is not None:
+            instrumentation.before_command("PIPELINE", tuple(args for args, _ in stack))
+            start = mod_time.perf_counter()
+        error: Optional[BaseException] = None
+        count = 0
+        try:
+            if self.scripts:
+                await self.load_scripts()
+            conn = self.connection
+            if not conn:
+                conn = await self.connection_pool.get_connection(
+                    "MULTI", self.shard_hint
+                )
+                self.connection = conn
+            replies = self._iter_pipeline(
+                cast(Connection, conn), stack, chunk_size, self._packed_offset(stack)
+            )
+            try:
+                async for reply in replies:
+                    count += 1
+                    if raise_on_error and isinstance(reply, ResponseError):
+                        async for _ in replies:
+                            pass
+                        self.annotate_exception(reply, count, stack[count - 1][0])
+                        raise reply
+                    yield reply
+            finally:
+                await replies.aclose()
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            if instrumentation is not None:
+                instrumentation.after_command(
+                    "PIPELINE", mod_time.perf_counter() - start, error, count
+                )
+            if self.client_cache is not None:
+                for args, _ in stack:
+                    self.client_cache.invalidate_args(args[1:])
+            await self.reset()
+
+    async def _execute_stack(
+        self,
+        stack: CommandStackT,
+        raise_on_error: bool,
+        chunk_size: Optional[int] = None,
+        parallelism: Optional[int] = None,
+    ):
         if self.scripts:
             await self.load_scripts()
+        execute: Callable[[Connection, CommandStackT, bool], Awaitable[Any]]
+        parallel = False
         if self.is_transaction or self.explicit_transaction:
             execute = self._execute_transaction
+        elif parallelism is not None and parallelism > 1 and len(stack) > 1:
+            parallel = True
+            execute = partial(
+                self._execute_parallel,
+                chunk_size=chunk_size,
+                parallelism=parallelism,
+                offset=self._packed_offset(stack),
+            )
         else:
-            execute = self._execute_pipeline
+            execute = partial(
+                self._execute_pipeline,
+                chunk_size=chunk_size,
+                offset=self._packed_offset(stack),
+            )
 
         conn = self.connection
         if not conn:
@@ -4646,6 +5216,11 @@ class Pipeline(Redis):  # lgtm [py/init-calls-subclass]
         try:
             return await execute(conn, stack, raise_on_error)
         except (ConnectionError, TimeoutError) as e:
+            if parallel:
+                # the connection of the slice that failed was closed, and the
+                # other slices ran to completion, so a retry would run them
+                # again
+                raise
             await conn.disconnect()
             # if we were watching a variable, the watch is no longer valid
             # since this connection has died. raise a WatchError, which
@@ -4661,6 +5236,9 @@ class Pipeline(Redis):  # lgtm [py/init-calls-subclass]
             # retry a TimeoutError when retry_on_timeout is set
             return await execute(conn, stack, raise_on_error)
         finally:
+            if self.client_cache is not None:
+                for args, _ in stack:
+                    self.client_cache.invalidate_args(args[1:])
             await self.reset()
 
     async def watch(self, *names: KeyT):
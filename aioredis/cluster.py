@@ -0,0 +1,577 @@
+import asyncio
+from itertools import chain
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+from aioredis.client import CaseInsensitiveDict, CommandStackT, Pipeline, Redis
+from aioredis.connection import ConnectionPool, EncodableT, parse_url
+from aioredis.exceptions import (
+    AskError,
+    AuthenticationError,
+    ClusterCrossSlotError,
+    ClusterDownError,
+    ClusterError,
+    ConnectionError,
+    MovedError,
+    RedisError,
+    ResponseError,
+    TimeoutError,
+    TryAgainError,
+)
+from aioredis.keys import CommandKeys
+from aioredis.log import logger
+from aioredis.slots import SLOT_COUNT, key_slot
+from aioredis.utils import str_if_bytes
+
+
+def _is_cluster_down(error: object) -> bool:
+    """
+    Whether ``error`` reports that a node can't serve its slots. MASTERDOWN is
+    only recognized here, since replicas of standalone servers reply it too.
+    """
+    return isinstance(error, ClusterDownError) or (
+        isinstance(error, ResponseError) and str(error).startswith("MASTERDOWN ")
+    )
+
+
+def _concat(replies: Iterable[Iterable[Any]]) -> List[Any]:
+    return list(chain.from_iterable(replies))
+
+
+def _first(replies: Sequence[Any]) -> Any:
+    return replies[0]
+
+
+def _all_exist(replies: Iterable[Sequence[bool]]) -> List[bool]:
+    return [all(exists) for exists in zip(*replies)]
+
+
+#: Commands sent to every primary, mapped to the function that merges the
+#: replies of the nodes into one.
+ALL_PRIMARIES_COMMANDS: Mapping[str, Callable[[List[Any]], Any]] = {
+    "DBSIZE": sum,
+    "FLUSHALL": all,
+    "FLUSHDB": all,
+    "KEYS": _concat,
+    "SCRIPT EXISTS": _all_exist,
+    "SCRIPT FLUSH": all,
+    "SCRIPT LOAD": _first,
+}
+
+_RedisClusterT = TypeVar("_RedisClusterT", bound="RedisCluster")
+
+
+class RedisCluster(Redis):  # lgtm [py/missing-call-to-init]
+    """
+    Redis Cluster client
+
+    >>> from aioredis.cluster import RedisCluster
+    >>> cluster = RedisCluster(startup_nodes=[("localhost", 7000)])
+    >>> await cluster.set("foo", "bar")
+    >>> await cluster.get("foo")
+    b'bar'
+
+    ``startup_nodes`` is a list of (host, port) pairs; ``host`` and ``port``
+    give a single one. The slot map is fetched from the first of them that
+    answers ``CLUSTER SLOTS``, and each node then gets its own
+    ``connection_pool_class`` pool, created with ``connection_kwargs``.
+
+    Commands are sent to the primary serving the hash slot of their keys.
+    Keys are located with the key positions reported by ``COMMAND``, so
+    all keys of a command must hash to the same slot; commands without keys
+    go to a single node, except those in ``ALL_PRIMARIES_COMMANDS``, which
+    are sent to every primary.
+
+    ``MOVED`` and ``ASK`` redirections are followed, up to ``max_redirects``
+    of them per command. A ``MOVED`` reply also starts a refresh of the slot
+    map in the background. Connection errors and ``CLUSTERDOWN`` replies
+    refresh it before retrying. If ``refresh_interval`` is set, the slot map
+    is also refreshed every ``refresh_interval`` seconds.
+
+    ``connection_pool`` is the pool of the first startup node. It is used
+    for pubsub and monitoring, which only involve a single node.
+    """
+
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 6379,
+        startup_nodes: Optional[Iterable[Tuple[str, int]]] = None,
+        max_redirects: int = 16,
+        refresh_interval: Optional[float] = None,
+        connection_pool_class: Type[ConnectionPool] = ConnectionPool,
+        **connection_kwargs,
+    ):
+        if connection_kwargs.get("db", 0) not in (0, "0"):
+            raise RedisError("Redis Cluster only supports database 0")
+        self.startup_nodes = [
+            (host, int(port)) for host, port in startup_nodes or [(host, port)]
+        ]
+        if not self.startup_nodes:
+            raise RedisError("At least one startup node is required")
+        self.max_redirects = max_redirects
+        self.refresh_interval = refresh_interval
+        self.connection_pool_class = connection_pool_class
+        self.connection_kwargs = connection_kwargs
+        self.nodes: Dict[str, Redis] = {}
+        # slot -> names of the primary, then the replicas, serving it
+        self.slots: List[Optional[Tuple[str, ...]]] = [None] * SLOT_COUNT
+        self.default_node: Optional[str] = None
+        self.command_keys = CommandKeys()
+        self.response_callbacks = CaseInsensitiveDict(self.__class__.RESPONSE_CALLBACKS)
+
+        startup = self.get_node(*self.startup_nodes[0])
+        self.connection_pool = startup.connection_pool
+        self.encoder = self.connection_pool.get_encoder()
+        self.instrumentation = self.connection_pool.instrumentation
+        self.connection = None
+        self.single_connection_client = False
+        self.auto_close_connection_pool = True
+        self.client_cache = None
+        self.auto_pipeline = None
+        self._refreshing: Optional["asyncio.Future[None]"] = None
+        self._refresher: Optional["asyncio.Future[None]"] = None
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs):
+        """
+        Return a cluster client whose startup node is given by ``url``. See
+        :meth:`aioredis.Redis.from_url` for the URL format.
+        """
+        kwargs.update(parse_url(url))
+        return cls(**kwargs)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}<nodes=[{','.join(self.nodes)}]>"
+
+    async def initialize(self: _RedisClusterT) -> _RedisClusterT:
+        if not self.command_keys.loaded:
+            await self.refresh()
+            if self.refresh_interval and self._refresher is None:
+                self._refresher = asyncio.ensure_future(self._refresh_periodically())
+        return self
+
+    def get_node(self, host: str, port: int) -> Redis:
+        """Return the client of the node at ``host``:``port``"""
+        name = f"{host}:{port}"
+        node = self.nodes.get(name)
+        if node is None:
+            pool = self.connection_pool_class(
+                host=host, port=port, **self.connection_kwargs
+            )
+            node = self.nodes[name] = Redis(connection_pool=pool)
+            node.response_callbacks = self.response_callbacks
+        return node
+
+    def get_primaries(self) -> List[Redis]:
+        """Return the clients of the primaries serving any slot"""
+        names = {names[0] for names in self.slots if names is not None}
+        return [self.nodes[name] for name in sorted(names)]
+
+    def keyslot(self, key: EncodableT) -> int:
+        """Return the hash slot of ``key``"""
+        return key_slot(self.encoder.encode(key))
+
+    def get_node_from_slot(self, slot: Optional[int]) -> Redis:
+        """
+        Return the client of the primary serving ``slot``, or of the default
+        node if ``slot`` is None
+        """
+        if slot is None:
+            if self.default_node is None:
+                raise ClusterError("The cluster slots are not loaded")
+            return self.nodes[self.default_node]
+        names = self.slots[slot]
+        if names is None:
+            raise ClusterDownError(f"Slot {slot} is not served by any node")
+        return self.nodes[names[0]]
+
+    def get_node_from_key(self, key: EncodableT) -> Redis:
+        """Return the client of the primary serving ``key``"""
+        return self.get_node_from_slot(self.keyslot(key))
+
+    def refresh(self) -> Awaitable[None]:
+        """
+        Reload the slot map from the cluster. Concurrent refreshes share a
+        single ``CLUSTER SLOTS`` query.
+        """
+        return asyncio.shield(self._start_refresh())
+
+    def _start_refresh(self) -> "asyncio.Future[None]":
+        if self._refreshing is not None and not self._refreshing.done():
+            return self._refreshing
+        refreshing = asyncio.ensure_future(self._load_slots())
+        refreshing.add_done_callback(self._log_refresh_error)
+        self._refreshing = refreshing
+        return refreshing
+
+    @staticmethod
+    def _log_refresh_error(future: "asyncio.Future[None]"):
+        if not future.cancelled() and future.exception() is not None:
+            logger.warning("Error refreshing the cluster slots: %s", future.exception())
+
+    async def _refresh_periodically(self):
+        while True:
+            await asyncio.sleep(self.refresh_interval)  # type: ignore[arg-type]
+            # errors are logged by _log_refresh_error
+            await asyncio.wait((self._start_refresh(),))
+
+    async def _load_slots(self):
+        # ask the known primaries first, then fall back on the startup nodes
+        candidates = [*self.get_primaries()]
+        candidates.extend(self.get_node(*address) for address in self.startup_nodes)
+        error: Optional[Exception] = None
+        for node in dict.fromkeys(candidates):
+            try:
+                reply = await node.execute_command("CLUSTER SLOTS")
+                if not self.command_keys.loaded:
+                    await self.command_keys.load(node)
+            except (ConnectionError, TimeoutError, ResponseError) as e:
+                error = e
+                continue
+            await self._set_slots(reply, node)
+            return
+        raise ClusterError("Unable to load the slots from any cluster node") from error
+
+    async def _set_slots(self, reply: List[Any], queried: Redis):
+        kwargs = queried.connection_pool.connection_kwargs
+        slots: List[Optional[Tuple[str, ...]]] = [None] * SLOT_COUNT
+        for start, end, *nodes in reply:
+            names = []
+            for node in nodes:
+                # an empty host stands for the address the query was sent to
+                host = str_if_bytes(node[0]) or kwargs["host"]
+                port = int(node[1])
+                self.get_node(host, port)
+                names.append(f"{host}:{port}")
+            slots[start : end + 1] = [tuple(names)] * (end - start + 1)
+        self.slots = slots
+
+        primaries = {names[0] for names in slots if names is not None}
+        queried_name = f"{kwargs['host']}:{kwargs['port']}"
+        if queried_name in primaries:
+            self.default_node = queried_name
+        elif self.default_node not in primaries:
+            self.default_node = min(primaries, default=None)
+
+        # close the pools of the nodes that left the cluster
+        in_use = {name for names in slots if names is not None for name in names}
+        in_use.update(f"{host}:{port}" for host, port in self.startup_nodes)
+        stale = [self.nodes.pop(name) for name in set(self.nodes) - in_use]
+        await asyncio.gather(
+            *(
+                node.connection_pool.disconnect(inuse_connections=False)
+                for node in stale
+            ),
+            return_exceptions=True,
+        )
+
+    async def get_keys(self, *args: EncodableT) -> Sequence[EncodableT]:
+        """Return the keys that the command ``args`` reads or writes"""
+        return await self.command_keys.get_keys(self.get_node_from_slot(None), *args)
+
+    async def get_slot(self, *args: EncodableT) -> Optional[int]:
+        """
+        Return the slot of the keys of the command ``args``, or None if it
+        has no keys
+        """
+        slots = {self.keyslot(key) for key in await self.get_keys(*args)}
+        if len(slots) > 1:
+            raise ClusterCrossSlotError("Keys in request don't hash to the same slot")
+        return slots.pop() if slots else None
+
+    async def execute_command(self, *args, **options):
+        """Execute a command on the nodes serving it and return its response"""
+        await self.initialize()
+        merge = ALL_PRIMARIES_COMMANDS.get(args[0])
+        if merge is not None:
+            return merge(
+                await asyncio.gather(
+                    *(
+                        node.execute_command(*args, **options)
+                        for node in self.get_primaries()
+                    )
+                )
+            )
+        slot = await self.get_slot(*args)
+        return await self.execute_on_slot(slot, *args, **options)
+
+    async def execute_on_slot(self, slot: Optional[int], *args, **options):
+        """
+        Execute a command on the primary serving ``slot``, following the
+        redirections of the cluster
+        """
+        node = self.get_node_from_slot(slot)
+        asking = False
+        for _ in range(self.max_redirects + 1):
+            try:
+                if asking:
+                    return await self._execute_asking(node, *args, **options)
+                return await node.execute_command(*args, **options)
+            except AuthenticationError:
+                raise
+            except MovedError as e:
+                error: Exception = e
+                node = self._moved(e, node)
+                asking = False
+            except AskError as e:
+                error = e
+                node = self.get_node(self._redirect_host(e, node), e.port)
+                asking = True
+            except TryAgainError as e:
+                # the keys are being migrated; the redirection will follow
+                error = e
+                await asyncio.sleep(0.05)
+                asking = False
+            except (ResponseError, ConnectionError, TimeoutError) as e:
+                if isinstance(e, ResponseError) and not _is_cluster_down(e):
+                    raise
+                error = e
+                await self.refresh()
+                node = self.get_node_from_slot(slot)
+                asking = False
+        raise ClusterError(f"Too many cluster redirections for {args[0]}") from error
+
+    @staticmethod
+    def _redirect_host(error: AskError, node: Redis) -> str:
+        return error.host or node.connection_pool.connection_kwargs["host"]
+
+    def _moved(self, error: MovedError, node: Redis) -> Redis:
+        """Point the slot of ``error`` to its new node and reload the slot map"""
+        host = self._redirect_host(error, node)
+        node = self.get_node(host, error.port)
+        self.slots[error.slot_id] = (f"{host}:{error.port}",)
+        self._start_refresh()
+        return node
+
+    @staticmethod
+    async def _execute_asking(node: Redis, *args, **options):
+        # ASKING only applies to the next command on the same connection
+        pipe = node.pipeline(transaction=False)
+        pipe.execute_command("ASKING")
+        pipe.execute_command(*args, **options)
+        _, response = await pipe.execute(raise_on_error=False)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    def pipeline(
+        self, transaction: bool = False, shard_hint: Optional[str] = None
+    ) -> "ClusterPipeline":
+        """
+        Return a new pipeline that sends the commands queued in it to their
+        nodes in parallel when it is executed. With ``transaction``, all the
+        keys of the commands must hash to the same slot.
+        """
+        return ClusterPipeline(self, transaction)
+
+    def client(self) -> "Redis":
+        raise ClusterError("A cluster client cannot use a single connection")
+
+    async def close(self, close_connection_pool: Optional[bool] = None) -> None:
+        """Close the connection pools of every node"""
+        if self._refresher is not None:
+            self._refresher.cancel()
+            self._refresher = None
+        if self._refreshing is not None:
+            self._refreshing.cancel()
+            self._refreshing = None
+        await asyncio.gather(
+            *(node.connection_pool.disconnect() for node in self.nodes.values())
+        )
+
+
+class ClusterPipeline(Pipeline):  # lgtm [py/missing-call-to-init]
+    """
+    A pipeline over the nodes of a cluster. When executed, the commands are
+    grouped by the node serving them and each group is sent, as a regular
+    pipeline, to its node, the groups in parallel. Replies are returned in
+    the order the commands were queued.
+
+    Commands redirected by the cluster, or sent to a node that failed, are
+    then retried one by one with :meth:`RedisCluster.execute_command`, so
+    a write may be applied twice if its node failed after running it.
+
+    With ``transaction``, the commands are wrapped in MULTI/EXEC, which
+    requires all their keys to hash to the same slot. WATCH is not
+    supported.
+    """
+
+    #: Errors for which a command is retried outside of the pipeline
+    RETRY_ERRORS = (
+        AskError,
+        ClusterDownError,
+        ConnectionError,
+        TimeoutError,
+        TryAgainError,
+    )
+
+    def __init__(self, cluster: RedisCluster, transaction: bool):
+        self.redis_cluster = cluster
+        self.connection_pool = cluster.connection_pool
+        self.connection = None
+        self.client_cache = None
+        self.instrumentation = cluster.instrumentation
+        self.response_callbacks = cluster.response_callbacks
+        self.is_transaction = transaction
+        self.shard_hint = None
+        self.watching = False
+        self.command_stack: CommandStackT = []
+        # the commands are packed for their node when executed
+        self.packed_commands = None
+        self.scripts = set()
+        self.explicit_transaction = False
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}<{self.redis_cluster!r}>"
+
+    async def immediate_execute_command(self, *args, **options):
+        raise ClusterError("WATCH is not supported by cluster pipelines")
+
+    async def watch(self, *names):
+        raise ClusterError("WATCH is not supported by cluster pipelines")
+
+    async def execute_iter(
+        self, raise_on_error: bool = True, chunk_size: Optional[int] = None
+    ) -> AsyncIterator[Any]:
+        """
+        Execute the pipeline and yield its results. As replies come from
+        several nodes, and some commands may be retried, the results are
+        only yielded once all of them were received.
+        """
+        for result in await self.execute(raise_on_error, chunk_size):
+            yield result
+
+    async def load_scripts(self):
+        scripts = list(self.scripts)
+        exists = await self.redis_cluster.script_exists(*(s.sha for s in scripts))
+        for script, exist in zip(scripts, exists):
+            if not exist:
+                script.sha = await self.redis_cluster.script_load(script.script)
+
+    async def _execute_stack(
+        self,
+        stack: CommandStackT,
+        raise_on_error: bool,
+        chunk_size: Optional[int] = None,
+        parallelism: Optional[int] = None,
+    ):
+        # the commands are already sent to their nodes in parallel
+        try:
+            await self.redis_cluster.initialize()
+            if self.scripts:
+                await self.load_scripts()
+            if self.is_transaction or self.explicit_transaction:
+                return await self._execute_cluster_transaction(stack, raise_on_error)
+            return await self._execute_cluster_pipeline(
+                stack, raise_on_error, chunk_size
+            )
+        finally:
+            await self.reset()
+
+    async def _execute_cluster_pipeline(
+        self,
+        stack: CommandStackT,
+        raise_on_error: bool,
+        chunk_size: Optional[int] = None,
+    ) -> List[Any]:
+        cluster = self.redis_cluster
+        response: List[Any] = [None] * len(stack)
+        retry: List[int] = []
+        groups: Dict[str, List[int]] = {}
+        for i, (args, _) in enumerate(stack):
+            if args[0] in ALL_PRIMARIES_COMMANDS:
+                retry.append(i)
+                continue
+            slot = await cluster.get_slot(*args)
+            node = cluster.get_node_from_slot(slot)
+            groups.setdefault(self._node_name(node), []).append(i)
+
+        replies = await asyncio.gather(
+            *(
+                self._execute_on_node(
+                    cluster.nodes[name], [stack[i] for i in indexes], chunk_size
+                )
+                for name, indexes in groups.items()
+            )
+        )
+        for indexes, node_replies in zip(groups.values(), replies):
+            for i, reply in zip(indexes, node_replies):
+                response[i] = reply
+                if isinstance(reply, self.RETRY_ERRORS) or _is_cluster_down(reply):
+                    retry.append(i)
+
+        # retry in the order the commands were queued
+        for i in sorted(retry):
+            args, options = stack[i]
+            try:
+                response[i] = await cluster.execute_command(*args, **options)
+            except ResponseError as e:
+                response[i] = e
+
+        if raise_on_error:
+            self.raise_first_error(stack, response)
+        return response
+
+    async def _execute_on_node(
+        self,
+        node: Redis,
+        commands: CommandStackT,
+        chunk_size: Optional[int] = None,
+    ):
+        pool = node.connection_pool
+        connection = await pool.get_connection("MULTI")
+        try:
+            return await self._execute_pipeline(connection, commands, False, chunk_size)
+        except (ConnectionError, TimeoutError) as e:
+            await connection.disconnect()
+            return [e] * len(commands)
+        finally:
+            await pool.release(connection)
+
+    async def _execute_cluster_transaction(
+        self, stack: CommandStackT, raise_on_error: bool
+    ) -> List[Any]:
+        cluster = self.redis_cluster
+        slots = {await cluster.get_slot(*args) for args, _ in stack}
+        slots.discard(None)
+        if len(slots) > 1:
+            raise ClusterCrossSlotError(
+                "Keys in a cluster transaction don't hash to the same slot"
+            )
+        slot = slots.pop() if slots else None
+        node = cluster.get_node_from_slot(slot)
+        for _ in range(cluster.max_redirects + 1):
+            pool = node.connection_pool
+            connection = await pool.get_connection("MULTI")
+            try:
+                return await self._execute_transaction(
+                    connection, stack, raise_on_error
+                )
+            except MovedError as e:
+                error = e
+                node = cluster._moved(e, node)
+            except (ConnectionError, TimeoutError):
+                await connection.disconnect()
+                raise
+            finally:
+                await pool.release(connection)
+        raise ClusterError("Too many cluster redirections for MULTI") from error
+
+    @staticmethod
+    def _node_name(node: Redis) -> str:
+        kwargs = node.connection_pool.connection_kwargs
+        return f"{kwargs['host']}:{kwargs['port']}"
@@ -7,13 +7,17 @@ import os
 import socket
 import ssl
 import threading
+import time
 import warnings
+from array import array
+from collections import deque
 from distutils.version import StrictVersion
 from itertools import chain
 from types import MappingProxyType
 from typing import (
     Any,
     Callable,
+    Deque,
     Iterable,
     List,
     Mapping,
@@ -31,22 +35,29 @@ import async_timeout
 
 from .compat import Protocol, TypedDict
 from .exceptions import (
+    AskError,
     AuthenticationError,
     AuthenticationWrongNumberOfArgsError,
     BusyLoadingError,
     ChildDeadlockedError,
+    ClusterCrossSlotError,
+    ClusterDownError,
     ConnectionError,
     DataError,
     ExecAbortError,
     InvalidResponse,
     ModuleError,
+    MovedError,
     NoPermissionError,
     NoScriptError,
     ReadOnlyError,
     RedisError,
     ResponseError,
     TimeoutError,
+    TryAgainError,
 )
+from .instrumentation import Instrumentation
+from .log import logger
 from .utils import str_if_bytes
 
 NONBLOCKING_EXCEPTION_ERROR_NUMBERS = {
@@ -74,6 +85,29 @@ else:
         )
         HIREDIS_AVAILABLE = False
 
+# returned by a reader's gets() while no complete reply is buffered. hiredis
+# returns False by default, which RESP3 booleans make ambiguous.
+NOT_ENOUGH_DATA: Any = object()
+
+HIREDIS_NOT_ENOUGH_DATA = False
+if HIREDIS_AVAILABLE:
+    try:
+        # older hiredis stubs don't know notEnoughData
+        cast(Any, hiredis).Reader(notEnoughData=NOT_ENOUGH_DATA)
+    except TypeError:
+        pass
+    else:
+        HIREDIS_NOT_ENOUGH_DATA = True
+
+
+class PushNotification(list):
+    """An out-of-band RESP3 push frame (``>``) produced by the Python readers"""
+
+
+PUSH_NOTIFICATION_TYPES: Tuple[type, ...] = (PushNotification,)
+if HIREDIS_AVAILABLE and hasattr(hiredis, "PushNotification"):
+    PUSH_NOTIFICATION_TYPES += (cast(Any, hiredis).PushNotification,)
+
 SYM_STAR = b"*"
 SYM_DOLLAR = b"$"
 SYM_CRLF = b"\r\n"
@@ -82,6 +116,11 @@ SYM_EMPTY = b""
 
 SERVER_CLOSED_CONNECTION_ERROR = "Connection closed by server."
 
+# RESP2 types followed by the ones added by RESP3
+RESP_TYPE_BYTES = frozenset(
+    (b"-", b"+", b":", b"$", b"*", b"~", b">", b"%", b"_", b"#", b",", b"(", b"=", b"!")
+)
+
 
 class _Sentinel(enum.Enum):
     sentinel = object()
@@ -107,6 +146,15 @@ class _HiredisReaderArgs(TypedDict, total=False):
     replyError: Callable[[str], Exception]
     encoding: Optional[str]
     errors: Optional[str]
+    notEnoughData: Any
+
+
+class ReaderProtocol(Protocol):
+    def feed(self, data: bytes) -> None:
+        ...
+
+    def gets(self) -> Any:
+        ...
 
 
 class Encoder:
@@ -150,6 +198,71 @@ class Encoder:
         return value
 
 
+class PackedCommands:
+    """
+    Commands packed into the Redis protocol as they are added, in one buffer
+    that is sent as is, or in slices of whole commands
+    """
+
+    __slots__ = "encoder", "data", "ends"
+
+    def __init__(self, encoder: Encoder):
+        self.encoder = encoder
+        self.data = bytearray()
+        # the offset where each command ends in data
+        self.ends = array("Q")
+
+    def __len__(self):
+        return len(self.ends)
+
+    def append(self, args: Tuple[EncodableT, ...]):
+        """Pack the command ``args`` at the end of the buffer"""
+        # literal arguments in the command name, e.g., 'CONFIG GET', are sent
+        # separately, as with Connection.pack_command
+        name = args[0]
+        assert not isinstance(name, float)
+        if isinstance(name, str):
+            name = name.encode()
+        if isinstance(name, bytes) and b" " in name:
+            args = (*name.split(), *args[1:])
+
+        data = self.data
+        start = len(data)
+        try:
+            data += b"*%d\r\n" % len(args)
+            for arg in map(self.encoder.encode, args):
+                data += b"$%d\r\n" % len(arg)
+                data += arg
+                data += SYM_CRLF
+        except BaseException:
+            # don't leave part of a command that could not be encoded
+            del data[start:]
+            raise
+        self.ends.append(len(data))
+
+    def view(self, start: int = 0, stop: Optional[int] = None) -> memoryview:
+        """Return the packed commands from ``start`` to ``stop``"""
+        ends = self.ends
+        if stop is None or stop > len(ends):
+            stop = len(ends)
+        return memoryview(self.data)[
+            ends[start - 1] if start else 0 : ends[stop - 1] if stop else 0
+        ]
+
+    def clear(self):
+        # a transport may still hold views of the previous buffer, which
+        # can't be resized while they exist
+        self.data = bytearray()
+        self.ends = array("Q")
+
+
+def _reader_decode_args(encoder: Encoder) -> _HiredisReaderArgs:
+    """Return the reader arguments that decode replies the way ``encoder`` does"""
+    if encoder.decode_responses:
+        return {"encoding": encoder.encoding, "errors": encoder.encoding_errors}
+    return {}
+
+
 ExceptionMappingT = Mapping[str, Union[Type[Exception], Mapping[str, Type[Exception]]]]
 
 
@@ -180,6 +293,11 @@ class BaseParser:
         "READONLY": ReadOnlyError,
         "NOAUTH": AuthenticationError,
         "NOPERM": NoPermissionError,
+        "MOVED": MovedError,
+        "ASK": AskError,
+        "TRYAGAIN": TryAgainError,
+        "CLUSTERDOWN": ClusterDownError,
+        "CROSSSLOT": ClusterCrossSlotError,
     }
 
     def __init__(self, socket_read_size: int):
@@ -203,7 +321,11 @@ class BaseParser:
                 exception_class = exception_class_or_dict.get(response, ResponseError)
             else:
                 exception_class = exception_class_or_dict
-            return exception_class(response)
+            try:
+                return exception_class(response)
+            except ValueError:
+                # e.g. a redirection without a valid address
+                return ResponseError(f"{error_code} {response}")
         return ResponseError(response)
 
     def on_disconnect(self):
@@ -220,6 +342,14 @@ class BaseParser:
     ) -> Union[EncodableT, ResponseError, None, List[EncodableT]]:
         raise NotImplementedError()
 
+    def feed(self, data: bytes):
+        """Add data received by a :class:`RedisProtocol` to the parser"""
+        raise NotImplementedError()
+
+    def gets(self) -> Any:
+        """Return the next complete reply from fed data or ``NOT_ENOUGH_DATA``"""
+        raise NotImplementedError()
+
 
 class SocketBuffer:
     """Async-friendly re-impl of redis-py's SocketBuffer.
@@ -234,10 +364,12 @@ class SocketBuffer:
         stream_reader: asyncio.StreamReader,
         socket_read_size: int,
         socket_timeout: Optional[float],
+        instrumentation: Optional[Instrumentation] = None,
     ):
         self._stream: Optional[asyncio.StreamReader] = stream_reader
         self.socket_read_size = socket_read_size
         self.socket_timeout = socket_timeout
+        self.instrumentation = instrumentation
         self._buffer: Optional[io.BytesIO] = io.BytesIO()
         # number of bytes written to the buffer from the socket
         self.bytes_written = 0
@@ -271,6 +403,8 @@ class SocketBuffer:
                 buf.write(data)
                 data_length = len(data)
                 self.bytes_written += data_length
+                if self.instrumentation is not None:
+                    self.instrumentation.received(data_length)
                 marker += data_length
 
                 if length is not None and length > marker:
@@ -361,25 +495,196 @@ class SocketBuffer:
         self._stream = None
 
 
+class PythonReader:
+    """Pure-Python RESP reader with the interface of ``hiredis.Reader``.
+
+    Replies are parsed iteratively out of a single ``bytearray``: partially
+    received aggregates are kept on an explicit stack rather than the call
+    stack, so ``gets()`` can return every complete reply already in the
+    buffer without awaiting once per element and resume wherever the last
+    ``feed()`` stopped.
+    """
+
+    __slots__ = (
+        "_buffer",
+        "_pos",
+        "_stack",
+        "_protocol_error",
+        "_reply_error",
+        "_encoding",
+        "_errors",
+        "_not_enough_data",
+    )
+
+    def __init__(
+        self,
+        protocolError: Callable[[str], Exception] = InvalidResponse,
+        replyError: Callable[[str], Exception] = ResponseError,
+        encoding: Optional[str] = None,
+        errors: Optional[str] = None,
+        notEnoughData: Any = False,
+    ):
+        self._buffer = bytearray()
+        self._pos = 0
+        # aggregates still being filled in, as
+        # [items, number of items missing, aggregate type byte]
+        self._stack: List[List[Any]] = []
+        self._protocol_error = protocolError
+        self._reply_error = replyError
+        self._encoding = encoding
+        self._errors = errors or "strict"
+        self._not_enough_data = notEnoughData
+
+    def feed(self, data: bytes):
+        if self._pos:
+            # drop what has already been parsed before growing the buffer
+            del self._buffer[: self._pos]
+            self._pos = 0
+        self._buffer += data
+
+    def gets(self) -> Any:  # noqa: C901
+        """Return the next complete reply, or ``notEnoughData`` if there is none"""
+        buf = self._buffer
+        pos = self._pos
+        stack = self._stack
+        encoding = self._encoding
+        response: Any
+        while True:
+            end = buf.find(SYM_CRLF, pos)
+            if end == -1:
+                break
+            byte = buf[pos]
+            if byte == 36:  # $, bulk string
+                length = int(buf[pos + 1 : end])
+                if length == -1:
+                    response = None
+                    pos = end + 2
+                else:
+                    start = end + 2
+                    if len(buf) < start + length + 2:
+                        break
+                    pos = start + length
+                    if encoding:
+                        response = buf[start:pos].decode(encoding, self._errors)
+                    else:
+                        response = bytes(buf[start:pos])
+                    pos += 2
+            elif byte == 42 or byte == 126 or byte == 62 or byte == 37:
+                # *, array; ~, set; >, push; %, map
+                length = int(buf[pos + 1 : end])
+                pos = end + 2
+                if length > 0:
+                    # maps are read as a flat list of keys and values
+                    stack.append([[], length * 2 if byte == 37 else length, byte])
+                    continue
+                if length == -1:
+                    response = None
+                else:
+                    response = self._aggregate(byte, [])
+            elif byte == 43:  # +, simple string
+                if encoding:
+                    response = buf[pos + 1 : end].decode(encoding, self._errors)
+                else:
+                    response = bytes(buf[pos + 1 : end])
+                pos = end + 2
+            elif byte == 58 or byte == 40:  # :, integer; (, big number
+                response = int(buf[pos + 1 : end])
+                pos = end + 2
+            elif byte == 45:  # -, error
+                response = self._reply_error(
+                    buf[pos + 1 : end].decode("utf-8", errors="replace")
+                )
+                pos = end + 2
+            elif byte == 95:  # _, null
+                response = None
+                pos = end + 2
+            elif byte == 35:  # #, boolean
+                response = buf[pos + 1] == 116
+                pos = end + 2
+            elif byte == 44:  # ,, double
+                response = float(buf[pos + 1 : end])
+                pos = end + 2
+            elif byte == 61 or byte == 33:  # =, verbatim string; !, blob error
+                start = end + 2
+                length = int(buf[pos + 1 : end])
+                if len(buf) < start + length + 2:
+                    break
+                pos = start + length + 2
+                if byte == 33:
+                    response = self._reply_error(
+                        buf[start : pos - 2].decode("utf-8", errors="replace")
+                    )
+                # skip the three letter format and the colon
+                elif encoding:
+                    response = buf[start + 4 : pos - 2].decode(encoding, self._errors)
+                else:
+                    response = bytes(buf[start + 4 : pos - 2])
+            else:
+                raise self._protocol_error(f"Protocol Error: {bytes(buf[pos:end])!r}")
+
+            # hand the reply to the innermost open aggregate, closing every
+            # aggregate it completes on the way out
+            while stack:
+                frame = stack[-1]
+                frame[0].append(response)
+                frame[1] -= 1
+                if frame[1]:
+                    break
+                stack.pop()
+                response = frame[0]
+                if frame[2] != 42:
+                    response = self._aggregate(frame[2], response)
+            else:
+                self._pos = pos
+                return response
+
+        self._pos = pos
+        return self._not_enough_data
+
+    @staticmethod
+    def _aggregate(byte: int, items: List[Any]) -> Any:
+        if byte == 37:  # %, map
+            it = iter(items)
+            return dict(zip(it, it))
+        if byte == 62:  # >, push
+            return PushNotification(items)
+        return items
+
+
 class PythonParser(BaseParser):
     """Plain Python parsing class"""
 
-    __slots__ = BaseParser.__slots__ + ("encoder",)
+    __slots__ = BaseParser.__slots__ + ("encoder", "_reader")
 
     def __init__(self, socket_read_size: int):
         super().__init__(socket_read_size)
         self.encoder: Optional[Encoder] = None
+        self._reader: Optional[PythonReader] = None
 
     def on_connect(self, connection: "Connection"):
         """Called when the stream connects"""
+        self.encoder = connection.encoder
+        if connection.direct_transport:
+            # data is pushed to us by the connection's RedisProtocol
+            kwargs: _HiredisReaderArgs = {
+                "protocolError": InvalidResponse,
+                "replyError": self.parse_error,
+                "notEnoughData": NOT_ENOUGH_DATA,
+            }
+            kwargs.update(_reader_decode_args(connection.encoder))
+            self._reader = PythonReader(**kwargs)
+            return
+
         self._stream = connection._reader
         if self._stream is None:
             raise RedisError("Buffer is closed.")
 
         self._buffer = SocketBuffer(
-            self._stream, self._read_size, connection.socket_timeout
+            self._stream,
+            self._read_size,
+            connection.socket_timeout,
+            connection.instrumentation,
         )
-        self.encoder = connection.encoder
 
     def on_disconnect(self):
         """Called when the stream disconnects"""
@@ -388,8 +693,19 @@ class PythonParser(BaseParser):
         if self._buffer is not None:
             self._buffer.close()
             self._buffer = None
+        self._reader = None
         self.encoder = None
 
+    def feed(self, data: bytes):
+        if self._reader is None:
+            raise RedisError("Buffer is closed.")
+        self._reader.feed(data)
+
+    def gets(self) -> Any:
+        if self._reader is None:
+            raise ConnectionError(SERVER_CLOSED_CONNECTION_ERROR)
+        return self._reader.gets()
+
     async def can_read(self, timeout: float):
         return self._buffer and bool(await self._buffer.can_read(timeout))
 
@@ -402,7 +718,7 @@ class PythonParser(BaseParser):
         response: Any
         byte, response = raw[:1], raw[1:]
 
-        if byte not in (b"-", b"+", b":", b"$", b"*"):
+        if byte not in RESP_TYPE_BYTES:
             raise InvalidResponse(f"Protocol Error: {raw!r}")
 
         # server returned an error
@@ -436,24 +752,69 @@ class PythonParser(BaseParser):
             if length == -1:
                 return None
             response = [(await self.read_response()) for _ in range(length)]
+        else:
+            return await self._read_resp3_response(byte, response)
         if isinstance(response, bytes):
             response = self.encoder.decode(response)
         return response
 
+    async def _read_resp3_response(self, byte: bytes, response: bytes) -> Any:
+        """Read the rest of a reply of one of the types added by RESP3"""
+        # set and push responses
+        if byte == b"~":
+            return [(await self.read_response()) for _ in range(int(response))]
+        if byte == b">":
+            return PushNotification(
+                [(await self.read_response()) for _ in range(int(response))]
+            )
+        # map response
+        if byte == b"%":
+            mapping = {}
+            for _ in range(int(response)):
+                key = await self.read_response()
+                mapping[key] = await self.read_response()
+            return mapping
+        # null, boolean, double and big number
+        if byte == b"_":
+            return None
+        if byte == b"#":
+            return response == b"t"
+        if byte == b",":
+            return float(response)
+        if byte == b"(":
+            return int(response)
+        # blob error
+        if byte == b"!":
+            error = await self._buffer.read(int(response))  # type: ignore[union-attr]
+            return self.parse_error(error.decode("utf-8", errors="replace"))
+        # verbatim string, with its three letter format prefix stripped
+        verbatim = await self._buffer.read(int(response))  # type: ignore[union-attr]
+        return self.encoder.decode(verbatim[4:])  # type: ignore[union-attr]
+
+
+class ReaderParser(BaseParser):
+    """Base class for parsers driving a hiredis-style ``feed()``/``gets()`` reader"""
+
+    __slots__ = BaseParser.__slots__ + (
+        "_next_response",
+        "_reader",
+        "_socket_timeout",
+        "_not_enough_data",
+        "_instrumentation",
+    )
 
-class HiredisParser(BaseParser):
-    """Parser class for connections using Hiredis"""
-
-    __slots__ = BaseParser.__slots__ + ("_next_response", "_reader", "_socket_timeout")
-
-    _next_response: bool
+    _next_response: Any
 
     def __init__(self, socket_read_size: int):
-        if not HIREDIS_AVAILABLE:
-            raise RedisError("Hiredis is not available.")
         super().__init__(socket_read_size=socket_read_size)
-        self._reader: Optional[hiredis.Reader] = None
+        self._reader: Optional[ReaderProtocol] = None
         self._socket_timeout: Optional[float] = None
+        self._instrumentation: Optional[Instrumentation] = None
+        # what the reader's gets() returns when it has no complete reply
+        self._not_enough_data: Any = NOT_ENOUGH_DATA
+
+    def _create_reader(self, kwargs: _HiredisReaderArgs) -> "ReaderProtocol":
+        raise NotImplementedError()
 
     def on_connect(self, connection: "Connection"):
         self._stream = connection._reader
@@ -461,26 +822,26 @@ class HiredisParser(BaseParser):
             "protocolError": InvalidResponse,
             "replyError": self.parse_error,
         }
-        if connection.encoder.decode_responses:
-            kwargs["encoding"] = connection.encoder.encoding
-            kwargs["errors"] = connection.encoder.encoding_errors
+        kwargs.update(_reader_decode_args(connection.encoder))
+        kwargs["notEnoughData"] = self._not_enough_data
 
-        self._reader = hiredis.Reader(**kwargs)
-        self._next_response = False
+        self._reader = self._create_reader(kwargs)
+        self._next_response = self._not_enough_data
         self._socket_timeout = connection.socket_timeout
+        self._instrumentation = connection.instrumentation
 
     def on_disconnect(self):
         self._stream = None
         self._reader = None
-        self._next_response = False
+        self._next_response = self._not_enough_data
 
     async def can_read(self, timeout: float):
         if not self._reader:
             raise ConnectionError(SERVER_CLOSED_CONNECTION_ERROR)
 
-        if self._next_response is False:
+        if self._next_response is self._not_enough_data:
             self._next_response = self._reader.gets()
-        if self._next_response is False:
+        if self._next_response is self._not_enough_data:
             return await self.read_from_socket(timeout=timeout, raise_on_timeout=False)
         return True
 
@@ -498,6 +859,8 @@ class HiredisParser(BaseParser):
                 buffer = await self._stream.read(self._read_size)
             if not isinstance(buffer, bytes) or len(buffer) == 0:
                 raise ConnectionError(SERVER_CLOSED_CONNECTION_ERROR) from None
+            if self._instrumentation is not None:
+                self._instrumentation.received(len(buffer))
             self._reader.feed(buffer)
             # data was read from the socket and added to the buffer.
             # return True to indicate that data was read.
@@ -527,13 +890,13 @@ class HiredisParser(BaseParser):
             EncodableT, ConnectionError, List[Union[EncodableT, ConnectionError]]
         ]
         # _next_response might be cached from a can_read() call
-        if self._next_response is not False:
-            response = self._next_response
-            self._next_response = False
-            return response
+        if self._next_response is not self._not_enough_data:
+            next_response = self._next_response
+            self._next_response = self._not_enough_data
+            return next_response
 
         response = self._reader.gets()
-        while response is False:
+        while response is self._not_enough_data:
             await self.read_from_socket()
             response = self._reader.gets()
 
@@ -551,12 +914,217 @@ class HiredisParser(BaseParser):
         # cast as there won't be a ConnectionError here.
         return cast(Union[EncodableT, List[EncodableT]], response)
 
+    def feed(self, data: bytes):
+        if self._reader is None:
+            raise RedisError("Parser already closed.")
+        self._reader.feed(data)
+
+    def gets(self) -> Any:
+        if self._reader is None:
+            raise ConnectionError(SERVER_CLOSED_CONNECTION_ERROR)
+        response = self._reader.gets()
+        if response is self._not_enough_data:
+            return NOT_ENOUGH_DATA
+        return response
+
+
+class HiredisParser(ReaderParser):
+    """Parser class for connections using Hiredis"""
+
+    __slots__ = ()
 
-DefaultParser: Type[Union[PythonParser, HiredisParser]]
+    def __init__(self, socket_read_size: int):
+        if not HIREDIS_AVAILABLE:
+            raise RedisError("Hiredis is not available.")
+        super().__init__(socket_read_size=socket_read_size)
+        if not HIREDIS_NOT_ENOUGH_DATA:
+            self._not_enough_data = False
+
+    def on_connect(self, connection: "Connection"):
+        if connection.protocol == 3 and not HIREDIS_NOT_ENOUGH_DATA:
+            raise RedisError(
+                f"hiredis {hiredis.__version__} does not support RESP3, "
+                "upgrade it or use PythonReaderParser."
+            )
+        super().on_connect(connection)
+
+    def _create_reader(self, kwargs: _HiredisReaderArgs) -> "ReaderProtocol":
+        if not HIREDIS_NOT_ENOUGH_DATA:
+            del kwargs["notEnoughData"]
+        return cast(Any, hiredis).Reader(**kwargs)
+
+
+class PythonReaderParser(ReaderParser):
+    """Pure-Python parser class using the iterative :class:`PythonReader`"""
+
+    __slots__ = ()
+
+    def _create_reader(self, kwargs: _HiredisReaderArgs) -> "ReaderProtocol":
+        return PythonReader(**kwargs)
+
+
+DefaultParser: Type[Union[PythonReaderParser, HiredisParser]]
 if HIREDIS_AVAILABLE:
     DefaultParser = HiredisParser
 else:
-    DefaultParser = PythonParser
+    DefaultParser = PythonReaderParser
+
+
+class RedisProtocol(asyncio.Protocol):
+    """asyncio Protocol used by connections created with ``direct_transport``.
+
+    Bytes received from the transport are fed straight into the connection's
+    parser and each complete reply resolves the oldest pending reader from
+    within ``data_received``, so there is no ``asyncio.StreamReader`` (and no
+    second copy of the data) between the socket and the parser.
+    """
+
+    def __init__(
+        self, parser: BaseParser, instrumentation: Optional[Instrumentation] = None
+    ):
+        self._parser = parser
+        self._instrumentation = instrumentation
+        self._loop = asyncio.get_event_loop()
+        self.transport: Optional[asyncio.Transport] = None
+        # readers waiting for a reply, in the order their commands were sent
+        self._waiters: Deque[asyncio.Future] = deque()
+        # replies that arrived before anyone asked for them (e.g. pubsub)
+        self._replies: Deque[Any] = deque()
+        self._readable: Optional[asyncio.Future] = None
+        self._exc: Optional[Exception] = None
+        self._paused = False
+        self._drain_waiters: Deque[asyncio.Future] = deque()
+        self._closed = self._loop.create_future()
+
+    def connection_made(self, transport: asyncio.BaseTransport):
+        self.transport = cast(asyncio.Transport, transport)
+
+    def data_received(self, data: bytes):
+        parser = self._parser
+        if self._instrumentation is not None:
+            self._instrumentation.received(len(data))
+        try:
+            parser.feed(data)
+            response = parser.gets()
+            while response is not NOT_ENOUGH_DATA:
+                self._deliver(response)
+                response = parser.gets()
+        except Exception as exc:
+            self._set_exception(exc)
+            if self.transport is not None:
+                self.transport.close()
+
+    def _deliver(self, response: Any):
+        if self._waiters:
+            waiter = self._waiters.popleft()
+            # a cancelled reader still owns this reply, so it is dropped
+            if not waiter.done():
+                waiter.set_result(response)
+            return
+        self._replies.append(response)
+        if self._readable is not None and not self._readable.done():
+            self._readable.set_result(None)
+
+    def _set_exception(self, exc: Exception):
+        if self._exc is None:
+            self._exc = exc
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_exception(exc)
+        while self._drain_waiters:
+            waiter = self._drain_waiters.popleft()
+            if not waiter.done():
+                waiter.set_exception(exc)
+        if self._readable is not None and not self._readable.done():
+            self._readable.set_result(None)
+
+    def connection_lost(self, exc: Optional[Exception]):
+        if exc is None:
+            self._set_exception(ConnectionError(SERVER_CLOSED_CONNECTION_ERROR))
+        else:
+            self._set_exception(
+                ConnectionError(f"Error while reading from socket: {exc.args}")
+            )
+        if not self._closed.done():
+            self._closed.set_result(None)
+
+    def pause_writing(self):
+        self._paused = True
+
+    def resume_writing(self):
+        self._paused = False
+        while self._drain_waiters:
+            waiter = self._drain_waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def writelines(self, data: Iterable[EncodedT]):
+        if self.is_closing():
+            raise ConnectionError(SERVER_CLOSED_CONNECTION_ERROR)
+        # transports accept any iterable, though typeshed asks for a list
+        self.transport.writelines(data)  # type: ignore
+
+    async def drain(self):
+        if self._exc is not None:
+            raise self._exc
+        if not self._paused:
+            return
+        waiter = self._loop.create_future()
+        self._drain_waiters.append(waiter)
+        await waiter
+
+    async def read_response(self) -> Any:
+        if self._replies:
+            response = self._replies.popleft()
+        elif self._exc is not None:
+            raise self._exc
+        else:
+            waiter = self._loop.create_future()
+            self._waiters.append(waiter)
+            response = await waiter
+
+        # if the response is a ConnectionError or the response is a list and
+        # the first item is a ConnectionError, raise it as something bad
+        # happened
+        if isinstance(response, ConnectionError):
+            raise response
+        elif (
+            isinstance(response, list)
+            and response
+            and isinstance(response[0], ConnectionError)
+        ):
+            raise response[0]
+        return response
+
+    async def can_read(self, timeout: float) -> bool:
+        if self._replies:
+            return True
+        if self._exc is not None:
+            raise self._exc
+        if not timeout:
+            return False
+        if self._readable is None or self._readable.done():
+            self._readable = self._loop.create_future()
+        await asyncio.wait((self._readable,), timeout=timeout)
+        if not self._replies and self._exc is not None:
+            raise self._exc
+        return bool(self._replies)
+
+    def is_closing(self) -> bool:
+        """Whether the connection was closed or lost"""
+        return self.transport is None or self.transport.is_closing()
+
+    def at_eof(self) -> bool:
+        """Whether the connection was lost and every reply has been read"""
+        return self._exc is not None and not self._replies
+
+    def close(self):
+        if self.transport is not None:
+            self.transport.close()
+
+    async def wait_closed(self):
+        await self._closed
 
 
 class ConnectCallbackProtocol(Protocol):
@@ -592,10 +1160,16 @@ class Connection:
         "health_check_interval",
         "next_health_check",
         "last_active_at",
+        "connected_at",
         "encoder",
         "ssl_context",
+        "protocol",
+        "direct_transport",
+        "pending_replies",
+        "instrumentation",
         "_reader",
         "_writer",
+        "_protocol",
         "_parser",
         "_connect_callbacks",
         "_buffer_cutoff",
@@ -625,7 +1199,12 @@ class Connection:
         client_name: Optional[str] = None,
         username: Optional[str] = None,
         encoder_class: Type[Encoder] = Encoder,
+        direct_transport: bool = False,
+        protocol: int = 2,
+        instrumentation: Optional[Instrumentation] = None,
     ):
+        if protocol not in (2, 3):
+            raise ValueError('"protocol" must be 2 or 3')
         self.pid = os.getpid()
         self.host = host
         self.port = int(port)
@@ -643,8 +1222,15 @@ class Connection:
         self.next_health_check: float = -1
         self.ssl_context: Optional[RedisSSLContext] = None
         self.encoder = encoder_class(encoding, encoding_errors, decode_responses)
+        self.protocol = protocol
+        self.direct_transport = direct_transport
+        self.pending_replies = 0
+        self.last_active_at: float = -1
+        self.connected_at: float = -1
+        self.instrumentation = instrumentation
         self._reader: Optional[asyncio.StreamReader] = None
         self._writer: Optional[asyncio.StreamWriter] = None
+        self._protocol: Optional[RedisProtocol] = None
         self._parser = parser_class(
             socket_read_size=socket_read_size,
         )
@@ -676,8 +1262,23 @@ class Connection:
 
     @property
     def is_connected(self):
+        if self.direct_transport:
+            # a connection lost by the server is reconnected on next use
+            return self._protocol is not None and not self._protocol.is_closing()
         return bool(self._reader and self._writer)
 
+    @property
+    def is_dirty(self) -> bool:
+        """
+        Whether the connection must be reset before it is reused, judged
+        without any I/O: a reply was left unread or the server closed it
+        """
+        if self.pending_replies:
+            return True
+        if self._protocol is not None:
+            return self._protocol.at_eof()
+        return self._reader is not None and self._reader.at_eof()
+
     def register_connect_callback(self, callback):
         self._connect_callbacks.append(callback)
 
@@ -688,6 +1289,8 @@ class Connection:
         """Connects to the Redis server if not already connected"""
         if self.is_connected:
             return
+        reconnect = self.connected_at != -1
+        start = time.perf_counter()
         try:
             await self._connect()
         except asyncio.CancelledError:
@@ -698,13 +1301,18 @@ class Connection:
             raise ConnectionError(self._error_message(e))
         except Exception as exc:
             raise ConnectionError(exc) from exc
+        self.connected_at = time.monotonic()
 
+        handshake_start = time.perf_counter()
         try:
             await self.on_connect()
         except RedisError:
             # clean up after any error in on_connect
             await self.disconnect()
             raise
+        if self.instrumentation is not None:
+            end = time.perf_counter()
+            self.instrumentation.connect(end - start, end - handshake_start, reconnect)
 
         # run any user callbacks. right now the only internal callback
         # is for pubsub channel/pattern resubscription
@@ -715,15 +1323,27 @@ class Connection:
 
     async def _connect(self):
         """Create a TCP socket connection"""
+        transport: asyncio.BaseTransport
         async with async_timeout.timeout(self.socket_connect_timeout):
-            reader, writer = await asyncio.open_connection(
-                host=self.host,
-                port=self.port,
-                ssl=self.ssl_context.get() if self.ssl_context else None,
-            )
-        self._reader = reader
-        self._writer = writer
-        sock = writer.transport.get_extra_info("socket")
+            if self.direct_transport:
+                transport, protocol = await asyncio.get_event_loop().create_connection(
+                    self._make_protocol,
+                    host=self.host,
+                    port=self.port,
+                    ssl=self.ssl_context.get() if self.ssl_context else None,
+                )
+                assert isinstance(protocol, RedisProtocol)
+                self._protocol = protocol
+            else:
+                reader, writer = await asyncio.open_connection(
+                    host=self.host,
+                    port=self.port,
+                    ssl=self.ssl_context.get() if self.ssl_context else None,
+                )
+                self._reader = reader
+                self._writer = writer
+                transport = writer.transport
+        sock = transport.get_extra_info("socket")
         if sock is not None:
             sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
             try:
@@ -736,9 +1356,12 @@ class Connection:
             except (OSError, TypeError):
                 # `socket_keepalive_options` might contain invalid options
                 # causing an error. Do not leave the connection open.
-                writer.close()
+                transport.close()
                 raise
 
+    def _make_protocol(self) -> "RedisProtocol":
+        return RedisProtocol(self._parser, self.instrumentation)
+
     def _error_message(self, exception):
         # args for socket.error can either be (errno, "message")
         # or just "message"
@@ -753,61 +1376,115 @@ class Connection:
     async def on_connect(self):
         """Initialize the connection, authenticate and select a database"""
         self._parser.on_connect(self)
+        try:
+            await self._handshake(self.username)
+        except AuthenticationWrongNumberOfArgsError:
+            # a username and password were specified but the Redis
+            # server seems to be < 6.0.0 which expects a single password
+            # arg. the rest of the handshake is still in flight, so start
+            # over on a new socket and retry auth with just the password.
+            # https://github.com/andymccurdy/redis-py/issues/1274
+            await self.disconnect()
+            await self._connect()
+            self._parser.on_connect(self)
+            await self._handshake(None)
 
-        # if username and/or password are set, authenticate
-        if self.username or self.password:
-            auth_args: Union[Tuple[str], Tuple[str, str]]
-            if self.username:
-                auth_args = (self.username, self.password or "")
-            else:
-                # Mypy bug: https://github.com/python/mypy/issues/10944
-                auth_args = (self.password or "",)
-            # avoid checking health here -- PING will fail if we try
-            # to check the health prior to the AUTH
-            await self.send_command("AUTH", *auth_args, check_health=False)
+    async def _handshake(self, username: Optional[str]):
+        """
+        Authenticate, name the connection and select its database in a single
+        round trip: the commands are pipelined, folding AUTH and SETNAME into
+        HELLO when switching protocols.
+        """
+        commands = self._handshake_commands(username)
+        if not commands:
+            return
 
+        # avoid checking health here -- PING will fail if we try
+        # to check the health prior to the AUTH
+        await self.send_packed_command(
+            self.pack_commands(commands), check_health=False, replies=len(commands)
+        )
+        for command in commands:
+            await self._check_handshake_reply(command[0])
+
+    def _handshake_commands(
+        self, username: Optional[str]
+    ) -> List[Tuple[EncodableT, ...]]:
+        commands: List[Tuple[EncodableT, ...]] = []
+        password = self.password or ""
+        if self.protocol != 2:
+            hello: List[EncodableT] = ["HELLO", self.protocol]
+            if username or self.password:
+                hello.extend(("AUTH", username or "default", password))
+            if self.client_name:
+                hello.extend(("SETNAME", self.client_name))
+            commands.append(tuple(hello))
+        else:
+            if username:
+                commands.append(("AUTH", username, password))
+            elif self.password:
+                commands.append(("AUTH", password))
+            if self.client_name:
+                commands.append(("CLIENT", "SETNAME", self.client_name))
+        if self.db:
+            commands.append(("SELECT", self.db))
+        return commands
+
+    async def _check_handshake_reply(self, command: EncodableT):
+        if command == "HELLO":
             try:
-                auth_response = await self.read_response()
-            except AuthenticationWrongNumberOfArgsError:
-                # a username and password were specified but the Redis
-                # server seems to be < 6.0.0 which expects a single password
-                # arg. retry auth with just the password.
-                # https://github.com/andymccurdy/redis-py/issues/1274
-                await self.send_command("AUTH", self.password, check_health=False)
-                auth_response = await self.read_response()
-
-            if str_if_bytes(auth_response) != "OK":
+                response = await self.read_response()
+            except ResponseError as e:
+                if str(e).startswith("WRONGPASS"):
+                    raise
+                raise ConnectionError(
+                    f"Server does not support RESP{self.protocol}: {e}"
+                ) from e
+            if self._hello_proto(response) != self.protocol:
+                raise ConnectionError(f"Failed to switch to RESP{self.protocol}")
+        elif command == "AUTH":
+            if str_if_bytes(await self.read_response()) != "OK":
                 raise AuthenticationError("Invalid Username or Password")
-
-        # if a client_name is given, set it
-        if self.client_name:
-            await self.send_command("CLIENT", "SETNAME", self.client_name)
+        elif command == "CLIENT":
             if str_if_bytes(await self.read_response()) != "OK":
                 raise ConnectionError("Error setting client name")
-
-        # if a database is specified, switch to it
-        if self.db:
-            await self.send_command("SELECT", self.db)
-            if str_if_bytes(await self.read_response()) != "OK":
-                raise ConnectionError("Invalid Database")
+        elif str_if_bytes(await self.read_response()) != "OK":
+            raise ConnectionError("Invalid Database")
+
+    @staticmethod
+    def _hello_proto(response: Any) -> Optional[int]:
+        """Return the protocol version reported by a HELLO response"""
+        if isinstance(response, list):
+            it = iter(response)
+            response = dict(zip(it, it))
+        if not isinstance(response, dict):
+            return None
+        return response.get(b"proto", response.get("proto"))
 
     async def disconnect(self):
         """Disconnects from the Redis server"""
         try:
             async with async_timeout.timeout(self.socket_connect_timeout):
                 self._parser.on_disconnect()
-                if not self.is_connected:
+                # a protocol whose connection was lost is still cleared
+                if not self.is_connected and self._protocol is None:
                     return
                 try:
                     if os.getpid() == self.pid:
-                        self._writer.close()  # type: ignore[union-attr]
-                        # py3.6 doesn't have this method
-                        if hasattr(self._writer, "wait_closed"):
-                            await self._writer.wait_closed()  # type: ignore[union-attr]
+                        if self._protocol is not None:
+                            self._protocol.close()
+                            await self._protocol.wait_closed()
+                        else:
+                            self._writer.close()  # type: ignore[union-attr]
+                            # py3.6 doesn't have this method
+                            if hasattr(self._writer, "wait_closed"):
+                                await self._writer.wait_closed()  # type: ignore[union-attr]
                 except OSError:
                     pass
                 self._reader = None
                 self._writer = None
+                self._protocol = None
+                self.pending_replies = 0
         except asyncio.TimeoutError:
             raise TimeoutError(
                 f"Timed out closing connection after {self.socket_connect_timeout}"
@@ -834,20 +1511,32 @@ class Connection:
                 except BaseException as err2:
                     raise err2 from err
 
-    async def _send_packed_command(self, command: Iterable[bytes]) -> None:
-        if self._writer is None:
+    async def _send_packed_command(self, command: Iterable[EncodedT]) -> None:
+        writer: Union[asyncio.StreamWriter, RedisProtocol, None]
+        writer = self._protocol if self.direct_transport else self._writer
+        if writer is None:
             raise RedisError("Connection already closed.")
 
-        self._writer.writelines(command)
-        await self._writer.drain()
+        writer.writelines(command)
+        # the transport writes straight to the socket whenever it can, so
+        # data is only left buffered when the socket is busy. drain() then
+        # blocks once the buffer goes above the transport's high-water mark,
+        # bounded by the socket timeout
+        if writer.transport.get_write_buffer_size():  # type: ignore[union-attr]
+            async with async_timeout.timeout(self.socket_timeout):
+                await writer.drain()
 
     async def send_packed_command(
         self,
-        command: Union[bytes, str, Iterable[bytes]],
+        command: Union[bytes, str, Iterable[EncodedT]],
         check_health: bool = True,
+        replies: int = 1,
     ):
-        """Send an already packed command to the Redis server"""
-        if not self._writer:
+        """
+        Send an already packed command to the Redis server. ``replies`` is the
+        number of replies it asks for, when several commands were packed.
+        """
+        if not self.is_connected:
             await self.connect()
         # guard against health check recursion
         if check_health:
@@ -857,10 +1546,16 @@ class Connection:
                 command = command.encode()
             if isinstance(command, bytes):
                 command = [command]
-            await asyncio.wait_for(
-                self._send_packed_command(command),
-                self.socket_timeout,
-            )
+            if self.instrumentation is None:
+                await self._send_packed_command(command)
+            else:
+                command = list(command)
+                start = time.perf_counter()
+                await self._send_packed_command(command)
+                self.instrumentation.write(
+                    time.perf_counter() - start, sum(map(len, command))
+                )
+            self.pending_replies += replies
         except asyncio.TimeoutError:
             await self.disconnect()
             raise TimeoutError("Timeout writing to socket") from None
@@ -890,14 +1585,22 @@ class Connection:
         """Poll the socket to see if there's data that can be read."""
         if not self.is_connected:
             await self.connect()
+        if self._protocol is not None:
+            return await self._protocol.can_read(timeout)
         return await self._parser.can_read(timeout)
 
     async def read_response(self):
         """Read the response from a previously sent command"""
+        instrumentation = self.instrumentation
+        if instrumentation is not None:
+            start = time.perf_counter()
         try:
             async with self._lock:
                 async with async_timeout.timeout(self.socket_timeout):
-                    response = await self._parser.read_response()
+                    if self._protocol is not None:
+                        response = await self._protocol.read_response()
+                    else:
+                        response = await self._parser.read_response()
         except asyncio.TimeoutError:
             await self.disconnect()
             raise TimeoutError(f"Timeout reading from {self.host}:{self.port}")
@@ -910,6 +1613,10 @@ class Connection:
             await self.disconnect()
             raise
 
+        if self.pending_replies:
+            self.pending_replies -= 1
+        if instrumentation is not None:
+            instrumentation.read(time.perf_counter() - start)
         if self.health_check_interval:
             self.next_health_check = (
                 asyncio.get_event_loop().time() + self.health_check_interval
@@ -1103,7 +1810,12 @@ class UnixDomainSocketConnection(Connection):  # lgtm [py/missing-call-to-init]
         socket_read_size: int = 65536,
         health_check_interval: float = 0.0,
         client_name=None,
+        direct_transport: bool = False,
+        protocol: int = 2,
+        instrumentation: Optional[Instrumentation] = None,
     ):
+        if protocol not in (2, 3):
+            raise ValueError('"protocol" must be 2 or 3')
         self.pid = os.getpid()
         self.path = path
         self.db = db
@@ -1116,9 +1828,16 @@ class UnixDomainSocketConnection(Connection):  # lgtm [py/missing-call-to-init]
         self.health_check_interval = health_check_interval
         self.next_health_check = -1
         self.encoder = Encoder(encoding, encoding_errors, decode_responses)
+        self.protocol = protocol
+        self.direct_transport = direct_transport
+        self.pending_replies = 0
+        self.last_active_at: float = -1
+        self.connected_at: float = -1
+        self.instrumentation = instrumentation
         self._sock = None
         self._reader = None
         self._writer = None
+        self._protocol = None
         self._parser = parser_class(socket_read_size=socket_read_size)
         self._connect_callbacks = []
         self._buffer_cutoff = 6000
@@ -1135,10 +1854,17 @@ class UnixDomainSocketConnection(Connection):  # lgtm [py/missing-call-to-init]
 
     async def _connect(self):
         async with async_timeout.timeout(self.socket_connect_timeout):
-            reader, writer = await asyncio.open_unix_connection(path=self.path)
-        self._reader = reader
-        self._writer = writer
-        await self.on_connect()
+            if self.direct_transport:
+                loop = asyncio.get_event_loop()
+                _, protocol = await loop.create_unix_connection(
+                    self._make_protocol, path=self.path
+                )
+                assert isinstance(protocol, RedisProtocol)
+                self._protocol = protocol
+            else:
+                reader, writer = await asyncio.open_unix_connection(path=self.path)
+                self._reader = reader
+                self._writer = writer
 
     def _error_message(self, exception):
         # args for socket.error can either be (errno, "message")
@@ -1173,6 +1899,16 @@ URL_QUERY_ARGUMENT_PARSERS: Mapping[str, Callable[..., object]] = MappingProxyTy
         "max_connections": int,
         "health_check_interval": int,
         "ssl_check_hostname": to_bool,
+        "direct_transport": to_bool,
+        "fast_path": to_bool,
+        "wait": to_bool,
+        "wait_timeout": float,
+        "min_idle": int,
+        "prewarm": int,
+        "max_idle_time": float,
+        "max_lifetime": float,
+        "reap_interval": float,
+        "protocol": int,
     }
 )
 
@@ -1249,10 +1985,33 @@ class ConnectionPool:
     object raises :py:class:`~redis.ConnectionError` when the pool's
     limit is reached.
 
+    With ``wait`` enabled, callers wait for a connection instead, for up to
+    ``wait_timeout`` seconds. Waiters are served in FIFO order: a released
+    connection is handed directly to the longest waiting caller, so
+    newcomers cannot overtake it.
+
     By default, TCP connections are created unless ``connection_class``
     is specified. Use :py:class:`~redis.UnixDomainSocketConnection` for
     unix sockets.
 
+    With ``fast_path`` enabled, checkouts and releases skip the pool lock,
+    which a single event loop doesn't need, and connections are not probed
+    for pending data on checkout. A connection is reset instead when its
+    ``is_dirty`` flag shows that a reply was left unread or the server
+    closed it.
+
+    ``prewarm`` connections are opened concurrently by :meth:`warm`, which
+    :py:class:`~aioredis.client.Redis` calls before its first command. With
+    ``min_idle`` set, the pool also reopens connections in the background
+    whenever a checkout leaves fewer than that many idle.
+
+    Idle connections are closed by a background task, checking every
+    ``reap_interval`` seconds, once they have been unused for
+    ``max_idle_time`` seconds (keeping ``min_idle`` of them), so the pool
+    shrinks back after a burst. Connections older than ``max_lifetime``
+    seconds are retired one per check, once idle, so that they are
+    replaced gradually rather than all at once.
+
     Any additional keyword arguments are passed to the constructor of
     ``connection_class``.
     """
@@ -1305,15 +2064,38 @@ class ConnectionPool:
         self,
         connection_class: Type[Connection] = Connection,
         max_connections: Optional[int] = None,
+        fast_path: bool = False,
+        wait: bool = False,
+        wait_timeout: Optional[float] = None,
+        min_idle: int = 0,
+        prewarm: int = 0,
+        max_idle_time: Optional[float] = None,
+        max_lifetime: Optional[float] = None,
+        reap_interval: float = 1.0,
         **connection_kwargs,
     ):
         max_connections = max_connections or 2**31
         if not isinstance(max_connections, int) or max_connections < 0:
             raise ValueError('"max_connections" must be a positive integer')
+        if min_idle < 0 or prewarm < 0:
+            raise ValueError('"min_idle" and "prewarm" must not be negative')
 
         self.connection_class = connection_class
         self.connection_kwargs = connection_kwargs
         self.max_connections = max_connections
+        self.fast_path = fast_path
+        self.wait = wait
+        self.wait_timeout = wait_timeout
+        self.min_idle = min_idle
+        self.prewarm = prewarm
+        # whether warm() has run, so clients only warm the pool once
+        self.warmed = not (min_idle or prewarm)
+        self._warming = 0
+        self._refill_task: Optional[asyncio.Task] = None
+        self.max_idle_time = max_idle_time
+        self.max_lifetime = max_lifetime
+        self.reap_interval = reap_interval
+        self._reaper_task: Optional[asyncio.Task] = None
 
         # a lock to protect the critical section in _checkpid().
         # this lock is acquired when the process id changes, such as
@@ -1328,8 +2110,12 @@ class ConnectionPool:
         self._created_connections: int
         self._available_connections: List[Connection]
         self._in_use_connections: Set[Connection]
+        self._waiters: Deque[asyncio.Future]
         self.reset()  # lgtm [py/init-calls-subclass]
         self.encoder_class = self.connection_kwargs.get("encoder_class", Encoder)
+        self.instrumentation: Optional[Instrumentation] = self.connection_kwargs.get(
+            "instrumentation"
+        )
 
     def __repr__(self):
         return (
@@ -1342,6 +2128,7 @@ class ConnectionPool:
         self._created_connections = 0
         self._available_connections = []
         self._in_use_connections = set()
+        self._waiters = deque()
 
         # this must be the last operation in this method. while reset() is
         # called when holding _fork_lock, other threads in this process
@@ -1403,37 +2190,238 @@ class ConnectionPool:
 
     async def get_connection(self, command_name, *keys, **options):
         """Get a connection from the pool"""
+        instrumentation = self.instrumentation
+        if instrumentation is not None:
+            start = time.perf_counter()
         self._checkpid()
-        async with self._lock:
-            try:
-                connection = self._available_connections.pop()
-            except IndexError:
-                connection = self.make_connection()
-            self._in_use_connections.add(connection)
+        if self.fast_path:
+            connection = self._checkout()
+        else:
+            async with self._lock:
+                connection = self._checkout()
+        if connection is None:
+            connection = await self._wait_for_connection()
+        if self.min_idle:
+            self._maybe_refill()
+        if self._reaper_task is None and (self.max_idle_time or self.max_lifetime):
+            self._reaper_task = asyncio.ensure_future(self._reaper())
 
         try:
-            # ensure this connection is connected to Redis
-            await connection.connect()
-            # connections that the pool provides should be ready to send
-            # a command. if not, the connection was either returned to the
-            # pool before all data has been read or the socket has been
-            # closed. either way, reconnect and verify everything is good.
-            try:
-                if await connection.can_read():
-                    raise ConnectionError("Connection has data") from None
-            except ConnectionError:
-                await connection.disconnect()
-                await connection.connect()
-                if await connection.can_read():
-                    raise ConnectionError("Connection not ready") from None
+            await self.prepare_connection(connection)
         except BaseException:
             # release the connection back to the pool so that we don't
             # leak it
             await self.release(connection)
             raise
 
+        if instrumentation is not None:
+            instrumentation.checkout(
+                time.perf_counter() - start,
+                self.max_connections - self._capacity(),
+                self._idle_count(),
+            )
         return connection
 
+    def _checkout(self) -> Optional[Connection]:
+        try:
+            connection = self._available_connections.pop()
+        except IndexError:
+            if self.wait and self._created_connections >= self.max_connections:
+                return None
+            connection = self.make_connection()
+        self._in_use_connections.add(connection)
+        return connection
+
+    async def _wait_for_connection(self) -> Connection:
+        waiter = asyncio.get_event_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            async with async_timeout.timeout(self.wait_timeout):
+                return await waiter
+        except BaseException as e:
+            if waiter.done() and not waiter.cancelled():
+                # a connection was handed over just as we gave up on it
+                await self.release(waiter.result())
+            else:
+                waiter.cancel()
+                try:
+                    self._waiters.remove(waiter)
+                except ValueError:
+                    pass
+            if isinstance(e, asyncio.TimeoutError):
+                raise ConnectionError("No connection available.") from None
+            raise
+
+    def _hand_off(self, connection: Optional[Connection] = None) -> bool:
+        """
+        Give ``connection``, or a new one when None, to the longest waiting
+        caller. Returns False if nobody is waiting.
+        """
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            if connection is None:
+                connection = self.make_connection()
+            self._in_use_connections.add(connection)
+            waiter.set_result(connection)
+            return True
+        return False
+
+    async def prepare_connection(self, connection: Connection):
+        """Make sure a connection taken from the pool can send a command"""
+        if self.fast_path:
+            if connection.is_dirty:
+                await connection.disconnect()
+            if not connection.is_connected:
+                await connection.connect()
+            return
+
+        # ensure this connection is connected to Redis
+        await connection.connect()
+        # connections that the pool provides should be ready to send
+        # a command. if not, the connection was either returned to the
+        # pool before all data has been read or the socket has been
+        # closed. either way, reconnect and verify everything is good.
+        try:
+            if await connection.can_read():
+                raise ConnectionError("Connection has data") from None
+        except ConnectionError:
+            await connection.disconnect()
+            await connection.connect()
+            if await connection.can_read():
+                raise ConnectionError("Connection not ready") from None
+
+    async def warm(self, count: Optional[int] = None) -> int:
+        """
+        Open connections concurrently until ``count`` of them, by default
+        the larger of ``prewarm`` and ``min_idle``, are idle in the pool.
+        Returns the number of connections opened.
+        """
+        self._checkpid()
+        self.warmed = True
+        if count is None:
+            count = max(self.prewarm, self.min_idle)
+        count = min(count - self._idle_count() - self._warming, self._capacity())
+        if count <= 0:
+            return 0
+        connections = self._reserve(count)
+        self._warming += count
+        try:
+            resp = await asyncio.gather(
+                *(self._warm_connection(connection) for connection in connections),
+                return_exceptions=True,
+            )
+        finally:
+            self._warming -= count
+        exc = next((r for r in resp if isinstance(r, BaseException)), None)
+        if exc:
+            raise exc
+        return count
+
+    async def _warm_connection(self, connection: Connection):
+        try:
+            await connection.connect()
+        except BaseException:
+            await connection.disconnect()
+            raise
+        finally:
+            await self.release(connection)
+
+    def _idle_count(self) -> int:
+        return len(self._available_connections)
+
+    def _capacity(self) -> int:
+        return self.max_connections - self._created_connections
+
+    def _reserve(self, count: int) -> List[Connection]:
+        connections = [self.make_connection() for _ in range(count)]
+        self._in_use_connections.update(connections)
+        return connections
+
+    def _maybe_refill(self):
+        if (
+            self._idle_count() + self._warming < self.min_idle
+            and self._capacity() > 0
+            and (self._refill_task is None or self._refill_task.done())
+        ):
+            self._refill_task = asyncio.ensure_future(self._refill())
+
+    async def _refill(self):
+        try:
+            # checkouts made while connecting may need another round
+            while await self.warm(self.min_idle):
+                pass
+        except Exception as e:
+            logger.warning("Error refilling the connection pool: %s", e)
+
+    async def reap(self) -> int:
+        """
+        Close the idle connections that outlived ``max_idle_time`` or
+        ``max_lifetime``. Returns the number of connections closed.
+        """
+        self._checkpid()
+        expired = self._take_expired(self._expired(self._idle_connections()))
+        if not expired:
+            return 0
+        await asyncio.gather(
+            *(connection.disconnect() for connection in expired),
+            return_exceptions=True,
+        )
+        if self.min_idle:
+            self._maybe_refill()
+        return len(expired)
+
+    def _expired(self, idle: List[Connection]) -> List[Connection]:
+        # ``idle`` is ordered from the least to the most recently used
+        now = time.monotonic()
+        expired = []
+        if self.max_idle_time is not None:
+            for connection in idle[: max(len(idle) - self.min_idle, 0)]:
+                if now - connection.last_active_at < self.max_idle_time:
+                    break
+                expired.append(connection)
+        if self.max_lifetime is not None:
+            # retire the oldest connection only, so they are replaced gradually
+            idle_expired = set(expired)
+            aged = [
+                connection
+                for connection in idle
+                if connection not in idle_expired
+                and now - connection.connected_at >= self.max_lifetime
+            ]
+            if aged:
+                expired.append(min(aged, key=lambda c: c.connected_at))
+        return expired
+
+    def _idle_connections(self) -> List[Connection]:
+        return self._available_connections
+
+    def _take_expired(self, expired: List[Connection]) -> List[Connection]:
+        for connection in expired:
+            self._available_connections.remove(connection)
+            self._created_connections -= 1
+        return expired
+
+    async def _stop_tasks(self):
+        tasks = [self._refill_task, self._reaper_task]
+        self._refill_task = self._reaper_task = None
+        for task in tasks:
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+
+    async def _reaper(self):
+        while True:
+            await asyncio.sleep(self.reap_interval)
+            try:
+                await self.reap()
+            except Exception as e:
+                logger.warning("Error closing idle connections: %s", e)
+
     def get_encoder(self):
         """Return an encoder based on encoding settings"""
         kwargs = self.connection_kwargs
@@ -1453,23 +2441,34 @@ class ConnectionPool:
     async def release(self, connection: Connection):
         """Releases the connection back to the pool"""
         self._checkpid()
-        async with self._lock:
-            try:
-                self._in_use_connections.remove(connection)
-            except KeyError:
-                # Gracefully fail when a connection is returned to this pool
-                # that the pool doesn't actually own
-                pass
+        if self.fast_path:
+            owned = self._checkin(connection)
+        else:
+            async with self._lock:
+                owned = self._checkin(connection)
+        if not owned:
+            await connection.disconnect()
+
+    def _checkin(self, connection: Connection) -> bool:
+        try:
+            self._in_use_connections.remove(connection)
+        except KeyError:
+            # Gracefully fail when a connection is returned to this pool
+            # that the pool doesn't actually own
+            pass
 
-            if self.owns_connection(connection):
+        if self.owns_connection(connection):
+            connection.last_active_at = time.monotonic()
+            if not self._waiters or not self._hand_off(connection):
                 self._available_connections.append(connection)
-            else:
-                # pool doesn't own this connection. do not add it back
-                # to the pool and decrement the count so that another
-                # connection can take its place if needed
-                self._created_connections -= 1
-                await connection.disconnect()
-                return
+            return True
+        # pool doesn't own this connection. do not add it back
+        # to the pool and decrement the count so that another
+        # connection can take its place if needed
+        self._created_connections -= 1
+        if self._waiters:
+            self._hand_off()
+        return False
 
     def owns_connection(self, connection: Connection):
         return connection.pid == self.pid
@@ -1483,6 +2482,7 @@ class ConnectionPool:
         connections that are idle in the pool.
         """
         self._checkpid()
+        await self._stop_tasks()
         async with self._lock:
             if inuse_connections:
                 connections: Iterable[Connection] = chain(
@@ -1593,6 +2593,9 @@ class BlockingConnectionPool(ConnectionPool):
         create new connections when we need to, i.e.: the actual number of
         connections will only increase in response to demand.
         """
+        instrumentation = self.instrumentation
+        if instrumentation is not None:
+            start = time.perf_counter()
         # Make sure we haven't changed process.
         self._checkpid()
 
@@ -1611,29 +2614,69 @@ class BlockingConnectionPool(ConnectionPool):
         # a new connection to add to the pool.
         if connection is None:
             connection = self.make_connection()
+        if self.min_idle:
+            self._maybe_refill()
+        if self._reaper_task is None and (self.max_idle_time or self.max_lifetime):
+            self._reaper_task = asyncio.ensure_future(self._reaper())
 
         try:
-            # ensure this connection is connected to Redis
-            await connection.connect()
-            # connections that the pool provides should be ready to send
-            # a command. if not, the connection was either returned to the
-            # pool before all data has been read or the socket has been
-            # closed. either way, reconnect and verify everything is good.
-            try:
-                if await connection.can_read():
-                    raise ConnectionError("Connection has data") from None
-            except ConnectionError:
-                await connection.disconnect()
-                await connection.connect()
-                if await connection.can_read():
-                    raise ConnectionError("Connection not ready") from None
+            await self.prepare_connection(connection)
         except BaseException:
             # release the connection back to the pool so that we don't leak it
             await self.release(connection)
             raise
 
+        if instrumentation is not None:
+            instrumentation.checkout(
+                time.perf_counter() - start,
+                self.max_connections - self._capacity(),
+                self._idle_count(),
+            )
         return connection
 
+    def _idle_count(self) -> int:
+        # the queue holds idle connections plus a ``None`` placeholder for
+        # each connection that has not been made yet
+        placeholders = self.max_connections - len(self._connections)
+        return max(self.pool.qsize() - placeholders, 0)
+
+    def _capacity(self) -> int:
+        return self.max_connections - len(self._connections)
+
+    def _reserve(self, count: int) -> List[Connection]:
+        # take ``count`` placeholders out of the queue
+        placeholders, idle = self._drain()
+        self._restore(placeholders - count, idle)
+        return [self.make_connection() for _ in range(count)]
+
+    def _idle_connections(self) -> List[Connection]:
+        placeholders, idle = self._drain()
+        self._restore(placeholders, idle)
+        return idle
+
+    def _take_expired(self, expired: List[Connection]) -> List[Connection]:
+        placeholders, idle = self._drain()
+        for connection in expired:
+            idle.remove(connection)
+            self._connections.remove(connection)
+        self._restore(placeholders + len(expired), idle)
+        return expired
+
+    def _drain(self) -> Tuple[int, List[Connection]]:
+        items = []
+        while not self.pool.empty():
+            items.append(self.pool.get_nowait())
+        idle = [connection for connection in items if connection is not None]
+        idle.sort(key=lambda connection: connection.last_active_at)
+        return len(items) - len(idle), idle
+
+    def _restore(self, placeholders: int, idle: List[Connection]):
+        # put the most recently used connections on top of a LIFO queue
+        for _ in range(placeholders):
+            self.pool.put_nowait(None)
+        for connection in idle:
+            self.pool.put_nowait(connection)
+
     async def release(self, connection: Connection):
         """Releases the connection back to the pool."""
         # Make sure we haven't changed process.
@@ -1648,6 +2691,7 @@ class BlockingConnectionPool(ConnectionPool):
             return
 
         # Put the connection back into the pool.
+        connection.last_active_at = time.monotonic()
         try:
             self.pool.put_nowait(connection)
         except asyncio.QueueFull:
@@ -1658,6 +2702,7 @@ class BlockingConnectionPool(ConnectionPool):
     async def disconnect(self, inuse_connections: bool = True):
         """Disconnects all connections in the pool."""
         self._checkpid()
+        await self._stop_tasks()
         async with self._lock:
             resp = await asyncio.gather(
                 *(connection.disconnect() for connection in self._connections),
@@ -90,3 +90,53 @@ class AuthenticationWrongNumberOfArgsError(ResponseError):
     """
 
     pass
+
+
+class ClusterError(RedisError):
+    """Error routing a command to the nodes of a Redis Cluster"""
+
+    pass
+
+
+class ClusterDownError(ClusterError, ResponseError):
+    """The cluster cannot serve the command, e.g. during a failover"""
+
+    pass
+
+
+class ClusterCrossSlotError(ResponseError):
+    """The keys of a command do not hash to the same slot"""
+
+    pass
+
+
+class TryAgainError(ResponseError):
+    """The keys of a command are being migrated between nodes"""
+
+    pass
+
+
+class AskError(ResponseError):
+    """
+    The slot of a key is being migrated and the command must be retried, once,
+    at ``host``:``port`` after sending ASKING. ``host`` is empty when it is
+    the address the command was sent to.
+    """
+
+    def __init__(self, resp):
+        super().__init__(resp)
+        try:
+            slot_id, node_addr = resp.split(" ")
+            host, port = node_addr.rsplit(":", 1)
+            self.slot_id = int(slot_id)
+            self.port = int(port)
+        except ValueError:
+            raise ValueError(f"Invalid redirection: {resp!r}") from None
+        self.node_addr = node_addr
+        self.host = host
+
+
+class MovedError(AskError):
+    """The slot of a key is now served by ``host``:``port``"""
+
+    pass
@@ -0,0 +1,106 @@
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, List, Optional, TypeVar
+
+_T = TypeVar("_T")
+
+
+class HedgePolicy:
+    """
+    Decides when a read is also sent to a second replica, to cut the tail
+    latency caused by a stalled replica
+
+    A read that gets no reply within ``delay`` seconds is sent again to
+    another replica, and the first successful reply of the two is used; the
+    other request is cancelled. ``delay`` is the ``percentile`` of the
+    latencies of the last ``window`` reads, but no less than ``min_delay``,
+    and ``initial_delay`` until ``min_samples`` reads were measured.
+
+    ``hedges`` counts the duplicate requests sent and ``hedges_won`` those
+    whose reply was used.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        initial_delay: float = 0.05,
+        min_delay: float = 0.001,
+        window: int = 1000,
+        min_samples: int = 20,
+    ):
+        self.percentile = percentile
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self.hedges = 0
+        self.hedges_won = 0
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._delay: Optional[float] = None
+        # the percentile is recomputed after a tenth of the window changed
+        self._refresh_every = max(window // 10, 1)
+        self._new_samples = 0
+
+    @property
+    def delay(self) -> float:
+        if len(self._samples) < self.min_samples:
+            return self.initial_delay
+        if self._delay is None:
+            samples = sorted(self._samples)
+            index = math.ceil(self.percentile / 100 * len(samples)) - 1
+            self._delay = samples[min(max(index, 0), len(samples) - 1)]
+        return max(self._delay, self.min_delay)
+
+    def observe(self, latency: float):
+        """Record the latency of a read"""
+        self._samples.append(latency)
+        self._new_samples += 1
+        if self._new_samples >= self._refresh_every:
+            self._new_samples = 0
+            self._delay = None
+
+    async def race(
+        self, first: Callable[[], Awaitable[_T]], second: Callable[[], Awaitable[_T]]
+    ) -> _T:
+        """
+        Return the reply of ``first``, or of ``second`` if ``first`` takes
+        longer than ``delay`` and ``second`` succeeds before it. If both
+        fail, the error of ``first`` is raised.
+        """
+        start = time.perf_counter()
+        tasks: List["asyncio.Future[_T]"] = [asyncio.ensure_future(first())]
+        try:
+            _, pending = await asyncio.wait(tasks, timeout=self.delay)
+            if not pending:
+                response = tasks[0].result()
+            else:
+                self.hedges += 1
+                tasks.append(asyncio.ensure_future(second()))
+                response = await self._first_success(tasks)
+            self.observe(time.perf_counter() - start)
+            return response
+        finally:
+            unfinished = [task for task in tasks if not task.done()]
+            for task in unfinished:
+                task.cancel()
+            if unfinished:
+                # let the request that lost give its connection back
+                await asyncio.wait(unfinished)
+            for task in tasks:
+                if not task.cancelled():
+                    # retrieve the error of the request that lost
+                    task.exception()
+
+    async def _first_success(self, tasks: List["asyncio.Future[_T]"]) -> _T:
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in tasks:
+                if task in done and task.exception() is None:
+                    if task is tasks[1]:
+                        self.hedges_won += 1
+                    return task.result()
+        return tasks[0].result()
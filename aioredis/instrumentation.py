@@ -0,0 +1,223 @@
+import time
+from bisect import bisect_left
+from typing import Any, Awaitable, Dict, List, Optional, Tuple, TypeVar
+
+_T = TypeVar("_T")
+
+#: Upper bounds, in seconds, of the :class:`Histogram` buckets: powers of two
+#: from about 1µs to about 64s. Larger values go to a final overflow bucket.
+BUCKET_BOUNDS: List[float] = [2.0**exponent for exponent in range(-20, 7)]
+
+
+class Instrumentation:
+    """
+    Receives timings and counts from connection pools and connections.
+
+    Pass an instance as ``instrumentation=`` to
+    :py:class:`~aioredis.client.Redis`, a connection pool or a connection.
+    Every hook is a no-op here, so subclasses override only the ones they
+    need. The hooks are called inline on the event loop, so they must be
+    quick and must not raise. Without an instrumentation nothing is timed
+    at all.
+
+    Durations are in seconds, as measured by :func:`time.perf_counter`.
+    """
+
+    def checkout(self, wait: float, created: int, idle: int) -> None:
+        """
+        A connection was taken from a pool, ready for use, ``wait`` seconds
+        after it was asked for. The pool then held ``created`` connections,
+        ``idle`` of them idle.
+        """
+
+    def connect(self, duration: float, handshake: float, reconnect: bool) -> None:
+        """
+        A connection was established in ``duration`` seconds, ``handshake``
+        of which were spent authenticating and selecting the database.
+        ``reconnect`` is set when the connection had been connected before.
+        """
+
+    def write(self, duration: float, size: int) -> None:
+        """``size`` bytes of commands were written in ``duration`` seconds"""
+
+    def read(self, duration: float) -> None:
+        """A reply was read ``duration`` seconds after it was waited for"""
+
+    def received(self, size: int) -> None:
+        """``size`` bytes were received from the server"""
+
+    def before_command(self, name: Any, args: Tuple[Any, ...]) -> None:
+        """
+        A client is about to run the command ``args``, named ``name``.
+
+        For a pipeline, this is called once per batch: ``name`` is
+        ``"PIPELINE"`` and ``args`` holds the arguments of every command in
+        it. For pubsub commands, only sending the command is covered, as
+        their replies arrive as messages.
+
+        Both command hooks are called from the task that runs the command,
+        so a context variable set here, such as the current tracing span,
+        is still set in :meth:`after_command`.
+        """
+
+    def after_command(
+        self,
+        name: Any,
+        duration: float,
+        error: Optional[BaseException],
+        reply_size: int,
+    ) -> None:
+        """
+        The command announced by :meth:`before_command` finished after
+        ``duration`` seconds, raising ``error`` if it failed. ``reply_size``
+        is the number of items in the reply: the length of an array, set or
+        map, 0 for no reply and 1 otherwise. For a pipeline, it is the
+        number of replies.
+        """
+
+
+def _reply_size(response: Any) -> int:
+    if response is None:
+        return 0
+    if isinstance(response, (list, tuple, set, dict)):
+        return len(response)
+    return 1
+
+
+async def traced(
+    instrumentation: Instrumentation,
+    name: Any,
+    args: Tuple[Any, ...],
+    command: Awaitable[_T],
+) -> _T:
+    """Await ``command`` between calls to the instrumentation's command hooks"""
+    instrumentation.before_command(name, args)
+    start = time.perf_counter()
+    error: Optional[BaseException] = None
+    response: Any = None
+    try:
+        response = await command
+        return response
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        instrumentation.after_command(
+            name, time.perf_counter() - start, error, _reply_size(response)
+        )
+
+
+class Histogram:
+    """Counts observed durations in the buckets of :data:`BUCKET_BOUNDS`"""
+
+    __slots__ = "buckets", "count", "total", "max"
+
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__name__}<count={self.count},"
+            f"p50={self.percentile(50)},p99={self.percentile(99)}>"
+        )
+
+    def observe(self, value: float):
+        self.buckets[bisect_left(BUCKET_BOUNDS, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, percent: float) -> float:
+        """
+        Return an upper bound of the given percentile of the observed
+        values, accurate to within a factor of two
+        """
+        rank = self.count * percent / 100
+        seen = 0
+        for bound, count in zip(BUCKET_BOUNDS, self.buckets):
+            seen += count
+            if count and seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+
+class Metrics(Instrumentation):
+    """
+    An :class:`Instrumentation` that aggregates everything it receives into
+    counters and :class:`Histogram` instances.
+
+    ``created``, ``idle`` and ``in_use`` are the pool's connection counts as
+    of the latest checkout.
+    """
+
+    def __init__(self):
+        self.checkout_wait = Histogram()
+        self.connect_time = Histogram()
+        self.handshake_time = Histogram()
+        self.write_time = Histogram()
+        self.read_time = Histogram()
+        self.connects = 0
+        self.reconnects = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.created = 0
+        self.idle = 0
+        self.in_use = 0
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__name__}<connects={self.connects},"
+            f"reconnects={self.reconnects},writes={self.write_time.count},"
+            f"reads={self.read_time.count}>"
+        )
+
+    def checkout(self, wait: float, created: int, idle: int) -> None:
+        self.checkout_wait.observe(wait)
+        self.created = created
+        self.idle = idle
+        self.in_use = created - idle
+
+    def connect(self, duration: float, handshake: float, reconnect: bool) -> None:
+        self.connect_time.observe(duration)
+        self.handshake_time.observe(handshake)
+        self.connects += 1
+        if reconnect:
+            self.reconnects += 1
+
+    def write(self, duration: float, size: int) -> None:
+        self.write_time.observe(duration)
+        self.bytes_sent += size
+
+    def read(self, duration: float) -> None:
+        self.read_time.observe(duration)
+
+    def received(self, size: int) -> None:
+        self.bytes_received += size
+
+    def snapshot(self) -> Dict[str, float]:
+        """Return the counters and the main percentiles as a flat dict"""
+        snapshot: Dict[str, float] = {
+            "connects": self.connects,
+            "reconnects": self.reconnects,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "created": self.created,
+            "idle": self.idle,
+            "in_use": self.in_use,
+        }
+        for name in (
+            "checkout_wait",
+            "connect_time",
+            "handshake_time",
+            "write_time",
+            "read_time",
+        ):
+            histogram: Histogram = getattr(self, name)
+            snapshot[f"{name}_count"] = histogram.count
+            snapshot[f"{name}_p50"] = histogram.percentile(50)
+            snapshot[f"{name}_p99"] = histogram.percentile(99)
+        return snapshot
@@ -0,0 +1,88 @@
+from typing import Any, Dict, Iterable, Optional, Sequence, Set, Tuple
+
+from aioredis.client import Redis
+from aioredis.connection import EncodableT
+from aioredis.exceptions import ResponseError
+from aioredis.utils import str_if_bytes
+
+#: Commands whose number of keys is given by their second argument
+NUMKEYS_COMMANDS = frozenset(
+    ("EVAL", "EVALSHA", "EVAL_RO", "EVALSHA_RO", "FCALL", "FCALL_RO")
+)
+
+# (first key, last key, step) as reported by COMMAND, or None for commands
+# whose keys can only be found by asking the server with COMMAND GETKEYS
+KeySpecT = Optional[Tuple[int, int, int]]
+
+
+class CommandKeys:
+    """
+    Locates the keys in the arguments of commands, with the key positions
+    reported by ``COMMAND``. The keys of commands that have no fixed
+    positions for them are looked up with ``COMMAND GETKEYS``.
+
+    The commands flagged as read-only by ``COMMAND`` are also recorded.
+    """
+
+    def __init__(self):
+        self.specs: Dict[str, KeySpecT] = {}
+        self.readonly: Set[str] = set()
+        self._container_commands: Set[str] = set()
+
+    @property
+    def loaded(self) -> bool:
+        return bool(self.specs)
+
+    async def load(self, client: Redis):
+        """Load the key positions of the commands known by ``client``"""
+        self.register(await client.execute_command("COMMAND"))
+
+    def register(self, reply: Iterable[Sequence[Any]]):
+        """Add the key positions of the entries of a ``COMMAND`` reply"""
+        for entry in reply:
+            name = str_if_bytes(entry[0]).upper()
+            flags = {str_if_bytes(flag) for flag in entry[2]}
+            first, last, step = entry[3:6]
+            self.specs[name] = None if "movablekeys" in flags else (first, last, step)
+            if "readonly" in flags:
+                self.readonly.add(name)
+            # Redis >= 7.0 describes the subcommands of container commands,
+            # such as "OBJECT|ENCODING", separately
+            if len(entry) > 9 and entry[9]:
+                self._container_commands.add(name)
+                self.register(entry[9])
+
+    def _parse(self, args: Sequence[EncodableT]) -> Tuple[str, Tuple[Any, ...]]:
+        # the name a command is registered under, and its separate arguments
+        words = str(str_if_bytes(args[0])).split()
+        argv = (*words, *args[1:])
+        name = words[0].upper()
+        if name in self._container_commands and len(argv) > 1:
+            name = f"{name}|{str(str_if_bytes(argv[1])).upper()}"
+        return name, argv
+
+    def is_readonly(self, *args: EncodableT) -> bool:
+        """Whether the command ``args`` only reads data"""
+        return self._parse(args)[0] in self.readonly
+
+    async def get_keys(self, client: Redis, *args: EncodableT) -> Sequence[EncodableT]:
+        """
+        Return the keys that the command ``args`` reads or writes, asking
+        ``client`` for those without fixed positions
+        """
+        name, argv = self._parse(args)
+        if name in NUMKEYS_COMMANDS:
+            return argv[3 : 3 + int(argv[2])]
+        # unknown commands are sent anywhere and rejected by the server
+        spec = self.specs.get(name, (0, 0, 0))
+        if spec is None:
+            try:
+                return await client.execute_command("COMMAND GETKEYS", *argv)
+            except ResponseError:
+                return ()
+        first, last, step = spec
+        if not first:
+            return ()
+        if last < 0:
+            last += len(argv)
+        return argv[first : last + 1 : step]
@@ -0,0 +1,174 @@
+import asyncio
+import time
+from functools import partial
+from typing import Iterable, List, Optional, TypeVar, Union
+
+from aioredis.client import Redis
+from aioredis.exceptions import ConnectionError, TimeoutError
+from aioredis.hedging import HedgePolicy
+from aioredis.keys import CommandKeys
+
+_ReadWriteRedisT = TypeVar("_ReadWriteRedisT", bound="ReadWriteRedis")
+
+
+class ReadWriteRedis(Redis):  # lgtm [py/missing-call-to-init]
+    """
+    A client sending read-only commands to replicas and the others to their
+    master
+
+    >>> from aioredis.readwrite import ReadWriteRedis
+    >>> redis = ReadWriteRedis.from_urls(
+    ...     "redis://primary:6379/0",
+    ...     ["redis://replica1:6379/0", "redis://replica2:6379/0"],
+    ... )
+    >>> await redis.set("foo", "bar")
+    >>> await redis.get("foo")
+    b'bar'
+
+    ``master`` and ``replicas`` are the clients of the servers, each with its
+    own connection pool. :meth:`aioredis.sentinel.Sentinel.read_write_for`
+    creates one for a service monitored by Sentinel.
+
+    Commands flagged as read-only by ``COMMAND``, which is fetched once, are
+    sent to the replicas round-robin. If a replica cannot be reached, the
+    next one is tried, and then the master. All other commands go to the
+    master.
+
+    Replicas are updated asynchronously, so reads may not see the writes
+    that were just made. With ``read_your_writes``, reads go to the master
+    for that many seconds after a write. ``master`` also remains available
+    for reads that must see the latest writes.
+
+    With ``hedge``, a :class:`~aioredis.hedging.HedgePolicy`, a read that a
+    replica is slow to answer is also sent to the next replica.
+
+    ``connection_pool`` is the pool of the master, so that pipelines,
+    transactions and pubsub go to it.
+    """
+
+    def __init__(
+        self,
+        master: Redis,
+        replicas: Union[Redis, Iterable[Redis]] = (),
+        read_your_writes: Optional[float] = None,
+        hedge: Optional[HedgePolicy] = None,
+    ):
+        self.master = master
+        self.replicas: List[Redis] = (
+            [replicas] if isinstance(replicas, Redis) else list(replicas)
+        )
+        self.read_your_writes = read_your_writes
+        self.hedge = hedge
+        self.command_keys = CommandKeys()
+        self._replica_counter = 0
+        self._written_at = float("-inf")
+
+        self.connection_pool = master.connection_pool
+        self.encoder = self.connection_pool.get_encoder()
+        self.instrumentation = self.connection_pool.instrumentation
+        self.response_callbacks = master.response_callbacks
+        self.connection = None
+        self.single_connection_client = False
+        self.auto_close_connection_pool = True
+        self.client_cache = None
+        self.auto_pipeline = None
+
+    @classmethod
+    def from_urls(
+        cls,
+        master_url: str,
+        replica_urls: Iterable[str] = (),
+        read_your_writes: Optional[float] = None,
+        hedge: Optional[HedgePolicy] = None,
+        **kwargs,
+    ):
+        """
+        Return a client over the master and replicas given by the URLs. See
+        :meth:`aioredis.Redis.from_url` for the URL format and ``kwargs``.
+        """
+        return cls(
+            Redis.from_url(master_url, **kwargs),
+            [Redis.from_url(url, **kwargs) for url in replica_urls],
+            read_your_writes,
+            hedge,
+        )
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__name__}<master={self.master!r},"
+            f"replicas=[{','.join(map(repr, self.replicas))}]>"
+        )
+
+    async def initialize(self: _ReadWriteRedisT) -> _ReadWriteRedisT:
+        if not self.command_keys.loaded:
+            error: Optional[Exception] = None
+            for client in (self.master, *self.replicas):
+                try:
+                    await self.command_keys.load(client)
+                    break
+                except (ConnectionError, TimeoutError) as e:
+                    error = e
+            else:
+                raise error  # type: ignore[misc]
+        return self
+
+    async def execute_command(self, *args, **options):
+        """
+        Execute a command on a replica if it is read-only, or else on the
+        master, and return its response
+        """
+        await self.initialize()
+        if not self.command_keys.is_readonly(*args):
+            try:
+                return await self.master.execute_command(*args, **options)
+            finally:
+                self._written_at = time.monotonic()
+        if (
+            self.read_your_writes is not None
+            and time.monotonic() - self._written_at < self.read_your_writes
+        ):
+            return await self.master.execute_command(*args, **options)
+        return await self.read(*args, **options)
+
+    async def read(self, *args, **options):
+        """
+        Execute a read-only command on a replica, falling back on the master
+        if none can be reached
+        """
+        replicas = self._rotate_replicas()
+        if self.hedge is not None and len(replicas) > 1:
+            attempted: List[Redis] = []
+
+            async def attempt(replica: Redis):
+                attempted.append(replica)
+                return await replica.execute_command(*args, **options)
+
+            try:
+                return await self.hedge.race(
+                    partial(attempt, replicas[0]), partial(attempt, replicas[1])
+                )
+            except (ConnectionError, TimeoutError):
+                # the second replica was only tried if the read was hedged
+                replicas = [r for r in replicas if r not in attempted]
+        for replica in replicas:
+            try:
+                return await replica.execute_command(*args, **options)
+            except (ConnectionError, TimeoutError):
+                continue
+        return await self.master.execute_command(*args, **options)
+
+    def _rotate_replicas(self) -> List[Redis]:
+        if not self.replicas:
+            return []
+        self._replica_counter = (self._replica_counter + 1) % len(self.replicas)
+        start = self._replica_counter
+        return [*self.replicas[start:], *self.replicas[:start]]
+
+    async def close(self, close_connection_pool: Optional[bool] = None) -> None:
+        """Close the clients of the master and the replicas"""
+        await asyncio.gather(
+            *(
+                client.close(close_connection_pool=close_connection_pool)
+                for client in (self.master, *self.replicas)
+            )
+        )
@@ -1,6 +1,23 @@
+import asyncio
 import random
+import time
 import weakref
-from typing import AsyncIterator, Iterable, Mapping, Sequence, Tuple, Type
+from functools import partial
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+)
 
 from aioredis.client import Redis
 from aioredis.connection import Connection, ConnectionPool, EncodableT, SSLConnection
@@ -10,8 +27,18 @@ from aioredis.exceptions import (
     ResponseError,
     TimeoutError,
 )
+from aioredis.hedging import HedgePolicy
+from aioredis.keys import CommandKeys
+from aioredis.log import logger
+from aioredis.readwrite import ReadWriteRedis
 from aioredis.utils import str_if_bytes
 
+_T = TypeVar("_T")
+AddressT = Tuple[EncodableT, EncodableT]
+
+#: Sentinel events that change the topology cached by :class:`Sentinel`
+SENTINEL_EVENTS = ("+switch-master", "+sdown", "-sdown", "+odown", "-odown", "+slave")
+
 
 class MasterNotFoundError(ConnectionError):
     pass
@@ -21,9 +48,94 @@ class SlaveNotFoundError(ConnectionError):
     pass
 
 
+class SlaveSelector:
+    """
+    Chooses the order in which a :class:`SentinelConnectionPool` tries to
+    connect to the slaves of its service, from the round trip times of the
+    PINGs sent to them and their connection failures.
+
+    This one goes round-robin, from a random slave.
+    """
+
+    #: Whether new connections to slaves send a PING to measure their latency
+    measures_latency = False
+
+    def __init__(self):
+        self.counter: Optional[int] = None
+
+    def order(self, slaves: Sequence[AddressT]) -> List[AddressT]:
+        """Return ``slaves`` in the order to try them"""
+        if not slaves:
+            return []
+        if self.counter is None:
+            self.counter = random.randint(0, len(slaves) - 1)
+        self.counter = (self.counter + 1) % len(slaves)
+        return [*slaves[self.counter :], *slaves[: self.counter]]
+
+    def observe(self, address: AddressT, latency: float):
+        """Record the round trip time of a PING sent to ``address``"""
+
+    def failed(self, address: AddressT):
+        """Record a failure to connect to ``address``"""
+
+    def reset(self):
+        self.counter = None
+
+
+class LatencySlaveSelector(SlaveSelector):
+    """
+    Prefers the healthy slave with the lowest latency, tracked as an
+    exponentially weighted moving average of the round trip times of the
+    PINGs sent to it, in which each new measurement has the weight
+    ``smoothing``. A PING is sent on every new connection, and health checks
+    (see ``health_check_interval``) add more measurements. Other commands
+    are not measured, since the time blocking commands or scripts take
+    on the server would skew the average.
+
+    Slaves that have not been measured yet are tried first. Slaves that
+    failed to connect are tried last for ``failure_backoff`` seconds.
+    """
+
+    measures_latency = True
+
+    def __init__(self, smoothing: float = 0.2, failure_backoff: float = 5.0):
+        super().__init__()
+        self.smoothing = smoothing
+        self.failure_backoff = failure_backoff
+        self.latencies: Dict[AddressT, float] = {}
+        self.failed_until: Dict[AddressT, float] = {}
+
+    def order(self, slaves: Sequence[AddressT]) -> List[AddressT]:
+        now = time.monotonic()
+        return sorted(
+            slaves,
+            key=lambda address: (
+                self.failed_until.get(address, 0.0) > now,
+                self.latencies.get(address, 0.0),
+            ),
+        )
+
+    def observe(self, address: AddressT, latency: float):
+        average = self.latencies.get(address)
+        if average is not None:
+            latency = self.smoothing * latency + (1 - self.smoothing) * average
+        self.latencies[address] = latency
+        self.failed_until.pop(address, None)
+
+    def failed(self, address: AddressT):
+        self.failed_until[address] = time.monotonic() + self.failure_backoff
+
+    def reset(self):
+        super().reset()
+        self.latencies.clear()
+        self.failed_until.clear()
+
+
 class SentinelManagedConnection(SSLConnection):
     def __init__(self, **kwargs):
         self.connection_pool = kwargs.pop("connection_pool")
+        # when an unanswered PING was sent to a slave
+        self._sent_at: Optional[float] = None
         if not kwargs.pop("ssl", False):
             # use constructor from Connection class
             super(SSLConnection, self).__init__(**kwargs)
@@ -42,13 +154,16 @@ class SentinelManagedConnection(SSLConnection):
     async def connect_to(self, address):
         self.host, self.port = address
         await super().connect()
-        if self.connection_pool.check_connection:
+        pool = self.connection_pool
+        if pool.check_connection or (
+            not pool.is_master and pool.slave_selector.measures_latency
+        ):
             await self.send_command("PING")
             if str_if_bytes(await self.read_response()) != "PONG":
                 raise ConnectionError("PING failed")
 
     async def connect(self):
-        if self._reader:
+        if self.is_connected:
             return  # already connected
         if self.connection_pool.is_master:
             await self.connect_to(await self.connection_pool.get_master_address())
@@ -57,12 +172,28 @@ class SentinelManagedConnection(SSLConnection):
                 try:
                     return await self.connect_to(slave)
                 except ConnectionError:
+                    self.connection_pool.slave_selector.failed(slave)
                     continue
             raise SlaveNotFoundError  # Never be here
 
+    async def send_command(self, *args, **kwargs):
+        if (
+            self.connection_pool.is_master
+            or self.pending_replies
+            or str_if_bytes(args[0]).upper() != "PING"
+        ):
+            return await super().send_command(*args, **kwargs)
+        if not self.is_connected:
+            await self.connect()
+        if kwargs.get("check_health", True):
+            await self.check_health()
+        self._sent_at = time.perf_counter()
+        await super().send_command(*args, check_health=False)
+
     async def read_response(self):
+        sent_at, self._sent_at = self._sent_at, None
         try:
-            return await super().read_response()
+            response = await super().read_response()
         except ReadOnlyError:
             if self.connection_pool.is_master:
                 # When talking to a master, a ReadOnlyError when likely
@@ -73,6 +204,11 @@ class SentinelManagedConnection(SSLConnection):
                 await self.disconnect()
                 raise ConnectionError("The previous master is now a slave")
             raise
+        if sent_at is not None:
+            self.connection_pool.slave_selector.observe(
+                (self.host, self.port), time.perf_counter() - sent_at
+            )
+        return response
 
 
 class SentinelConnectionPool(ConnectionPool):
@@ -81,6 +217,9 @@ class SentinelConnectionPool(ConnectionPool):
 
     If ``check_connection`` flag is set to True, SentinelManagedConnection
     sends a PING command right after establishing the connection.
+
+    ``slave_selector`` is the :class:`SlaveSelector` choosing which slave
+    connections go to. By default slaves are used round-robin.
     """
 
     def __init__(self, service_name, sentinel_manager, **kwargs):
@@ -89,12 +228,14 @@ class SentinelConnectionPool(ConnectionPool):
         )
         self.is_master = kwargs.pop("is_master", True)
         self.check_connection = kwargs.pop("check_connection", False)
+        self.slave_selector: SlaveSelector = (
+            kwargs.pop("slave_selector", None) or SlaveSelector()
+        )
         super().__init__(**kwargs)
         self.connection_kwargs["connection_pool"] = weakref.proxy(self)
         self.service_name = service_name
         self.sentinel_manager = sentinel_manager
         self.master_address = None
-        self.slave_rr_counter = None
 
     def __repr__(self):
         return (
@@ -105,7 +246,7 @@ class SentinelConnectionPool(ConnectionPool):
     def reset(self):
         super().reset()
         self.master_address = None
-        self.slave_rr_counter = None
+        self.slave_selector.reset()
 
     def owns_connection(self, connection: Connection):
         check = not self.is_master or (
@@ -123,16 +264,37 @@ class SentinelConnectionPool(ConnectionPool):
                 await self.disconnect(inuse_connections=False)
         return master_address
 
+    async def get_connection_avoiding(
+        self, address: Optional[AddressT], command_name, *keys, **options
+    ) -> Connection:
+        """
+        Get a connection to another slave than the one at ``address``, if
+        given, from those yielded by :meth:`rotate_slaves`. Raises
+        SlaveNotFoundError if there is none.
+        """
+        connection = await self.get_connection(command_name, *keys, **options)
+        if address is None or (connection.host, connection.port) != tuple(address):
+            return connection
+        try:
+            await connection.disconnect()
+            async for slave in self.rotate_slaves():
+                if tuple(slave) == tuple(address):
+                    continue
+                try:
+                    await connection.connect_to(slave)
+                    return connection
+                except ConnectionError:
+                    self.slave_selector.failed(slave)
+            raise SlaveNotFoundError  # Never be here
+        except BaseException:
+            await self.release(connection)
+            raise
+
     async def rotate_slaves(self) -> AsyncIterator:
-        """Round-robin slave balancer"""
+        """Yield the slaves in the order chosen by ``slave_selector``"""
         slaves = await self.sentinel_manager.discover_slaves(self.service_name)
-        if slaves:
-            if self.slave_rr_counter is None:
-                self.slave_rr_counter = random.randint(0, len(slaves) - 1)
-            for _ in range(len(slaves)):
-                self.slave_rr_counter = (self.slave_rr_counter + 1) % len(slaves)
-                slave = slaves[self.slave_rr_counter]
-                yield slave
+        for slave in self.slave_selector.order(slaves):
+            yield slave
         # Fallback to the master connection
         try:
             yield await self.get_master_address()
@@ -141,6 +303,70 @@ class SentinelConnectionPool(ConnectionPool):
         raise SlaveNotFoundError(f"No slave found for {self.service_name!r}")
 
 
+class HedgedSlaveRedis(Redis):
+    """
+    A client of the slaves of a :class:`SentinelConnectionPool` that hedges
+    read-only commands: when a slave is slow to reply, the command is also
+    sent to another slave, when ``hedge``, a
+    :class:`~aioredis.hedging.HedgePolicy`, says so, and the first reply is
+    used. Commands are known to be read-only from the flags reported by
+    ``COMMAND``.
+    """
+
+    def __init__(self, *, hedge: HedgePolicy, **kwargs):
+        super().__init__(**kwargs)
+        self.hedge = hedge
+        self.command_keys = CommandKeys()
+
+    async def _execute_command(self, *args, **options):
+        pool = self.connection_pool
+        if (
+            self.connection is not None
+            or self.auto_pipeline is not None
+            or not isinstance(pool, SentinelConnectionPool)
+        ):
+            return await super()._execute_command(*args, **options)
+        if not self.command_keys.loaded:
+            self.command_keys.register(await super()._execute_command("COMMAND"))
+        if not self.command_keys.is_readonly(*args):
+            return await super()._execute_command(*args, **options)
+
+        sentinel_pool: SentinelConnectionPool = pool
+        command_name = args[0]
+        first_address: Optional[AddressT] = None
+        first_connected = asyncio.Event()
+
+        async def first():
+            nonlocal first_address
+            try:
+                connection = await sentinel_pool.get_connection(command_name)
+                first_address = connection.host, connection.port
+            finally:
+                first_connected.set()
+            return await self._execute_on(connection, *args, **options)
+
+        async def second():
+            # the slave to avoid is only known once the first request has a
+            # connection, which may still be connecting when the hedge starts
+            await first_connected.wait()
+            connection = await sentinel_pool.get_connection_avoiding(
+                first_address, command_name
+            )
+            return await self._execute_on(connection, *args, **options)
+
+        return await self.hedge.race(first, second)
+
+    async def _execute_on(self, connection: Connection, *args, **options):
+        try:
+            await connection.send_command(*args)
+            return await self.parse_response(connection, args[0], **options)
+        except (ConnectionError, TimeoutError):
+            await connection.disconnect()
+            raise
+        finally:
+            await self.connection_pool.release(connection)
+
+
 class Sentinel:
     """
     Redis Sentinel cluster client
@@ -160,6 +386,25 @@ class Sentinel:
     When querying a sentinel, if it doesn't meet this threshold, responses
     from that sentinel won't be considered valid.
 
+    ``min_agreeing_sentinels`` is the number of sentinels that must report
+    the same master address before it is used. All sentinels are queried
+    concurrently, so the default of 1 takes the first valid answer.
+
+    ``max_slave_lag`` drops the slaves whose link to their master has been
+    down for more than that many seconds, and ``max_slave_offset_lag`` those
+    whose replication offset trails the most advanced slave by more than that
+    many bytes.
+
+    If ``topology_ttl`` is set, the addresses of masters and slaves are
+    cached for that many seconds, and concurrent lookups share a single
+    query. With ``watch_topology``, the cache is also kept up to date by a
+    subscription to the events of a sentinel in ``SENTINEL_EVENTS``, started
+    by the first lookup: a ``+switch-master`` event updates the master
+    address and disconnects the idle connections of the pools created by
+    :meth:`master_for` right away, and the other events drop the cached
+    addresses of their service. The subscription runs in a background task
+    until :meth:`close` is called.
+
     ``sentinel_kwargs`` is a dictionary of connection arguments used when
     connecting to sentinel instances. Any argument that can be passed to
     a normal Redis connection can be specified here. If ``sentinel_kwargs`` is
@@ -175,6 +420,11 @@ class Sentinel:
         sentinels,
         min_other_sentinels=0,
         sentinel_kwargs=None,
+        min_agreeing_sentinels=1,
+        topology_ttl=None,
+        watch_topology=False,
+        max_slave_lag=None,
+        max_slave_offset_lag=None,
         **connection_kwargs,
     ):
         # if sentinel_kwargs isn't defined, use the socket_* options from
@@ -190,7 +440,19 @@ class Sentinel:
             for hostname, port in sentinels
         ]
         self.min_other_sentinels = min_other_sentinels
+        self.min_agreeing_sentinels = min_agreeing_sentinels
+        self.topology_ttl = topology_ttl
+        self.watch_topology = watch_topology
+        self.max_slave_lag = max_slave_lag
+        self.max_slave_offset_lag = max_slave_offset_lag
         self.connection_kwargs = connection_kwargs
+        # ("master" or "slaves", service name) -> (expiry time, addresses)
+        self._topology: Dict[Tuple[str, str], Tuple[float, Any]] = {}
+        self._loading: Dict[Tuple[str, str], "asyncio.Future[Any]"] = {}
+        self._master_pools: "weakref.WeakSet[SentinelConnectionPool]" = (
+            weakref.WeakSet()
+        )
+        self._watcher: Optional["asyncio.Future[None]"] = None
 
     def __repr__(self):
         sentinel_addresses = []
@@ -209,53 +471,229 @@ class Sentinel:
             return False
         return True
 
+    async def _query_sentinels(
+        self,
+        query: Callable[[Redis], Awaitable[Any]],
+        errors: Tuple[Type[Exception], ...],
+        choose: Callable[[Redis, Any], Optional[_T]],
+    ) -> Optional[_T]:
+        """
+        Run ``query`` on all sentinels concurrently and pass the replies, as
+        they arrive, to ``choose`` until it returns something other than
+        None, which is returned. The queries still running are then cancelled.
+        Sentinels failing with ``errors`` are skipped.
+        """
+        tasks = {
+            asyncio.ensure_future(query(sentinel)): sentinel
+            for sentinel in self.sentinels
+        }
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                # replies arriving together are taken in the sentinels' order
+                for task in (task for task in tasks if task in done):
+                    try:
+                        reply = task.result()
+                    except errors:
+                        continue
+                    chosen = choose(tasks[task], reply)
+                    if chosen is not None:
+                        return chosen
+            return None
+        finally:
+            unfinished = [task for task in tasks if not task.done()]
+            for task in unfinished:
+                task.cancel()
+            if unfinished:
+                # let the queries that were not needed give their connections back
+                await asyncio.wait(unfinished)
+            for task in tasks:
+                if not task.cancelled():
+                    # retrieve the errors of the replies that were not needed
+                    task.exception()
+
     async def discover_master(self, service_name: str):
         """
         Asks sentinel servers for the Redis master's address corresponding
         to the service labeled ``service_name``.
 
+        The sentinels are queried concurrently, and the address is returned
+        as soon as ``min_agreeing_sentinels`` of them report it.
+
         Returns a pair (address, port) or raises MasterNotFoundError if no
         master is found.
         """
-        for sentinel_no, sentinel in enumerate(self.sentinels):
-            try:
-                masters = await sentinel.sentinel_masters()
-            except (ConnectionError, TimeoutError):
-                continue
+        return await self._cached(
+            ("master", service_name), partial(self._query_master, service_name)
+        )
+
+    async def _query_master(self, service_name: str) -> AddressT:
+        agreeing: Dict[AddressT, List[Redis]] = {}
+
+        def choose(
+            sentinel: Redis, masters: Mapping
+        ) -> Optional[Tuple[Redis, AddressT]]:
             state = masters.get(service_name)
-            if state and self.check_master_state(state, service_name):
-                # Put this sentinel at the top of the list
-                self.sentinels[0], self.sentinels[sentinel_no] = (
-                    sentinel,
-                    self.sentinels[0],
-                )
-                return state["ip"], state["port"]
-        raise MasterNotFoundError(f"No master found for {service_name!r}")
+            if not state or not self.check_master_state(state, service_name):
+                return None
+            address = state["ip"], state["port"]
+            sentinels = agreeing.setdefault(address, [])
+            sentinels.append(sentinel)
+            if len(sentinels) < self.min_agreeing_sentinels:
+                return None
+            return sentinels[0], address
+
+        chosen = await self._query_sentinels(
+            lambda sentinel: sentinel.sentinel_masters(),
+            (ConnectionError, TimeoutError),
+            choose,
+        )
+        if chosen is None:
+            raise MasterNotFoundError(f"No master found for {service_name!r}")
+        sentinel, address = chosen
+        # Put the sentinel that answered first at the top of the list
+        if sentinel in self.sentinels:
+            sentinel_no = self.sentinels.index(sentinel)
+            self.sentinels[0], self.sentinels[sentinel_no] = (
+                sentinel,
+                self.sentinels[0],
+            )
+        return address
 
     def filter_slaves(
         self, slaves: Iterable[Mapping]
     ) -> Sequence[Tuple[EncodableT, EncodableT]]:
-        """Remove slaves that are in an ODOWN or SDOWN state"""
-        slaves_alive = []
-        for slave in slaves:
-            if slave["is_odown"] or slave["is_sdown"]:
-                continue
-            slaves_alive.append((slave["ip"], slave["port"]))
-        return slaves_alive
+        """
+        Remove slaves that are in an ODOWN or SDOWN state, or lag behind
+        more than ``max_slave_lag`` or ``max_slave_offset_lag``
+        """
+        slaves_alive = [
+            slave for slave in slaves if not slave["is_odown"] and not slave["is_sdown"]
+        ]
+        if self.max_slave_lag is not None:
+            slaves_alive = [
+                slave
+                for slave in slaves_alive
+                if slave.get("master-link-down-time", 0) <= self.max_slave_lag * 1000
+            ]
+        if self.max_slave_offset_lag is not None and slaves_alive:
+            newest = max(slave.get("slave-repl-offset", 0) for slave in slaves_alive)
+            slaves_alive = [
+                slave
+                for slave in slaves_alive
+                if newest - slave.get("slave-repl-offset", 0)
+                <= self.max_slave_offset_lag
+            ]
+        return [(slave["ip"], slave["port"]) for slave in slaves_alive]
 
     async def discover_slaves(
         self, service_name: str
     ) -> Sequence[Tuple[EncodableT, EncodableT]]:
         """Returns a list of alive slaves for service ``service_name``"""
-        for sentinel in self.sentinels:
+        return await self._cached(
+            ("slaves", service_name), partial(self._query_slaves, service_name)
+        )
+
+    async def _query_slaves(
+        self, service_name: str
+    ) -> Sequence[Tuple[EncodableT, EncodableT]]:
+        slaves = await self._query_sentinels(
+            lambda sentinel: sentinel.sentinel_slaves(service_name),
+            (ConnectionError, ResponseError, TimeoutError),
+            lambda sentinel, slaves: self.filter_slaves(slaves) or None,
+        )
+        return slaves or []
+
+    async def _cached(
+        self, key: Tuple[str, str], load: Callable[[], Awaitable[_T]]
+    ) -> _T:
+        if not self.topology_ttl:
+            return await load()
+        if self.watch_topology and (self._watcher is None or self._watcher.done()):
+            self._watcher = asyncio.ensure_future(self._watch_topology())
+        entry = self._topology.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+        loading = self._loading.get(key)
+        if loading is None:
+            loading = self._loading[key] = asyncio.ensure_future(load())
+            loading.add_done_callback(partial(self._loaded, key))
+        return await asyncio.shield(loading)
+
+    def _loaded(self, key: Tuple[str, str], future: "asyncio.Future[Any]"):
+        if self._loading.get(key) is not future:
+            # invalidated by an event while loading
+            return
+        del self._loading[key]
+        if not future.cancelled() and future.exception() is None:
+            self._cache(key, future.result())
+
+    def _cache(self, key: Tuple[str, str], value: Any):
+        self._topology[key] = (time.monotonic() + self.topology_ttl, value)
+
+    def _invalidate(self, service_name: str):
+        for key in (("master", service_name), ("slaves", service_name)):
+            self._topology.pop(key, None)
+            self._loading.pop(key, None)
+
+    async def _watch_topology(self):
+        while True:
+            for sentinel in list(self.sentinels):
+                try:
+                    await self._listen(sentinel)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.warning("Error listening to sentinel events: %s", e)
+                # events may have been missed while not subscribed
+                self._topology.clear()
+            await asyncio.sleep(self.topology_ttl)
+
+    async def _listen(self, sentinel: Redis):
+        pubsub = sentinel.pubsub()
+        try:
+            await pubsub.subscribe(*SENTINEL_EVENTS)
+            while True:
+                # poll rather than block, which the socket timeout would fail
+                message = await pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=self.topology_ttl
+                )
+                if message is not None:
+                    await self._handle_event(
+                        str_if_bytes(message["channel"]),
+                        str_if_bytes(message["data"]),
+                    )
+        finally:
+            await pubsub.reset()
+
+    async def _handle_event(self, channel: str, data: str):
+        parts = data.split()
+        if channel == "+switch-master":
+            # <service name> <old ip> <old port> <new ip> <new port>
+            service_name, _, _, host, port = parts[:5]
+            self._invalidate(service_name)
+            self._cache(("master", service_name), (host, int(port)))
+            for pool in list(self._master_pools):
+                if pool.service_name == service_name:
+                    await pool.get_master_address()
+        elif "@" in parts:
+            # <instance type> <name> <ip> <port> @ <service name> <ip> <port>
+            self._invalidate(parts[parts.index("@") + 1])
+        elif parts and parts[0] == "master":
+            self._invalidate(parts[1])
+
+    async def close(self):
+        """Stop the subscription to the sentinel events"""
+        if self._watcher is not None:
+            self._watcher.cancel()
             try:
-                slaves = await sentinel.sentinel_slaves(service_name)
-            except (ConnectionError, ResponseError, TimeoutError):
-                continue
-            slaves = self.filter_slaves(slaves)
-            if slaves:
-                return slaves
-        return []
+                await self._watcher
+            except asyncio.CancelledError:
+                pass
+            self._watcher = None
 
     def master_for(
         self,
@@ -289,17 +727,16 @@ class Sentinel:
         kwargs["is_master"] = True
         connection_kwargs = dict(self.connection_kwargs)
         connection_kwargs.update(kwargs)
-        return redis_class(
-            connection_pool=connection_pool_class(
-                service_name, self, **connection_kwargs
-            )
-        )
+        connection_pool = connection_pool_class(service_name, self, **connection_kwargs)
+        self._master_pools.add(connection_pool)
+        return redis_class(connection_pool=connection_pool)
 
     def slave_for(
         self,
         service_name: str,
         redis_class: Type[Redis] = Redis,
         connection_pool_class: Type[SentinelConnectionPool] = SentinelConnectionPool,
+        hedge: Optional[HedgePolicy] = None,
         **kwargs,
     ):
         """
@@ -312,6 +749,11 @@ class Sentinel:
         Specify a different class to the ``redis_class`` argument if you
         desire something different.
 
+        With ``hedge``, a :class:`~aioredis.hedging.HedgePolicy`, read-only
+        commands that a slave is slow to reply to are also sent to another.
+        Clients are then :class:`HedgedSlaveRedis` instances, unless
+        ``redis_class`` is a subclass of it.
+
         The ``connection_pool_class`` specifies the connection pool to use.
         The SentinelConnectionPool will be used by default.
 
@@ -322,8 +764,40 @@ class Sentinel:
         kwargs["is_master"] = False
         connection_kwargs = dict(self.connection_kwargs)
         connection_kwargs.update(kwargs)
-        return redis_class(
-            connection_pool=connection_pool_class(
-                service_name, self, **connection_kwargs
-            )
+        connection_pool = connection_pool_class(service_name, self, **connection_kwargs)
+        client_kwargs: Dict[str, Any] = {}
+        if hedge is not None:
+            if not issubclass(redis_class, HedgedSlaveRedis):
+                redis_class = HedgedSlaveRedis
+            client_kwargs["hedge"] = hedge
+        return redis_class(connection_pool=connection_pool, **client_kwargs)
+
+    def read_write_for(
+        self,
+        service_name: str,
+        read_your_writes: Optional[float] = None,
+        connection_pool_class: Type[SentinelConnectionPool] = SentinelConnectionPool,
+        hedge: Optional[HedgePolicy] = None,
+        **kwargs,
+    ) -> ReadWriteRedis:
+        """
+        Returns a client sending the read-only commands to the
+        ``service_name`` slave(s) and the others to its master. See
+        :class:`~aioredis.readwrite.ReadWriteRedis` for ``read_your_writes``
+        and :meth:`slave_for` for ``hedge``.
+
+        The other arguments are passed to :meth:`master_for` and
+        :meth:`slave_for`.
+        """
+        return ReadWriteRedis(
+            self.master_for(
+                service_name, connection_pool_class=connection_pool_class, **kwargs
+            ),
+            self.slave_for(
+                service_name,
+                connection_pool_class=connection_pool_class,
+                hedge=hedge,
+                **kwargs,
+            ),
+            read_your_writes,
         )
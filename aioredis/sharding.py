@@ -0,0 +1,275 @@
+import asyncio
+import functools
+import hashlib
+from bisect import bisect
+from itertools import chain
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from aioredis.client import Pipeline, Redis
+from aioredis.cluster import ALL_PRIMARIES_COMMANDS
+from aioredis.connection import EncodableT
+from aioredis.exceptions import DataError, RedisError
+from aioredis.keys import CommandKeys
+from aioredis.slots import SlotKeyT, hashed_part
+
+
+def _reorder(replies: List[List[Any]], groups: List[List[int]]) -> List[Any]:
+    response: List[Any] = [None] * sum(map(len, groups))
+    for reply, indexes in zip(replies, groups):
+        for i, value in zip(indexes, reply):
+            response[i] = value
+    return response
+
+
+def _sum(replies: List[int], groups: List[List[int]]) -> int:
+    return sum(replies)
+
+
+def _all(replies: List[bool], groups: List[List[int]]) -> bool:
+    return all(replies)
+
+
+#: Multi-key commands split into one command per shard, mapped to the number
+#: of arguments that go with each key and to the function that merges the
+#: replies of the shards, given the indexes of the keys sent to each of them.
+SPLIT_COMMANDS: Mapping[
+    str, Tuple[int, Callable[[List[Any], List[List[int]]], Any]]
+] = {
+    "DEL": (1, _sum),
+    "EXISTS": (1, _sum),
+    "MGET": (1, _reorder),
+    "MSET": (2, _all),
+    "TOUCH": (1, _sum),
+    "UNLINK": (1, _sum),
+}
+
+_ShardedRedisT = TypeVar("_ShardedRedisT", bound="ShardedRedis")
+
+# the ring hashes with MD5 for its distribution, which FIPS-enabled builds
+# of Python only allow when flagged as not used for security
+_md5: Callable[[bytes], Any]
+try:
+    hashlib.md5(usedforsecurity=False)
+except TypeError:  # Python < 3.9
+    _md5 = hashlib.md5
+else:
+    _md5 = functools.partial(hashlib.md5, usedforsecurity=False)
+
+
+class HashRing:
+    """
+    A consistent hash ring. Each node is placed at ``replicas`` points of the
+    ring, and a key belongs to the node of the first point at or after its
+    hash, so adding or removing a node only moves the keys of its points.
+
+    Like in Redis Cluster, only the part of a key between ``{`` and ``}`` is
+    hashed, if there is one, so that related keys end up on the same node.
+    """
+
+    def __init__(self, nodes: Iterable[str] = (), replicas: int = 160):
+        self.replicas = replicas
+        self.nodes: List[str] = []
+        self._points: List[Tuple[int, str]] = []
+        self._hashes: List[int] = []
+        for node in nodes:
+            self.add_node(node)
+
+    @staticmethod
+    def hash(data: bytes) -> int:
+        return int.from_bytes(_md5(data).digest()[:8], "big")
+
+    def add_node(self, node: str):
+        if node in self.nodes:
+            raise DataError(f"{node!r} is already in the ring")
+        self.nodes.append(node)
+        self._points.extend(
+            (self.hash(f"{node}-{i}".encode()), node) for i in range(self.replicas)
+        )
+        self._sort()
+
+    def remove_node(self, node: str):
+        self.nodes.remove(node)
+        self._points = [point for point in self._points if point[1] != node]
+        self._sort()
+
+    def _sort(self):
+        self._points.sort()
+        self._hashes = [hash_ for hash_, _ in self._points]
+
+    def get_node(self, key: SlotKeyT) -> str:
+        """Return the node ``key`` belongs to"""
+        if not self._points:
+            raise RedisError("The hash ring has no nodes")
+        index = bisect(self._hashes, self.hash(hashed_part(key)))
+        return self._points[index % len(self._points)][1]
+
+
+class ShardedRedis(Redis):  # lgtm [py/missing-call-to-init]
+    """
+    A client spreading keys over several independent Redis servers
+
+    >>> from aioredis.sharding import ShardedRedis
+    >>> redis = ShardedRedis.from_urls(
+    ...     ["redis://cache1:6379/0", "redis://cache2:6379/0"]
+    ... )
+    >>> await redis.mset({"foo": 1, "bar": 2})
+    >>> await redis.mget("foo", "bar")
+    [b'1', b'2']
+
+    ``shards`` are the clients of the servers, each with its own connection
+    pool, either mapped to the names their keys are hashed to, or in a list,
+    in which case they are named after their address and database. Keys are
+    assigned to shards with a :class:`HashRing` of ``replicas`` points per
+    shard, so shards should keep their names for keys to stay in place.
+
+    Commands are sent to the shard of their keys, located with the key
+    positions reported by ``COMMAND``. The commands in ``SPLIT_COMMANDS``,
+    such as MGET, MSET, DEL and EXISTS, are split into one command per shard,
+    sent concurrently, and their replies are merged. Other commands must only
+    have keys on a single shard. Commands without keys go to the first shard,
+    except those in :data:`aioredis.cluster.ALL_PRIMARIES_COMMANDS`, which
+    are sent to every shard.
+
+    ``connection_pool`` is the pool of the first shard. It is used for pubsub
+    and monitoring, which only involve a single server. Pipelines are not
+    supported; use the pipeline of :meth:`get_shard` instead.
+    """
+
+    def __init__(
+        self, shards: Union[Mapping[str, Redis], Iterable[Redis]], replicas: int = 160
+    ):
+        self.connection = None
+        if isinstance(shards, Mapping):
+            self.shards: Dict[str, Redis] = dict(shards)
+        else:
+            self.shards = {}
+            for shard in shards:
+                name = self.shard_name(shard)
+                if name in self.shards:
+                    raise RedisError(f"Duplicate shard {name}")
+                self.shards[name] = shard
+        if not self.shards:
+            raise RedisError("At least one shard is required")
+        self.ring = HashRing(self.shards, replicas)
+        self.command_keys = CommandKeys()
+        self.default_shard = next(iter(self.shards.values()))
+
+        self.connection_pool = self.default_shard.connection_pool
+        self.encoder = self.connection_pool.get_encoder()
+        self.instrumentation = self.connection_pool.instrumentation
+        self.response_callbacks = self.default_shard.response_callbacks
+        self.single_connection_client = False
+        self.auto_close_connection_pool = True
+        self.client_cache = None
+        self.auto_pipeline = None
+
+    @classmethod
+    def from_urls(cls, urls: Iterable[str], replicas: int = 160, **kwargs):
+        """
+        Return a client sharding over the servers given by ``urls``. See
+        :meth:`aioredis.Redis.from_url` for the URL format and ``kwargs``.
+        """
+        return cls([Redis.from_url(url, **kwargs) for url in urls], replicas)
+
+    @staticmethod
+    def shard_name(client: Redis) -> str:
+        """Return the name of the address and database of ``client``"""
+        kwargs = client.connection_pool.connection_kwargs
+        address = kwargs.get("path") or (
+            f"{kwargs.get('host', 'localhost')}:{kwargs.get('port', 6379)}"
+        )
+        return f"{address}/{kwargs.get('db', 0)}"
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}<shards=[{','.join(self.shards)}]>"
+
+    async def initialize(self: _ShardedRedisT) -> _ShardedRedisT:
+        if not self.command_keys.loaded:
+            await self.command_keys.load(self.default_shard)
+        return self
+
+    def get_shard(self, key: EncodableT) -> Redis:
+        """Return the client of the shard ``key`` belongs to"""
+        return self.shards[self.ring.get_node(self.encoder.encode(key))]
+
+    async def get_keys(self, *args: EncodableT) -> Sequence[EncodableT]:
+        """Return the keys that the command ``args`` reads or writes"""
+        await self.initialize()
+        return await self.command_keys.get_keys(self.default_shard, *args)
+
+    async def execute_command(self, *args, **options):
+        """Execute a command on the shards of its keys and return its response"""
+        await self.initialize()
+        name = args[0]
+        if name in SPLIT_COMMANDS and len(args) > 1:
+            return await self._execute_split(*args, **options)
+        merge = ALL_PRIMARIES_COMMANDS.get(name)
+        if merge is not None:
+            return merge(
+                await asyncio.gather(
+                    *(
+                        shard.execute_command(*args, **options)
+                        for shard in self.shards.values()
+                    )
+                )
+            )
+        keys = await self.command_keys.get_keys(self.default_shard, *args)
+        shards = {self.ring.get_node(self.encoder.encode(key)) for key in keys}
+        if len(shards) > 1:
+            raise DataError(f"The keys of {name} belong to different shards")
+        shard = self.shards[shards.pop()] if shards else self.default_shard
+        return await shard.execute_command(*args, **options)
+
+    async def _execute_split(self, *args, **options):
+        name = args[0]
+        step, merge = SPLIT_COMMANDS[name]
+        if len(args) == 2 or (len(args) - 1) % step:
+            # nothing to split, or malformed: leave the errors to the server
+            shard = self.get_shard(args[1])
+            return await shard.execute_command(*args, **options)
+        items = [args[i : i + step] for i in range(1, len(args), step)]
+        groups: Dict[str, List[int]] = {}
+        for i, item in enumerate(items):
+            node = self.ring.get_node(self.encoder.encode(item[0]))
+            groups.setdefault(node, []).append(i)
+        replies = await asyncio.gather(
+            *(
+                self.shards[node].execute_command(
+                    name, *chain.from_iterable(items[i] for i in indexes), **options
+                )
+                for node, indexes in groups.items()
+            )
+        )
+        return merge(replies, list(groups.values()))
+
+    def pipeline(
+        self, transaction: bool = True, shard_hint: Optional[str] = None
+    ) -> Pipeline:
+        raise RedisError(
+            "ShardedRedis does not support pipelines; "
+            "use the pipeline of get_shard() instead"
+        )
+
+    def client(self) -> Redis:
+        raise RedisError("A sharded client cannot use a single connection")
+
+    async def close(self, close_connection_pool: Optional[bool] = None) -> None:
+        """Close the clients of every shard"""
+        await asyncio.gather(
+            *(
+                shard.close(close_connection_pool=close_connection_pool)
+                for shard in self.shards.values()
+            )
+        )
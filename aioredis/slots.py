@@ -0,0 +1,169 @@
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+from aioredis.exceptions import DataError
+
+try:
+    import numpy
+except ImportError:
+    NUMPY_AVAILABLE = False
+else:
+    NUMPY_AVAILABLE = True
+
+SLOT_COUNT = 16384
+
+#: Smallest batch for which :func:`key_slots` uses NumPy by default
+NUMPY_MIN_KEYS = 128
+
+#: Longest key whose checksum :func:`key_slots` computes with NumPy
+NUMPY_MAX_KEY_LENGTH = 1024
+
+SlotKeyT = Union[bytes, str, memoryview, int, float]
+
+
+def _crc16_table() -> List[int]:
+    table = []
+    for byte in range(256):
+        crc = byte << 8
+        for _ in range(8):
+            crc = (crc << 1) ^ 0x1021 if crc & 0x8000 else crc << 1
+        table.append(crc & 0xFFFF)
+    return table
+
+
+_CRC16_TABLE = _crc16_table()
+
+
+def crc16(data: bytes) -> int:
+    """CRC16-CCITT (XMODEM), the checksum Redis Cluster hashes keys with"""
+    crc = 0
+    for byte in data:
+        crc = ((crc << 8) & 0xFF00) ^ _CRC16_TABLE[(crc >> 8) ^ byte]
+    return crc
+
+
+def hashed_part(key: SlotKeyT) -> bytes:
+    """
+    Return the part of ``key`` that is hashed: the bytes between the first
+    ``{`` and the next ``}``, if there are any, so that related keys can be
+    kept in the same slot, or else the whole key. ``str`` keys are encoded
+    as UTF-8 and numbers like :class:`~aioredis.connection.Encoder` does.
+    """
+    if isinstance(key, str):
+        key = key.encode()
+    elif isinstance(key, memoryview):
+        key = key.tobytes()
+    elif isinstance(key, (int, float)) and not isinstance(key, bool):
+        key = repr(key).encode()
+    elif not isinstance(key, bytes):
+        raise DataError(
+            f"Invalid input of type: {type(key).__name__!r}. "
+            "Convert to a bytes, string, int or float first."
+        )
+    start = key.find(b"{")
+    if start != -1:
+        end = key.find(b"}", start + 1)
+        if end > start + 1:
+            return key[start + 1 : end]
+    return key
+
+
+def key_slot(key: SlotKeyT) -> int:
+    """Return the hash slot of ``key``"""
+    return crc16(hashed_part(key)) % SLOT_COUNT
+
+
+def key_slots(keys: Sequence[SlotKeyT], use_numpy: Optional[bool] = None) -> List[int]:
+    """
+    Return the hash slots of ``keys``, in order.
+
+    With NumPy installed, the checksums of batches of at least
+    ``NUMPY_MIN_KEYS`` keys are computed for many keys at once, a byte
+    position at a time. Keys are grouped by the power of two above their
+    length and padded to the longest key of their group, and keys longer
+    than ``NUMPY_MAX_KEY_LENGTH`` are hashed one at a time. ``use_numpy``
+    forces this on or off.
+    """
+    if use_numpy is None:
+        use_numpy = NUMPY_AVAILABLE and len(keys) >= NUMPY_MIN_KEYS
+    if not use_numpy:
+        return [crc16(hashed_part(key)) % SLOT_COUNT for key in keys]
+    if not NUMPY_AVAILABLE:
+        raise RuntimeError("NumPy is not installed")
+    return _numpy_key_slots([hashed_part(key) for key in keys])
+
+
+def _numpy_key_slots(parts: List[bytes]) -> List[int]:
+    lengths = numpy.fromiter(map(len, parts), dtype=numpy.intp, count=len(parts))
+    # empty keys are in slot 0
+    slots = numpy.zeros(len(parts), dtype=numpy.uint16)
+    # the bit length of each key's length: padding a group to its longest
+    # key at most doubles the memory it takes
+    _, groups = numpy.frexp(lengths)
+    # longer keys are hashed one by one below
+    groups[lengths > NUMPY_MAX_KEY_LENGTH] = 0
+    table = numpy.array(_CRC16_TABLE, dtype=numpy.uint16)
+    for group in range(1, NUMPY_MAX_KEY_LENGTH.bit_length() + 1):
+        indexes = numpy.flatnonzero(groups == group)
+        if len(indexes):
+            slots[indexes] = _numpy_crc16(
+                [parts[i] for i in indexes.tolist()], lengths[indexes], table
+            )
+    for i in numpy.flatnonzero(lengths > NUMPY_MAX_KEY_LENGTH).tolist():
+        slots[i] = crc16(parts[i])
+    return (slots % SLOT_COUNT).tolist()
+
+
+def _numpy_crc16(parts: List[bytes], lengths, table):
+    # one row per key, padded with zeros; ``present`` masks out the padding
+    present = numpy.arange(lengths.max()) < lengths[:, None]
+    data = numpy.zeros(present.shape, dtype=numpy.uint8)
+    data[present] = numpy.frombuffer(b"".join(parts), dtype=numpy.uint8)
+    crc = numpy.zeros(len(parts), dtype=numpy.uint16)
+    for column in range(data.shape[1]):
+        # uint16 arithmetic drops the bits shifted out of the checksum
+        updated = (crc << 8) ^ table[(crc >> 8) ^ data[:, column]]
+        numpy.copyto(crc, updated, where=present[:, column])
+    return crc
+
+
+def group_by_slot(
+    keys: Sequence[SlotKeyT], use_numpy: Optional[bool] = None
+) -> Dict[int, List[int]]:
+    """
+    Map the slots of ``keys`` to the indexes of the keys in them, in order,
+    e.g. to put back together the replies of one MGET per slot
+    """
+    groups: Dict[int, List[int]] = {}
+    for i, slot in enumerate(key_slots(keys, use_numpy)):
+        groups.setdefault(slot, []).append(i)
+    return groups
+
+
+def partition_keys(
+    keys: Sequence[SlotKeyT], use_numpy: Optional[bool] = None
+) -> Dict[int, List[SlotKeyT]]:
+    """
+    Split ``keys`` into one list per slot, e.g. for MGET, DEL, EXISTS,
+    TOUCH or UNLINK
+    """
+    return {
+        slot: [keys[i] for i in indexes]
+        for slot, indexes in group_by_slot(keys, use_numpy).items()
+    }
+
+
+def partition_pairs(
+    pairs: Union[Mapping[SlotKeyT, SlotKeyT], Iterable[Tuple[SlotKeyT, SlotKeyT]]],
+    use_numpy: Optional[bool] = None,
+) -> Dict[int, List[SlotKeyT]]:
+    """
+    Split key/value ``pairs`` by the slot of their key into flat argument
+    lists, e.g. for MSET or MSETNX
+    """
+    items = list(pairs.items() if isinstance(pairs, Mapping) else pairs)
+    args: Dict[int, List[SlotKeyT]] = {}
+    for (key, value), slot in zip(
+        items, key_slots([key for key, _ in items], use_numpy)
+    ):
+        args.setdefault(slot, []).extend((key, value))
+    return args
@@ -56,6 +56,7 @@ setup(
     ],
     extras_require={
         "hiredis": 'hiredis>=1.0; implementation_name=="cpython"',
+        "numpy": "numpy",
     },
     package_data={"aioredis": ["py.typed"]},
     python_requires=">=3.6",
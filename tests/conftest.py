@@ -13,6 +13,7 @@ from aioredis.connection import (
     HIREDIS_AVAILABLE,
     HiredisParser,
     PythonParser,
+    PythonReaderParser,
     parse_url,
 )
 
@@ -85,6 +86,13 @@ def pytest_addoption(parser):
     parser.addoption(
         "--uvloop", action=BooleanOptionalAction, help="Run tests with uvloop"
     )
+    parser.addoption(
+        "--redis-cluster-url",
+        default=None,
+        action="store",
+        help="Connection string of a Redis Cluster node, cluster tests are "
+        "skipped without it",
+    )
 
 
 async def _get_info(redis_url):
@@ -146,6 +154,16 @@ def skip_unless_arch_bits(arch_bits: int) -> _TestDecorator:
             marks=[pytest.mark.python_parser, pytest.mark.connection_pool],
             id="pool-python-parser",
         ),
+        pytest.param(
+            (True, PythonReaderParser),
+            marks=[pytest.mark.python_reader_parser, pytest.mark.single_connection],
+            id="single-connection-python-reader-parser",
+        ),
+        pytest.param(
+            (False, PythonReaderParser),
+            marks=[pytest.mark.python_reader_parser, pytest.mark.connection_pool],
+            id="pool-python-reader-parser",
+        ),
         pytest.param(
             (True, HiredisParser),
             marks=[
@@ -0,0 +1,134 @@
+import asyncio
+
+import pytest
+
+import aioredis
+from aioredis.cache import ClientCache
+
+from .conftest import REDIS_6_VERSION, skip_if_server_version_lt
+
+pytestmark = pytest.mark.asyncio
+
+
+class TestClientCacheLRU:
+    @pytest.fixture()
+    def cache(self):
+        cache = ClientCache(max_entries=2)
+        cache.bind(aioredis.ConnectionPool())
+        # pretend the invalidation listener is running
+        cache._listener = asyncio.get_event_loop().create_future()
+        return cache
+
+    @staticmethod
+    async def execute(*args, **options):
+        return [args[0], *args[1:]]
+
+    async def test_hits_and_misses(self, cache):
+        execute = self.execute
+        assert await cache.execute_command(execute, "GET", "a") == ["GET", "a"]
+        assert await cache.execute_command(execute, "GET", b"a") == ["GET", "a"]
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert len(cache) == 1
+
+    async def test_hits_are_copies(self, cache):
+        value = await cache.execute_command(self.execute, "MGET", "a", "b")
+        value.append("c")
+        assert await cache.execute_command(self.execute, "MGET", "a", "b") == [
+            "MGET",
+            "a",
+            "b",
+        ]
+
+    async def test_lru_eviction(self, cache):
+        await cache.execute_command(self.execute, "GET", "a")
+        await cache.execute_command(self.execute, "GET", "b")
+        await cache.execute_command(self.execute, "GET", "a")
+        await cache.execute_command(self.execute, "GET", "c")
+        assert cache.evictions == 1
+        await cache.execute_command(self.execute, "GET", "a")
+        assert cache.hits == 2
+        await cache.execute_command(self.execute, "GET", "b")
+        assert cache.misses == 4
+
+    async def test_memory_bound(self, cache):
+        cache.max_entries = 100
+        cache.max_memory = 1000
+        for key in "abcdefghij":
+            await cache.execute_command(self.execute, "GET", key * 100)
+        assert cache.memory <= 1000
+        assert len(cache) + cache.evictions == 10
+
+    async def test_write_invalidates(self, cache):
+        await cache.execute_command(self.execute, "HGET", "h", "f")
+        await cache.execute_command(self.execute, "MGET", "a", "h")
+        await cache.execute_command(self.execute, "HSET", "h", "f", "v")
+        assert len(cache) == 0
+        assert cache.invalidations == 2
+
+    async def test_invalidation_during_read_is_not_cached(self, cache):
+        async def execute(*args, **options):
+            cache.invalidate("a")
+            return b"stale"
+
+        assert await cache.execute_command(execute, "GET", "a") == b"stale"
+        assert len(cache) == 0
+
+    async def test_prefixes(self):
+        cache = ClientCache(prefixes=["user:"])
+        cache.bind(aioredis.ConnectionPool())
+        cache._listener = asyncio.get_event_loop().create_future()
+        await cache.execute_command(self.execute, "GET", "user:1")
+        await cache.execute_command(self.execute, "GET", "order:1")
+        assert len(cache) == 1
+        # keys that are never cached don't count as misses
+        assert (cache.hits, cache.misses) == (0, 1)
+
+    async def test_bound_to_one_pool(self, cache):
+        with pytest.raises(ValueError):
+            cache.bind(aioredis.ConnectionPool())
+
+
+@skip_if_server_version_lt(REDIS_6_VERSION)
+class TestClientCache:
+    @pytest.fixture()
+    async def cached(self, r):
+        client = aioredis.Redis(
+            connection_pool=r.connection_pool, client_cache=ClientCache()
+        )
+        yield client
+        await client.client_cache.close()
+
+    async def wait_for_invalidation(self, cache):
+        for _ in range(100):
+            if not len(cache):
+                return
+            await asyncio.sleep(0.01)
+
+    async def test_cached_reads(self, cached):
+        cache = cached.client_cache
+        await cached.set("a", "1")
+        assert await cached.get("a") == b"1"
+        assert await cached.get("a") == b"1"
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    async def test_invalidated_by_other_client(self, cached, r2):
+        await cached.hset("h", "f", "1")
+        assert await cached.hgetall("h") == {b"f": b"1"}
+        await r2.hset("h", "f", "2")
+        await self.wait_for_invalidation(cached.client_cache)
+        assert await cached.hgetall("h") == {b"f": b"2"}
+
+    async def test_own_writes_are_visible(self, cached):
+        assert await cached.get("a") is None
+        await cached.set("a", "1")
+        assert await cached.get("a") == b"1"
+        await cached.pipeline(transaction=False).set("a", "2").execute()
+        assert await cached.get("a") == b"2"
+
+    async def test_flushed_when_listener_disconnects(self, cached):
+        cache = cached.client_cache
+        await cached.get("a")
+        assert len(cache) == 1
+        await cache._connection.disconnect()
+        await self.wait_for_invalidation(cache)
+        assert len(cache) == 0
@@ -0,0 +1,179 @@
+import pytest
+
+from aioredis.cluster import RedisCluster
+from aioredis.connection import PythonParser
+from aioredis.exceptions import (
+    AskError,
+    ClusterCrossSlotError,
+    ClusterError,
+    MovedError,
+    ResponseError,
+)
+
+pytestmark = pytest.mark.asyncio
+
+
+class TestRedirectErrors:
+    def test_moved(self):
+        error = PythonParser(65536).parse_error("MOVED 3999 127.0.0.1:6381")
+        assert isinstance(error, MovedError)
+        assert (error.slot_id, error.host, error.port) == (3999, "127.0.0.1", 6381)
+
+    def test_ask_without_host(self):
+        error = PythonParser(65536).parse_error("ASK 3999 :6381")
+        assert type(error) is AskError
+        assert (error.slot_id, error.host, error.port) == (3999, "", 6381)
+
+    def test_invalid_redirection(self):
+        error = PythonParser(65536).parse_error("ASK 3999")
+        assert type(error) is ResponseError
+        assert str(error) == "ASK 3999"
+
+    def test_masterdown_is_not_mapped(self):
+        error = PythonParser(65536).parse_error("MASTERDOWN Link with MASTER is down")
+        assert type(error) is ResponseError
+
+
+@pytest.fixture()
+async def cluster(request):
+    url = request.config.getoption("--redis-cluster-url")
+    if url is None:
+        pytest.skip("--redis-cluster-url is not set")
+    cluster = await RedisCluster.from_url(url)
+    yield cluster
+    await cluster.flushdb()
+    await cluster.close()
+
+
+def node_name(node):
+    kwargs = node.connection_pool.connection_kwargs
+    return f"{kwargs['host']}:{kwargs['port']}"
+
+
+class TestRedisCluster:
+    async def test_routing(self, cluster):
+        keys = [f"key:{i}" for i in range(20)]
+        for key in keys:
+            await cluster.set(key, key)
+        nodes = {node_name(cluster.get_node_from_key(key)) for key in keys}
+        assert len(nodes) > 1
+        for key in keys:
+            node = cluster.get_node_from_key(key)
+            assert await node.get(key) == key.encode()
+        assert await cluster.dbsize() == len(keys)
+        assert sorted(await cluster.keys("key:*")) == sorted(k.encode() for k in keys)
+
+    async def test_multi_key_commands(self, cluster):
+        await cluster.mset({"{a}1": 1, "{a}2": 2})
+        assert await cluster.mget("{a}1", "{a}2") == [b"1", b"2"]
+        with pytest.raises(ClusterCrossSlotError):
+            await cluster.mget("a1", "a2")
+
+    async def test_key_positions(self, cluster):
+        assert await cluster.get_keys("GET", "a") == ("a",)
+        assert await cluster.get_keys("MSET", "a", 1, "b", 2) == ("a", "b")
+        assert await cluster.get_keys("EVAL", "return 1", 1, "a", "b") == ("a",)
+        assert await cluster.get_keys("OBJECT ENCODING", "a") == ("a",)
+        assert await cluster.get_keys("PING") == ()
+        assert sorted(
+            await cluster.get_keys("ZUNIONSTORE", "{z}d", 2, "{z}a", "{z}b")
+        ) == [b"{z}a", b"{z}b", b"{z}d"]
+
+    async def test_scripts(self, cluster):
+        assert await cluster.eval("return redis.call('SET', KEYS[1], 'x')", 1, "k")
+        script = cluster.register_script("return redis.call('GET', KEYS[1])")
+        assert await script(keys=["k"]) == b"x"
+
+    async def test_moved(self, cluster):
+        slot = cluster.keyslot("foo")
+        owner = cluster.slots[slot]
+        other = next(
+            node for node in cluster.get_primaries() if node_name(node) != owner[0]
+        )
+        cluster.slots[slot] = (node_name(other),)
+        await cluster.set("foo", "bar")
+        assert cluster.slots[slot][0] == owner[0]
+        assert await cluster.get_node_from_slot(slot).get("foo") == b"bar"
+        await cluster.refresh()
+        assert cluster.slots[slot] == owner
+
+    async def test_ask(self, cluster):
+        slot = cluster.keyslot("foo")
+        source = cluster.get_node_from_slot(slot)
+        target = next(
+            node
+            for node in cluster.get_primaries()
+            if node_name(node) != node_name(source)
+        )
+        source_id = await source.execute_command("CLUSTER MYID")
+        target_id = await target.execute_command("CLUSTER MYID")
+        await target.execute_command("CLUSTER SETSLOT", slot, "IMPORTING", source_id)
+        await source.execute_command("CLUSTER SETSLOT", slot, "MIGRATING", target_id)
+        try:
+            # foo is not on the source node, so it redirects to the target
+            with pytest.raises(AskError):
+                await source.get("foo")
+            assert await cluster.get("foo") is None
+            assert cluster.get_node_from_slot(slot) is source
+        finally:
+            for node in (source, target):
+                await node.execute_command("CLUSTER SETSLOT", slot, "STABLE")
+
+    async def test_pipeline(self, cluster):
+        keys = [f"key:{i}" for i in range(20)]
+        async with cluster.pipeline() as pipe:
+            for key in keys:
+                pipe.set(key, key)
+            pipe.incr(keys[0])
+            for key in keys:
+                pipe.get(key)
+            response = await pipe.execute(raise_on_error=False)
+        assert response[: len(keys)] == [True] * len(keys)
+        assert isinstance(response[len(keys)], ResponseError)
+        assert response[len(keys) + 1 :] == [key.encode() for key in keys]
+
+    async def test_pipeline_in_chunks(self, cluster):
+        keys = [f"key:{i}" for i in range(200)]
+        async with cluster.pipeline() as pipe:
+            for key in keys:
+                pipe.set(key, key)
+            for key in keys:
+                pipe.get(key)
+            response = await pipe.execute(chunk_size=16)
+        assert response == [True] * len(keys) + [key.encode() for key in keys]
+
+    async def test_pipeline_execute_iter(self, cluster):
+        async with cluster.pipeline() as pipe:
+            pipe.set("foo", "bar").get("foo").get("baz")
+            assert [r async for r in pipe.execute_iter()] == [True, b"bar", None]
+
+    async def test_pipeline_moved(self, cluster):
+        slot = cluster.keyslot("foo")
+        owner = cluster.slots[slot]
+        other = next(
+            node for node in cluster.get_primaries() if node_name(node) != owner[0]
+        )
+        cluster.slots[slot] = (node_name(other),)
+        async with cluster.pipeline() as pipe:
+            assert await pipe.set("foo", "bar").get("foo").execute() == [True, b"bar"]
+
+    async def test_transaction(self, cluster):
+        async with cluster.pipeline(transaction=True) as pipe:
+            pipe.set("{t}a", 1).incr("{t}a").get("{t}a")
+            assert await pipe.execute() == [True, 2, b"2"]
+        async with cluster.pipeline(transaction=True) as pipe:
+            pipe.set("a", 1).set("b", 1)
+            with pytest.raises(ClusterCrossSlotError):
+                await pipe.execute()
+            with pytest.raises(ClusterError):
+                await pipe.watch("a")
+
+    async def test_unreachable_startup_node(self, cluster):
+        kwargs = cluster.connection_pool.connection_kwargs
+        other = RedisCluster(
+            startup_nodes=[("localhost", 1), (kwargs["host"], kwargs["port"])]
+        )
+        try:
+            assert await other.ping()
+        finally:
+            await other.close()
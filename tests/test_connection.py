@@ -3,10 +3,22 @@ from typing import TYPE_CHECKING
 
 import pytest
 
-from aioredis.connection import PythonParser, UnixDomainSocketConnection
-from aioredis.exceptions import InvalidResponse
+from aioredis.connection import (
+    HIREDIS_AVAILABLE,
+    HIREDIS_NOT_ENOUGH_DATA,
+    NOT_ENOUGH_DATA,
+    Connection,
+    HiredisParser,
+    PushNotification,
+    PythonParser,
+    PythonReader,
+    RedisProtocol,
+    UnixDomainSocketConnection,
+)
+from aioredis.exceptions import ConnectionError, InvalidResponse, ResponseError
 
 from .compat import mock
+from .conftest import REDIS_6_VERSION, skip_if_server_version_lt
 
 
 @pytest.mark.asyncio
@@ -35,3 +47,222 @@ async def test_socket_param_regression(r):
 async def test_can_run_concurrent_commands(r):
     assert await r.ping() is True
     assert all(await asyncio.gather(*(r.ping() for _ in range(10))))
+
+
+@pytest.mark.asyncio
+async def test_direct_transport(create_redis):
+    r = await create_redis(direct_transport=True)
+    assert await r.set("a", "foo")
+    assert await r.get("a") == b"foo"
+    async with r.pipeline(transaction=False) as pipe:
+        pipe.set("b", "bar").get("b").incr("b")
+        with pytest.raises(ResponseError):
+            await pipe.execute()
+    assert all(await asyncio.gather(*(r.ping() for _ in range(10))))
+
+
+@pytest.mark.asyncio
+async def test_direct_transport_reconnects_after_server_drop(r):
+    kwargs = dict(r.connection_pool.connection_kwargs, direct_transport=True)
+    conn = Connection(**kwargs)
+    await conn.send_command("CLIENT ID")
+    client_id = await conn.read_response()
+    await r.client_kill_filter(_id=client_id)
+    await conn._protocol.wait_closed()
+    assert not conn.is_connected
+    await conn.send_command("PING")
+    assert await conn.read_response() == b"PONG"
+    await conn.disconnect()
+    assert conn._protocol is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "parser_class",
+    [
+        PythonParser,
+        pytest.param(
+            HiredisParser,
+            marks=pytest.mark.skipif(
+                not HIREDIS_AVAILABLE, reason="hiredis is not installed"
+            ),
+        ),
+    ],
+)
+async def test_protocol_feeds_partial_replies(parser_class):
+    conn = Connection(parser_class=parser_class, direct_transport=True)
+    conn._parser.on_connect(conn)
+    protocol = RedisProtocol(conn._parser)
+    protocol.data_received(b"*2\r\n$3\r\nfoo\r")
+    assert await protocol.can_read(0) is False
+    protocol.data_received(b"\n:1\r\n+OK\r\n$-1\r\n")
+    assert await protocol.read_response() == [b"foo", 1]
+    assert await protocol.read_response() == b"OK"
+    assert await protocol.read_response() is None
+    protocol.connection_lost(None)
+    with pytest.raises(ConnectionError):
+        await protocol.read_response()
+
+
+@pytest.mark.asyncio
+@skip_if_server_version_lt(REDIS_6_VERSION)
+async def test_resp3_protocol(request, create_redis):
+    if (
+        request.node.get_closest_marker("hiredis_parser")
+        and not HIREDIS_NOT_ENOUGH_DATA
+    ):
+        pytest.skip("this hiredis version does not support RESP3")
+    r = await create_redis(protocol=3)
+    assert r.connection_pool.connection_kwargs["protocol"] == 3
+    await r.hset("h", mapping={"a": "1", "b": "2"})
+    assert await r.hgetall("h") == {b"a": b"1", b"b": b"2"}
+    await r.zadd("z", {"a": 1, "b": 2.5})
+    assert await r.zrange("z", 0, -1, withscores=True) == [(b"a", 1.0), (b"b", 2.5)]
+    assert await r.get("missing") is None
+
+
+@pytest.mark.asyncio
+async def test_handshake_single_round_trip(r):
+    pool = r.connection_pool
+    kwargs = dict(pool.connection_kwargs, client_name="handshake", db=1)
+    conn = pool.connection_class(**kwargs)
+    with mock.patch.object(
+        conn, "send_packed_command", wraps=conn.send_packed_command
+    ) as send:
+        await conn.connect()
+    assert send.call_count == 1
+    await conn.send_command("CLIENT", "GETNAME")
+    assert await conn.read_response() == b"handshake"
+    await conn.disconnect()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("direct_transport", [False, True])
+async def test_unix_socket_auth_fallback(tmp_path, direct_transport):
+    # a server older than 6.0 refuses AUTH with a username
+    auths = []
+
+    async def serve(reader, writer):
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            args = []
+            for _ in range(int(line[1:])):
+                length = int((await reader.readline())[1:])
+                args.append((await reader.readexactly(length + 2))[:-2])
+            if args[0] == b"AUTH":
+                auths.append(args[1:])
+                if len(args) > 2:
+                    writer.write(
+                        b"-ERR wrong number of arguments for 'auth' command\r\n"
+                    )
+                    continue
+            writer.write(b"+OK\r\n")
+        writer.close()
+
+    path = str(tmp_path / "redis.sock")
+    server = await asyncio.start_unix_server(serve, path)
+    conn = UnixDomainSocketConnection(
+        path=path,
+        username="user",
+        password="password",
+        db=1,
+        direct_transport=direct_transport,
+    )
+    try:
+        await conn.connect()
+        assert auths == [[b"user", b"password"], [b"password"]]
+        await conn.send_command("PING")
+        assert await conn.read_response() == b"OK"
+    finally:
+        await conn.disconnect()
+        server.close()
+        await server.wait_closed()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("direct_transport", [False, True])
+async def test_send_only_drains_buffered_writes(r, direct_transport):
+    pool = r.connection_pool
+    kwargs = dict(pool.connection_kwargs, direct_transport=direct_transport)
+    conn = pool.connection_class(**kwargs)
+    await conn.connect()
+    writer = conn._protocol or conn._writer
+    with mock.patch.object(writer, "drain", wraps=writer.drain) as drain:
+        await conn.send_command("PING")
+        assert await conn.read_response() == b"PONG"
+        assert not drain.called
+        with mock.patch.object(
+            writer.transport, "get_write_buffer_size", return_value=1
+        ):
+            await conn.send_command("PING")
+        assert await conn.read_response() == b"PONG"
+        assert drain.called
+    await conn.disconnect()
+
+
+def test_invalid_protocol_version():
+    with pytest.raises(ValueError):
+        Connection(protocol=4)
+
+
+class TestPythonReader:
+    def test_chunked_nested_replies(self):
+        reader = PythonReader()
+        data = b"*3\r\n$3\r\nfoo\r\n*2\r\n:1\r\n$-1\r\n*0\r\n+OK\r\n"
+        replies = []
+        for i in range(len(data)):
+            reader.feed(data[i : i + 1])
+            response = reader.gets()
+            while response is not False:
+                replies.append(response)
+                response = reader.gets()
+        assert replies == [[b"foo", [1, None], []], b"OK"]
+
+    def test_returns_every_buffered_reply(self):
+        reader = PythonReader()
+        reader.feed(b"".join(b"$1\r\n%d\r\n" % (i % 10) for i in range(1000)))
+        assert [reader.gets() for _ in range(1000)] == [
+            str(i % 10).encode() for i in range(1000)
+        ]
+        assert reader.gets() is False
+
+    def test_errors_and_decoding(self):
+        reader = PythonReader(encoding="utf-8", errors="strict")
+        reader.feed(b"-ERR oops\r\n$5\r\n\xc3\xa9t\xc3")
+        error = reader.gets()
+        assert isinstance(error, ResponseError)
+        assert str(error) == "ERR oops"
+        assert reader.gets() is False
+        reader.feed(b"\xa9\r\n")
+        assert reader.gets() == "été"
+
+    def test_protocol_error(self):
+        reader = PythonReader(protocolError=InvalidResponse)
+        reader.feed(b"x\r\n")
+        with pytest.raises(InvalidResponse):
+            reader.gets()
+
+    def test_resp3_types(self):
+        reader = PythonReader(notEnoughData=NOT_ENOUGH_DATA)
+        reader.feed(
+            b"%2\r\n+a\r\n:1\r\n+b\r\n,1.5\r\n~1\r\n$1\r\nx\r\n_\r\n#t\r\n#f\r\n"
+            b",inf\r\n(123\r\n=8\r\ntxt:abcd\r\n!5\r\nERR x\r\n"
+            b">2\r\n$10\r\ninvalidate\r\n*1\r\n$1\r\nk\r\n"
+        )
+        assert reader.gets() == {b"a": 1, b"b": 1.5}
+        assert reader.gets() == [b"x"]
+        assert reader.gets() is None
+        assert reader.gets() is True
+        assert reader.gets() is False
+        assert reader.gets() == float("inf")
+        assert reader.gets() == 123
+        assert reader.gets() == b"abcd"
+        error = reader.gets()
+        assert isinstance(error, ResponseError)
+        assert str(error) == "ERR x"
+        push = reader.gets()
+        assert isinstance(push, PushNotification)
+        assert push == [b"invalidate", [b"k"]]
+        assert reader.gets() is NOT_ENOUGH_DATA
@@ -155,6 +155,163 @@ class TestConnectionPool:
         c2 = await pool.get_connection("_")
         assert c1 == c2
 
+    async def test_wait_hands_off_in_fifo_order(self):
+        pool = self.get_pool(
+            connection_kwargs={"wait": True},
+            max_connections=1,
+            connection_class=DummyConnection,
+        )
+        c1 = await pool.get_connection("_")
+        order = []
+
+        async def target(name):
+            connection = await pool.get_connection("_")
+            order.append(name)
+            await asyncio.sleep(0)
+            await pool.release(connection)
+
+        tasks = [asyncio.ensure_future(target(name)) for name in "abc"]
+        await asyncio.sleep(0)
+        await pool.release(c1)
+        await asyncio.gather(*tasks)
+        assert order == ["a", "b", "c"]
+        assert pool._available_connections == [c1]
+
+    async def test_wait_timeout(self):
+        pool = self.get_pool(
+            connection_kwargs={"wait": True, "wait_timeout": 0.01},
+            max_connections=1,
+            connection_class=DummyConnection,
+        )
+        await pool.get_connection("_")
+        with pytest.raises(aioredis.ConnectionError):
+            await pool.get_connection("_")
+        assert not pool._waiters
+
+    async def test_cancelled_waiter_passes_connection_on(self):
+        pool = self.get_pool(
+            connection_kwargs={"wait": True},
+            max_connections=1,
+            connection_class=DummyConnection,
+        )
+        c1 = await pool.get_connection("_")
+        cancelled = asyncio.ensure_future(pool.get_connection("_"))
+        waiting = asyncio.ensure_future(pool.get_connection("_"))
+        await asyncio.sleep(0)
+        # the connection is handed to the first waiter, which is then
+        # cancelled before it gets to run
+        await pool.release(c1)
+        cancelled.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await cancelled
+        assert await waiting is c1
+        await pool.release(c1)
+        assert pool._available_connections == [c1]
+        assert not pool._waiters
+
+    async def test_fast_path_skips_probe(self, master_host):
+        pool = aioredis.ConnectionPool(host=master_host, fast_path=True)
+        c1 = await pool.get_connection("_")
+        await pool.release(c1)
+        with mock.patch.object(c1, "can_read") as can_read:
+            c2 = await pool.get_connection("_")
+        assert c1 is c2
+        assert not can_read.called
+        await pool.disconnect()
+
+    async def test_fast_path_resets_dirty_connection(self, master_host):
+        pool = aioredis.ConnectionPool(host=master_host, fast_path=True)
+        c1 = await pool.get_connection("_")
+        await c1.send_command("PING")
+        assert c1.is_dirty
+        await pool.release(c1)
+        c2 = await pool.get_connection("_")
+        assert c1 is c2
+        assert not c2.is_dirty
+        await c2.send_command("ECHO", "clean")
+        assert await c2.read_response() == b"clean"
+        await pool.disconnect()
+
+    async def test_dirty_until_every_pipelined_reply_is_read(self, master_host):
+        pool = aioredis.ConnectionPool(host=master_host, fast_path=True)
+        conn = await pool.get_connection("_")
+        command = conn.pack_commands([("PING",), ("ECHO", "a")])
+        await conn.send_packed_command(command, replies=2)
+        assert await conn.read_response() == b"PONG"
+        assert conn.is_dirty
+        assert await conn.read_response() == b"a"
+        assert not conn.is_dirty
+        await pool.release(conn)
+        await pool.disconnect()
+
+    async def test_warm_opens_idle_connections(self, master_host):
+        pool = aioredis.ConnectionPool(host=master_host, prewarm=3)
+        assert not pool.warmed
+        assert await pool.warm() == 3
+        assert pool.warmed
+        assert len(pool._available_connections) == 3
+        assert all(c.is_connected for c in pool._available_connections)
+        assert await pool.warm() == 0
+        await pool.disconnect()
+
+    async def test_min_idle_refills_in_background(self, master_host):
+        pool = aioredis.ConnectionPool(host=master_host, min_idle=2)
+        await pool.warm()
+        c1 = await pool.get_connection("_")
+        c2 = await pool.get_connection("_")
+        await pool._refill_task
+        assert len(pool._available_connections) == 2
+        assert c1 not in pool._available_connections
+        assert c2 not in pool._available_connections
+        await pool.disconnect()
+
+    async def test_client_warms_pool(self, master_host):
+        pool = aioredis.ConnectionPool(host=master_host, prewarm=2)
+        r = aioredis.Redis(connection_pool=pool)
+        assert await r.ping()
+        assert pool.warmed
+        assert pool._created_connections == 2
+        await pool.disconnect()
+
+    async def test_reap_idle_connections(self, master_host):
+        pool = aioredis.ConnectionPool(host=master_host, max_idle_time=0.05, min_idle=1)
+        await pool.warm(3)
+        connections = list(pool._available_connections)
+        assert await pool.reap() == 0
+        await asyncio.sleep(0.06)
+        assert await pool.reap() == 2
+        assert pool._available_connections == connections[2:]
+        assert pool._created_connections == 1
+        assert not connections[0].is_connected
+        await pool.disconnect()
+
+    async def test_reap_rotates_old_connections_gradually(self, master_host):
+        pool = aioredis.ConnectionPool(host=master_host, max_lifetime=0.05)
+        c1 = await pool.get_connection("_")
+        c2 = await pool.get_connection("_")
+        await pool.release(c2)
+        await pool.release(c1)
+        await asyncio.sleep(0.06)
+        assert await pool.reap() == 1
+        assert pool._available_connections == [c2]
+        assert await pool.reap() == 1
+        assert await pool.reap() == 0
+        await pool.disconnect()
+
+    async def test_reaper_runs_in_background(self, master_host):
+        pool = aioredis.ConnectionPool(
+            host=master_host, max_idle_time=0.01, reap_interval=0.01
+        )
+        await pool.release(await pool.get_connection("_"))
+        assert pool._reaper_task is not None
+        for _ in range(100):
+            if not pool._available_connections:
+                break
+            await asyncio.sleep(0.01)
+        assert pool._created_connections == 0
+        await pool.disconnect()
+        assert pool._reaper_task is None
+
     def test_repr_contains_db_info_tcp(self):
         connection_kwargs = {
             "host": "localhost",
@@ -257,6 +414,36 @@ class TestBlockingConnectionPool:
         c2 = await pool.get_connection("_")
         assert c1 == c2
 
+    async def test_warm_within_max_connections(self):
+        pool = self.get_pool(max_connections=2)
+        assert await pool.warm(5) == 2
+        assert await pool.warm(5) == 0
+        c1 = await pool.get_connection("_")
+        c2 = await pool.get_connection("_")
+        assert {c1, c2} == set(pool._connections)
+
+    async def test_min_idle_refills_in_background(self):
+        pool = self.get_pool(connection_kwargs={"min_idle": 1})
+        await pool.warm()
+        c1 = await pool.get_connection("_")
+        await pool._refill_task
+        c2 = await pool.get_connection("_")
+        assert c1 is not c2
+        assert c2 in pool._connections
+        await pool.disconnect()
+
+    async def test_reap_idle_connections(self):
+        pool = self.get_pool(connection_kwargs={"max_idle_time": 0.05})
+        c1 = await pool.get_connection("_")
+        c2 = await pool.get_connection("_")
+        await pool.release(c1)
+        await asyncio.sleep(0.06)
+        await pool.release(c2)
+        assert await pool.reap() == 1
+        assert pool._connections == [c2]
+        assert await pool.get_connection("_") is c2
+        await pool.disconnect()
+
     def test_repr_contains_db_info_tcp(self):
         pool = aioredis.ConnectionPool(
             host="localhost", port=6379, client_name="test-client"
@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+
+from aioredis.hedging import HedgePolicy
+
+pytestmark = pytest.mark.asyncio
+
+
+def reply(value, delay=0.0, error=None):
+    async def request():
+        await asyncio.sleep(delay)
+        if error is not None:
+            raise error
+        return value
+
+    return request
+
+
+def test_delay():
+    policy = HedgePolicy(percentile=90, initial_delay=0.5, window=100, min_samples=10)
+    assert policy.delay == 0.5
+    for latency in range(1, 101):
+        policy.observe(latency / 1000)
+    assert policy.delay == pytest.approx(0.090)
+    policy.min_delay = 0.2
+    assert policy.delay == 0.2
+
+
+async def test_no_hedge_for_fast_replies():
+    policy = HedgePolicy(initial_delay=0.5)
+    assert await policy.race(reply(1), reply(2)) == 1
+    assert (policy.hedges, policy.hedges_won) == (0, 0)
+
+
+async def test_hedge_wins():
+    policy = HedgePolicy(initial_delay=0.01)
+    slow = asyncio.ensure_future(asyncio.sleep(10))
+
+    async def stalled():
+        await slow
+        return 1
+
+    assert await policy.race(stalled, reply(2)) == 2
+    assert (policy.hedges, policy.hedges_won) == (1, 1)
+    await asyncio.sleep(0)
+    assert slow.cancelled()
+
+
+async def test_hedge_loses():
+    policy = HedgePolicy(initial_delay=0.01)
+    assert await policy.race(reply(1, 0.02), reply(2, 1)) == 1
+    assert (policy.hedges, policy.hedges_won) == (1, 0)
+
+
+async def test_errors():
+    policy = HedgePolicy(initial_delay=0.01)
+    error = ConnectionError("first")
+    # the other request is waited for when one fails
+    assert await policy.race(reply(1, 0.02, error), reply(2, 0.05)) == 2
+    assert await policy.race(reply(1, 0.05), reply(2, 0, ValueError())) == 1
+    with pytest.raises(ConnectionError, match="first"):
+        await policy.race(reply(1, 0.02, error), reply(2, 0, ValueError()))
+    with pytest.raises(ConnectionError, match="first"):
+        await policy.race(reply(1, 0, error), reply(2))
+    assert policy.hedges == 3
@@ -0,0 +1,136 @@
+import asyncio
+
+import pytest
+
+from aioredis.exceptions import ResponseError
+from aioredis.instrumentation import BUCKET_BOUNDS, Histogram, Instrumentation, Metrics
+
+
+class TestHistogram:
+    def test_empty(self):
+        histogram = Histogram()
+        assert histogram.count == 0
+        assert histogram.percentile(99) == 0
+
+    def test_percentiles(self):
+        histogram = Histogram()
+        for _ in range(98):
+            histogram.observe(0.0001)
+        histogram.observe(0.1)
+        histogram.observe(0.3)
+        assert histogram.count == 100
+        assert histogram.total == pytest.approx(0.4098)
+        assert histogram.max == 0.3
+        assert 0.0001 <= histogram.percentile(50) < 0.0002
+        assert 0.1 <= histogram.percentile(99) < 0.2
+        assert histogram.percentile(100) == 0.3
+
+    def test_overflow(self):
+        histogram = Histogram()
+        histogram.observe(BUCKET_BOUNDS[-1] * 2)
+        assert histogram.buckets[-1] == 1
+        assert histogram.percentile(50) == BUCKET_BOUNDS[-1] * 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("direct_transport", [False, True])
+async def test_metrics(create_redis, direct_transport):
+    metrics = Metrics()
+    r = await create_redis(
+        instrumentation=metrics, direct_transport=direct_transport, client_name="m"
+    )
+    await r.set("a", "foo")
+    assert await r.get("a") == b"foo"
+    assert metrics.connects == 1
+    assert metrics.reconnects == 0
+    assert metrics.connect_time.count == metrics.handshake_time.count == 1
+    # the handshake is a single write, with a read for SETNAME and for SELECT
+    handshake_reads = 2 if r.connection_pool.connection_kwargs.get("db") else 1
+    assert metrics.write_time.count == 3
+    assert metrics.read_time.count == 2 + handshake_reads
+    assert metrics.bytes_sent > len(b"*3\r\n$3\r\nSET\r\n$1\r\na\r\n$3\r\nfoo\r\n")
+    assert metrics.bytes_received >= len(b"+OK\r\n$3\r\nfoo\r\n")
+    if not r.single_connection_client:
+        assert metrics.checkout_wait.count == 2
+        assert (metrics.created, metrics.idle, metrics.in_use) == (1, 0, 1)
+
+    await r.connection_pool.disconnect()
+    await r.ping()
+    assert metrics.reconnects == 1
+    assert metrics.snapshot()["connects"] == 2
+
+
+class Recorder(Instrumentation):
+    def __init__(self):
+        self.events = []
+
+    def before_command(self, name, args):
+        self.events.append(("before", name, args))
+
+    def after_command(self, name, duration, error, reply_size):
+        assert duration >= 0
+        self.events.append(("after", name, type(error), reply_size))
+
+
+@pytest.mark.asyncio
+class TestCommandHooks:
+    async def test_commands(self, create_redis):
+        recorder = Recorder()
+        r = await create_redis(instrumentation=recorder)
+        await r.set("a", "foo")
+        await r.rpush("l", "x", "y")
+        await r.lrange("l", 0, -1)
+        with pytest.raises(ResponseError):
+            await r.incr("a")
+        assert recorder.events == [
+            ("before", "SET", ("SET", "a", "foo")),
+            ("after", "SET", type(None), 1),
+            ("before", "RPUSH", ("RPUSH", "l", "x", "y")),
+            ("after", "RPUSH", type(None), 1),
+            ("before", "LRANGE", ("LRANGE", "l", 0, -1)),
+            ("after", "LRANGE", type(None), 2),
+            ("before", "INCRBY", ("INCRBY", "a", 1)),
+            ("after", "INCRBY", ResponseError, 0),
+        ]
+
+    async def test_pipeline_batch(self, create_redis):
+        recorder = Recorder()
+        r = await create_redis(instrumentation=recorder)
+        async with r.pipeline(transaction=False) as pipe:
+            await pipe.set("a", "foo").get("a").execute()
+        assert recorder.events == [
+            ("before", "PIPELINE", (("SET", "a", "foo"), ("GET", "a"))),
+            ("after", "PIPELINE", type(None), 2),
+        ]
+
+    async def test_pubsub(self, create_redis):
+        recorder = Recorder()
+        r = await create_redis(instrumentation=recorder)
+        p = r.pubsub()
+        await p.subscribe("foo")
+        await p.reset()
+        assert recorder.events == [
+            ("before", "SUBSCRIBE", ("SUBSCRIBE", "foo")),
+            ("after", "SUBSCRIBE", type(None), 0),
+        ]
+
+    async def test_context_propagates(self, create_redis):
+        contextvars = pytest.importorskip("contextvars")
+        span = contextvars.ContextVar("span", default=None)
+        spans = []
+
+        class Tracer(Instrumentation):
+            def before_command(self, name, args):
+                span.set(args)
+
+            def after_command(self, name, duration, error, reply_size):
+                spans.append((name, span.get()))
+
+        r = await create_redis(instrumentation=Tracer())
+
+        async def get(key):
+            await r.get(key)
+            return span.get()
+
+        assert await asyncio.gather(get("a"), get("b")) == [("GET", "a"), ("GET", "b")]
+        assert sorted(spans) == [("GET", ("GET", "a")), ("GET", ("GET", "b"))]
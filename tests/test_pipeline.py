@@ -1,7 +1,11 @@
+import asyncio
+
 import pytest
 
 import aioredis
+from aioredis.connection import Encoder, PackedCommands
 
+from .compat import mock
 from .conftest import wait_for_command
 
 pytestmark = pytest.mark.asyncio
@@ -366,3 +370,244 @@ class TestPipeline:
         async with r.pipeline() as pipe:
             await pipe.get("a")
             assert await pipe.execute() == [b"a1"]
+
+    async def test_commands_are_packed_when_queued(self, r):
+        async with r.pipeline() as pipe:
+            pipe.set("a", memoryview(b"a1")).execute_command("CONFIG GET", "port")
+            # a command that can't be encoded is not queued
+            with pytest.raises(aioredis.DataError):
+                pipe.set("b", None)
+            pipe.get("a")
+            assert len(pipe) == len(pipe.packed_commands) == 3
+            packed = aioredis.Connection().pack_commands(
+                args for args, _ in pipe.command_stack
+            )
+            assert pipe.packed_commands.view() == b"".join(packed)
+            assert pipe.packed_commands.view(1, 2) == b"".join(
+                aioredis.Connection().pack_command("CONFIG GET", "port")
+            )
+            response = await pipe.execute()
+            assert response[0] is True
+            assert response[2] == b"a1"
+            assert len(pipe.packed_commands) == 0
+
+    @pytest.mark.parametrize("chunk_size", [None, 2])
+    async def test_packed_commands_are_sent_from_the_buffer(self, r, chunk_size):
+        async with r.pipeline(transaction=False) as pipe:
+            pipe.set("a", 1).get("a").incr("a")
+            with mock.patch.object(
+                PackedCommands, "view", autospec=True, side_effect=PackedCommands.view
+            ) as view:
+                assert await pipe.execute(chunk_size=chunk_size) == [True, b"1", 2]
+            assert view.called
+
+    @pytest.mark.parametrize("chunk_size", [None, 100])
+    async def test_pipeline_arguments_are_encoded_once(self, r, chunk_size):
+        async with r.pipeline(transaction=False) as pipe:
+            pipe.connection = await r.connection_pool.get_connection("MULTI")
+            with mock.patch.object(
+                Encoder, "encode", autospec=True, side_effect=Encoder.encode
+            ) as encode:
+                for i in range(1000):
+                    pipe.set(f"key:{i}", i)
+                assert encode.call_count == 3000
+                await pipe.execute(chunk_size=chunk_size)
+                assert encode.call_count == 3000
+
+    async def test_pipeline_in_chunks(self, r):
+        async with r.pipeline(transaction=False) as pipe:
+            # keep several chunks in flight, but not all of them
+            pipe.MAX_IN_FLIGHT_BYTES = 1024
+            for i in range(1000):
+                pipe.set(f"key:{i}", i)
+            pipe.llen("key:0")
+            for i in range(1000):
+                pipe.get(f"key:{i}")
+            response = await pipe.execute(raise_on_error=False, chunk_size=64)
+        assert response[:1000] == [True] * 1000
+        assert isinstance(response[1000], aioredis.ResponseError)
+        assert response[1001:] == [str(i).encode() for i in range(1000)]
+
+        async with r.pipeline(transaction=False) as pipe:
+            for i in range(100):
+                pipe.incr("counter")
+            pipe.llen("key:0")
+            with pytest.raises(aioredis.ResponseError, match=r"^Command # 101"):
+                await pipe.execute(chunk_size=10)
+        assert await r.get("counter") == b"100"
+
+        with pytest.raises(aioredis.DataError):
+            await r.pipeline().ping().execute(chunk_size=0)
+
+    async def test_pipeline_in_chunks_connection_error(self, r, monkeypatch):
+        async with r.pipeline(transaction=False) as pipe:
+            for i in range(100):
+                pipe.incr("counter")
+            connection = await r.connection_pool.get_connection("MULTI")
+            pipe.connection = connection
+            await connection.connect()
+            send_packed_command = connection.send_packed_command
+            calls = 0
+
+            async def lose_connection(command, check_health=True, replies=1):
+                # the connection is lost after the first chunk was sent
+                nonlocal calls
+                calls += 1
+                if calls > 1:
+                    raise aioredis.ConnectionError("lost")
+                await send_packed_command(command, check_health, replies)
+
+            monkeypatch.setattr(connection, "send_packed_command", lose_connection)
+            with pytest.raises(aioredis.ConnectionError, match="lost"):
+                await pipe.execute(chunk_size=10)
+            monkeypatch.undo()
+        assert await r.get("counter") == b"10"
+
+    async def test_pipeline_in_parallel(self, r):
+        pool = r.connection_pool
+        in_use = set(pool._in_use_connections)
+        await r.mset({f"key:{i}": i for i in range(100)})
+        async with r.pipeline(transaction=False) as pipe:
+            # the slices run in any order, so they must not depend on each other
+            for i in range(100):
+                pipe.get(f"key:{i}")
+            pipe.llen("key:0")
+            for i in range(100):
+                pipe.incr(f"counter:{i}")
+            response = await pipe.execute(raise_on_error=False, parallelism=4)
+        assert response[:100] == [str(i).encode() for i in range(100)]
+        assert isinstance(response[100], aioredis.ResponseError)
+        assert response[101:] == [1] * 100
+        assert len(pool._available_connections) >= 4
+        assert pool._in_use_connections == in_use
+
+        async with r.pipeline(transaction=False) as pipe:
+            for i in range(10):
+                pipe.get(f"key:{i}")
+            pipe.llen("key:0")
+            with pytest.raises(aioredis.ResponseError, match=r"^Command # 11 "):
+                await pipe.execute(parallelism=3, chunk_size=2)
+
+        with pytest.raises(aioredis.RedisError):
+            await r.pipeline().ping().execute(parallelism=2)
+        with pytest.raises(aioredis.DataError):
+            await r.pipeline(transaction=False).ping().execute(parallelism=0)
+
+    async def test_pipeline_in_parallel_timeout(self, create_redis, monkeypatch):
+        r = await create_redis(retry_on_timeout=True)
+        pool = r.connection_pool
+        connection = await pool.get_connection("MULTI")
+        get_connection = pool.get_connection
+
+        async def time_out(*args, **kwargs):
+            raise aioredis.TimeoutError("timed out")
+
+        async def get_timing_out_connection(*args, **kwargs):
+            conn = await get_connection(*args, **kwargs)
+            monkeypatch.setattr(conn, "send_packed_command", time_out)
+            return conn
+
+        monkeypatch.setattr(pool, "get_connection", get_timing_out_connection)
+        async with r.pipeline(transaction=False) as pipe:
+            pipe.connection = connection
+            for _ in range(4):
+                pipe.incr("counter")
+            with pytest.raises(aioredis.TimeoutError):
+                await pipe.execute(parallelism=2)
+            # only the slice that failed is closed, and none is retried
+            assert connection.is_connected
+        monkeypatch.undo()
+        assert await r.get("counter") == b"2"
+
+    @pytest.mark.parametrize("chunk_size", [None, 3])
+    async def test_execute_iter(self, r, chunk_size):
+        await r.set("a", 1)
+        async with r.pipeline(transaction=False) as pipe:
+            pipe.set("b", 2).get("a").llen("a").incr("a").get("b")
+            results = []
+            async for result in pipe.execute_iter(False, chunk_size):
+                results.append(result)
+            assert len(pipe) == 0
+        assert results[:2] == [True, b"1"]
+        assert isinstance(results[2], aioredis.ResponseError)
+        assert results[3:] == [2, b"2"]
+
+        async with r.pipeline(transaction=False) as pipe:
+            pipe.get("a").llen("a").incr("a")
+            results = []
+            with pytest.raises(aioredis.ResponseError) as ex:
+                async for result in pipe.execute_iter(chunk_size=chunk_size):
+                    results.append(result)
+            assert str(ex.value).startswith(
+                "Command # 2 (LLEN a) of pipeline caused error: "
+            )
+        assert results == [b"2"]
+        # the commands after the error were executed
+        assert await r.get("a") == b"3"
+
+    async def test_execute_iter_stopped_early(self, r):
+        async with r.pipeline(transaction=False) as pipe:
+            for i in range(100):
+                pipe.incr("counter")
+            replies = pipe.execute_iter(chunk_size=10)
+            assert await replies.__anext__() == 1
+            await replies.aclose()
+            assert pipe.connection is None
+            assert len(pipe) == 0
+            # the pipeline can still be used, and some commands were executed
+            [counter] = await pipe.get("counter").execute()
+            assert 1 <= int(counter) <= 100
+
+    async def test_execute_iter_empty(self, r):
+        async with r.pipeline(transaction=False) as pipe:
+            with mock.patch.object(r.connection_pool, "get_connection") as get:
+                assert [reply async for reply in pipe.execute_iter()] == []
+            assert not get.called
+
+    async def test_execute_iter_transaction(self, r):
+        async with r.pipeline() as pipe:
+            with pytest.raises(aioredis.RedisError):
+                async for _ in pipe.get("a").execute_iter():
+                    pass
+
+
+class TestAutoPipeline:
+    @pytest.fixture()
+    async def auto(self, r):
+        client = aioredis.Redis(connection_pool=r.connection_pool, auto_pipeline=True)
+        yield client
+        await client.auto_pipeline.close()
+
+    async def test_concurrent_commands_share_a_connection(self, auto):
+        pool = auto.connection_pool
+        created = pool._created_connections
+        replies = await asyncio.gather(*(auto.incr("a") for _ in range(100)))
+        assert replies == list(range(1, 101))
+        assert pool._created_connections - created <= 1
+
+    async def test_errors_are_returned_in_order(self, auto):
+        await auto.set("a", "1")
+        replies = await asyncio.gather(
+            auto.get("a"), auto.lpush("a", "x"), auto.get("a"), return_exceptions=True
+        )
+        assert replies[0] == replies[2] == b"1"
+        assert isinstance(replies[1], aioredis.ResponseError)
+
+    async def test_recovers_from_a_lost_connection(self, auto):
+        await auto.set("a", "1")
+        await auto.auto_pipeline.connection.disconnect()
+        assert await auto.get("a") == b"1"
+
+    async def test_reconnects_after_a_server_drop(self, auto, r):
+        await auto.set("a", "1")
+        client_id = await auto.client_id()
+        await r.client_kill_filter(_id=client_id)
+        await asyncio.sleep(0.05)
+        assert await auto.get("a") == b"1"
+        assert await auto.client_id() != client_id
+
+    async def test_blocking_commands_use_the_pool(self, auto):
+        task = asyncio.ensure_future(auto.blpop("q", timeout=1))
+        await asyncio.sleep(0.1)
+        assert await auto.rpush("q", "x") == 1
+        assert await task == (b"q", b"x")
@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+
+import aioredis
+from aioredis.hedging import HedgePolicy
+from aioredis.readwrite import ReadWriteRedis
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture()
+async def master(create_redis):
+    return await create_redis()
+
+
+@pytest.fixture()
+async def replica(create_redis):
+    # a separate database stands in for a replica, so that the reads it
+    # serves can be told apart
+    return await create_redis(db=10)
+
+
+class TestReadWriteRedis:
+    async def test_routing(self, master, replica):
+        redis = ReadWriteRedis(master, [replica])
+        assert await redis.set("foo", "bar")
+        assert await master.get("foo") == b"bar"
+        assert await redis.get("foo") is None
+        await replica.set("foo", "replica")
+        assert await redis.get("foo") == b"replica"
+        assert await redis.mget("foo", "missing") == [b"replica", None]
+        assert await redis.incr("counter") == 1
+        assert await master.get("counter") == b"1"
+        async with redis.pipeline() as pipe:
+            assert await pipe.get("foo").execute() == [b"bar"]
+
+    async def test_read_only_commands(self, master):
+        redis = ReadWriteRedis(master)
+        await redis.initialize()
+        keys = redis.command_keys
+        assert keys.is_readonly("GET", "foo")
+        assert keys.is_readonly("ZRANGE", "foo", 0, -1)
+        assert not keys.is_readonly("SET", "foo", "bar")
+        assert not keys.is_readonly("UNKNOWN")
+
+    async def test_read_your_writes(self, master, replica):
+        redis = ReadWriteRedis(master, replica, read_your_writes=10)
+        await redis.set("foo", "bar")
+        assert await redis.get("foo") == b"bar"
+        redis.read_your_writes = 0
+        assert await redis.get("foo") is None
+
+    async def test_fallback_to_master(self, master, replica):
+        down = aioredis.Redis(port=1)
+        redis = ReadWriteRedis(master, [down, replica])
+        await master.set("foo", "bar")
+        await replica.set("foo", "replica")
+        assert [await redis.get("foo") for _ in range(4)] == [b"replica"] * 4
+        redis = ReadWriteRedis(master, [down])
+        assert await redis.get("foo") == b"bar"
+
+    async def test_hedged_reads(self, master, replica, create_redis):
+        class StalledRedis(aioredis.Redis):
+            async def execute_command(self, *args, **options):
+                await asyncio.sleep(10)
+
+        stalled = StalledRedis(connection_pool=replica.connection_pool)
+        hedge = HedgePolicy(initial_delay=0.01)
+        redis = ReadWriteRedis(master, [stalled, replica], hedge=hedge)
+        await replica.set("foo", "replica")
+        assert [await redis.get("foo") for _ in range(4)] == [b"replica"] * 4
+        assert hedge.hedges == hedge.hedges_won == 2
+
+    async def test_hedged_read_falls_back_on_unhedged_replica(self, master, replica):
+        down = aioredis.Redis(port=1)
+        hedge = HedgePolicy(initial_delay=10)
+        redis = ReadWriteRedis(master, [down, replica], hedge=hedge)
+        await master.set("foo", "bar")
+        await replica.set("foo", "replica")
+        assert [await redis.get("foo") for _ in range(2)] == [b"replica"] * 2
+        assert hedge.hedges == 0
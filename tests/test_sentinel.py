@@ -1,10 +1,14 @@
+import asyncio
 import socket
 
 import pytest
 
 import aioredis.sentinel
 from aioredis import exceptions
+from aioredis.hedging import HedgePolicy
 from aioredis.sentinel import (
+    HedgedSlaveRedis,
+    LatencySlaveSelector,
     MasterNotFoundError,
     Sentinel,
     SentinelConnectionPool,
@@ -25,17 +29,42 @@ class SentinelTestClient:
         self.id = id
 
     async def sentinel_masters(self):
+        self.cluster.queries += 1
+        await self.cluster.sleep_if_slow(self)
         self.cluster.connection_error_if_down(self)
         self.cluster.timeout_if_down(self)
+        self.cluster.replies += 1
         return {self.cluster.service_name: self.cluster.master}
 
     async def sentinel_slaves(self, master_name):
+        await self.cluster.sleep_if_slow(self)
         self.cluster.connection_error_if_down(self)
         self.cluster.timeout_if_down(self)
         if master_name != self.cluster.service_name:
             return []
         return self.cluster.slaves
 
+    def pubsub(self):
+        return SentinelTestPubSub(self.cluster)
+
+
+class SentinelTestPubSub:
+    def __init__(self, cluster):
+        self.cluster = cluster
+        self.messages = asyncio.Queue()
+
+    async def subscribe(self, *channels):
+        self.cluster.pubsubs.append(self)
+
+    async def get_message(self, ignore_subscribe_messages=False, timeout=0.0):
+        try:
+            return await asyncio.wait_for(self.messages.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def reset(self):
+        self.cluster.pubsubs.remove(self)
+
 
 class SentinelTestCluster:
     def __init__(self, service_name="mymaster", ip="127.0.0.1", port=6379):
@@ -52,6 +81,17 @@ class SentinelTestCluster:
         self.slaves = []
         self.nodes_down = set()
         self.nodes_timeout = set()
+        self.nodes_slow = set()
+        self.queries = 0
+        self.replies = 0
+        self.pubsubs = []
+        self.slow_nodes_done = asyncio.Event()
+
+    def publish(self, channel, data):
+        for pubsub in self.pubsubs:
+            pubsub.messages.put_nowait(
+                {"type": "message", "channel": channel, "data": data}
+            )
 
     def connection_error_if_down(self, node):
         if node.id in self.nodes_down:
@@ -61,6 +101,10 @@ class SentinelTestCluster:
         if node.id in self.nodes_timeout:
             raise exceptions.TimeoutError
 
+    async def sleep_if_slow(self, node):
+        if node.id in self.nodes_slow:
+            await self.slow_nodes_done.wait()
+
     def client(self, host, port, **kwargs):
         return SentinelTestClient(self, (host, port))
 
@@ -72,6 +116,7 @@ async def cluster(master_ip):
     saved_Redis = aioredis.sentinel.Redis
     aioredis.sentinel.Redis = cluster.client
     yield cluster
+    cluster.slow_nodes_done.set()
     aioredis.sentinel.Redis = saved_Redis
 
 
@@ -108,6 +153,87 @@ async def test_discover_master_sentinel_timeout(cluster, sentinel, master_ip):
     assert sentinel.sentinels[0].id == ("bar", 26379)
 
 
+async def test_discover_master_sentinel_slow(cluster, sentinel, master_ip):
+    # 'foo' would answer after 'bar'
+    cluster.nodes_slow.add(("foo", 26379))
+    address = await asyncio.wait_for(sentinel.discover_master("mymaster"), 1)
+    assert address == (master_ip, 6379)
+    assert sentinel.sentinels[0].id == ("bar", 26379)
+
+
+async def test_slow_sentinel_query_is_cancelled(cluster, sentinel, master_ip):
+    cluster.nodes_slow.add(("foo", 26379))
+    address = await asyncio.wait_for(sentinel.discover_master("mymaster"), 1)
+    assert address == (master_ip, 6379)
+    assert cluster.replies == 1
+    assert asyncio.all_tasks() == {asyncio.current_task()}
+    cluster.slow_nodes_done.set()
+    await asyncio.sleep(0)
+    assert cluster.replies == 1
+
+
+async def test_master_min_agreeing_sentinels(cluster, master_ip):
+    sentinel = Sentinel([("foo", 26379), ("bar", 26379)], min_agreeing_sentinels=2)
+    assert await sentinel.discover_master("mymaster") == (master_ip, 6379)
+    cluster.nodes_down.add(("foo", 26379))
+    with pytest.raises(MasterNotFoundError):
+        await sentinel.discover_master("mymaster")
+
+
+@pytest.fixture()
+async def cached_sentinel(cluster):
+    sentinel = Sentinel(
+        [("foo", 26379), ("bar", 26379)], topology_ttl=10, watch_topology=True
+    )
+    yield sentinel
+    await sentinel.close()
+    assert not cluster.pubsubs
+
+
+async def wait_until(predicate):
+    for _ in range(100):
+        if predicate():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("timed out")
+
+
+async def test_topology_cache(cluster, cached_sentinel, master_ip):
+    addresses = await asyncio.gather(
+        *(cached_sentinel.discover_master("mymaster") for _ in range(10))
+    )
+    assert addresses == [(master_ip, 6379)] * 10
+    assert cluster.queries == 2
+    assert await cached_sentinel.discover_master("mymaster") == (master_ip, 6379)
+    assert cluster.queries == 2
+
+    # a down master is looked up again
+    await wait_until(lambda: cluster.pubsubs)
+    cluster.publish("+sdown", f"master mymaster {master_ip} 6379")
+    await wait_until(lambda: not cached_sentinel._topology)
+    await cached_sentinel.discover_master("mymaster")
+    assert cluster.queries == 4
+
+
+async def test_switch_master_event(cluster, cached_sentinel, master_ip):
+    master = cached_sentinel.master_for("mymaster")
+    pool = master.connection_pool
+    assert await pool.get_master_address() == (master_ip, 6379)
+    await wait_until(lambda: cluster.pubsubs)
+    cluster.publish("+switch-master", f"mymaster {master_ip} 6379 10.0.0.1 6380")
+    await wait_until(lambda: pool.master_address == ("10.0.0.1", 6380))
+    queries = cluster.queries
+    assert await cached_sentinel.discover_master("mymaster") == ("10.0.0.1", 6380)
+    assert cluster.queries == queries
+
+
+async def test_topology_is_not_watched_by_default(cluster, master_ip):
+    sentinel = Sentinel([("foo", 26379)], topology_ttl=10)
+    assert await sentinel.discover_master("mymaster") == (master_ip, 6379)
+    assert sentinel._watcher is None
+    assert not cluster.pubsubs
+
+
 async def test_master_min_other_sentinels(cluster, master_ip):
     sentinel = Sentinel([("foo", 26379)], min_other_sentinels=1)
     # min_other_sentinels
@@ -167,6 +293,14 @@ async def test_discover_slaves(cluster, sentinel):
         ("slave0", 1234),
         ("slave1", 1234),
     ]
+    cluster.nodes_timeout.clear()
+
+    # node0 -> SLOW
+    cluster.nodes_slow.add(("foo", 26379))
+    assert await asyncio.wait_for(sentinel.discover_slaves("mymaster"), 1) == [
+        ("slave0", 1234),
+        ("slave1", 1234),
+    ]
 
 
 async def test_master_for(cluster, sentinel, master_ip):
@@ -187,6 +321,36 @@ async def test_slave_for(cluster, sentinel):
     assert await slave.ping()
 
 
+async def test_read_write_for(cluster, sentinel, master_ip):
+    redis = sentinel.read_write_for("mymaster", db=9)
+    # without slaves, reads go to the master
+    assert await redis.set("foo", "bar")
+    assert await redis.get("foo") == b"bar"
+    assert redis.master.connection_pool.master_address == (master_ip, 6379)
+    await redis.delete("foo")
+    await redis.close()
+
+
+async def test_slave_for_hedge(cluster, sentinel):
+    # two addresses of the same server stand in for two slaves
+    cluster.slaves = [
+        {"ip": "127.0.0.1", "port": 6379, "is_odown": False, "is_sdown": False},
+        {"ip": "localhost", "port": 6379, "is_odown": False, "is_sdown": False},
+    ]
+    hedge = HedgePolicy(initial_delay=0)
+    slave = sentinel.slave_for("mymaster", db=9, hedge=hedge)
+    assert isinstance(slave, HedgedSlaveRedis)
+    assert await slave.get("foo") is None
+    assert hedge.hedges == 1
+    pool = slave.connection_pool
+    hosts = {connection.host for connection in pool._available_connections}
+    assert hosts == {"127.0.0.1", "localhost"}
+    # commands that are not read-only are not hedged
+    assert await slave.ping()
+    assert hedge.hedges == 1
+    await slave.close()
+
+
 async def test_slave_for_slave_not_found_error(cluster, sentinel):
     cluster.master["is_odown"] = True
     slave = sentinel.slave_for("mymaster", db=9)
@@ -207,3 +371,58 @@ async def test_slave_round_robin(cluster, sentinel, master_ip):
     assert await rotator.__anext__() == (master_ip, 6379)
     with pytest.raises(SlaveNotFoundError):
         await rotator.__anext__()
+
+
+def test_latency_slave_selector():
+    a, b, c = ("a", 6379), ("b", 6379), ("c", 6379)
+    selector = LatencySlaveSelector(smoothing=0.5)
+    selector.observe(a, 0.010)
+    selector.observe(b, 0.002)
+    # c has not been measured yet
+    assert selector.order([a, b, c]) == [c, b, a]
+    selector.observe(c, 0.020)
+    selector.observe(b, 0.030)
+    assert selector.latencies[b] == pytest.approx(0.016)
+    assert selector.order([a, b, c]) == [a, b, c]
+    selector.failed(a)
+    assert selector.order([a, b, c]) == [b, c, a]
+
+
+async def test_slave_lag_filters(cluster):
+    cluster.slaves = [
+        {
+            "ip": f"slave{i}",
+            "port": 1234,
+            "is_odown": False,
+            "is_sdown": False,
+            "master-link-down-time": down_time,
+            "slave-repl-offset": offset,
+        }
+        for i, (down_time, offset) in enumerate([(0, 1000), (5000, 900), (0, 10)])
+    ]
+    sentinel = Sentinel([("foo", 26379)], max_slave_lag=1)
+    assert await sentinel.discover_slaves("mymaster") == [
+        ("slave0", 1234),
+        ("slave2", 1234),
+    ]
+    sentinel = Sentinel([("foo", 26379)], max_slave_offset_lag=100)
+    assert await sentinel.discover_slaves("mymaster") == [
+        ("slave0", 1234),
+        ("slave1", 1234),
+    ]
+
+
+async def test_slave_for_latency_selector(cluster, sentinel):
+    cluster.slaves = [
+        {"ip": "127.0.0.1", "port": 6379, "is_odown": False, "is_sdown": False},
+    ]
+    selector = LatencySlaveSelector()
+    slave = sentinel.slave_for("mymaster", db=9, slave_selector=selector)
+    assert await slave.get("foo") is None
+    # measured by the PING sent on connect
+    assert selector.latencies[("127.0.0.1", 6379)] > 0
+    assert await slave.ping()
+    # blocking commands are not measured
+    assert await slave.blpop("foo", timeout=0.2) is None
+    assert selector.latencies[("127.0.0.1", 6379)] < 0.02
+    await slave.close()
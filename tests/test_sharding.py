@@ -0,0 +1,89 @@
+import pytest
+
+from aioredis.exceptions import DataError, RedisError
+from aioredis.sharding import HashRing, ShardedRedis
+
+pytestmark = pytest.mark.asyncio
+
+KEYS = [f"key:{i}" for i in range(2000)]
+
+
+class TestHashRing:
+    def test_balance(self):
+        ring = HashRing(["a", "b", "c"])
+        counts = {"a": 0, "b": 0, "c": 0}
+        for key in KEYS:
+            counts[ring.get_node(key)] += 1
+        assert all(count > len(KEYS) / 5 for count in counts.values())
+
+    def test_adding_a_node_only_moves_its_keys(self):
+        ring = HashRing(["a", "b", "c"])
+        before = {key: ring.get_node(key) for key in KEYS}
+        ring.add_node("d")
+        moved = [key for key in KEYS if ring.get_node(key) != before[key]]
+        assert all(ring.get_node(key) == "d" for key in moved)
+        assert len(KEYS) / 8 < len(moved) < len(KEYS) / 3
+        ring.remove_node("d")
+        assert {key: ring.get_node(key) for key in KEYS} == before
+
+    def test_hash_tags(self):
+        ring = HashRing(["a", "b", "c"])
+        assert len({ring.get_node(f"{{user1000}}.{i}") for i in range(50)}) == 1
+
+    def test_errors(self):
+        with pytest.raises(RedisError):
+            HashRing().get_node("foo")
+        with pytest.raises(DataError):
+            HashRing(["a", "a"])
+
+
+@pytest.fixture()
+async def sharded(create_redis):
+    shards = {"a": await create_redis(), "b": await create_redis(db=10)}
+    yield ShardedRedis(shards)
+
+
+class TestShardedRedis:
+    async def test_routing(self, sharded):
+        keys = KEYS[:20]
+        for key in keys:
+            await sharded.set(key, key)
+        assert {sharded.ring.get_node(key) for key in keys} == {"a", "b"}
+        for key in keys:
+            assert await sharded.get_shard(key).get(key) == key.encode()
+            assert await sharded.get(key) == key.encode()
+        assert await sharded.dbsize() == len(keys)
+        assert sorted(await sharded.keys("key:*")) == sorted(k.encode() for k in keys)
+
+    async def test_split_commands(self, sharded):
+        keys = KEYS[:20]
+        assert await sharded.mset({key: i for i, key in enumerate(keys)})
+        assert await sharded.mget(keys + ["missing"]) == [
+            str(i).encode() for i in range(len(keys))
+        ] + [None]
+        assert await sharded.mget(keys[0]) == [b"0"]
+        assert await sharded.exists(*keys, keys[0], "missing") == len(keys) + 1
+        assert await sharded.delete(*keys[:10]) == 10
+        assert await sharded.unlink(*keys) == 10
+        assert await sharded.exists(*keys) == 0
+
+    async def test_cross_shard_command(self, sharded):
+        a = next(key for key in KEYS if sharded.ring.get_node(key) == "a")
+        b = next(key for key in KEYS if sharded.ring.get_node(key) == "b")
+        with pytest.raises(DataError):
+            await sharded.sunion(a, b)
+        await sharded.sadd("{x}1", 1)
+        await sharded.sadd("{x}2", 2)
+        assert await sharded.sunion("{x}1", "{x}2") == {b"1", b"2"}
+
+    async def test_keyless_commands(self, sharded):
+        assert await sharded.ping()
+        with pytest.raises(RedisError):
+            sharded.pipeline()
+
+    async def test_shard_names(self, create_redis):
+        clients = [await create_redis(), await create_redis(db=10)]
+        sharded = ShardedRedis(clients)
+        assert list(sharded.shards) == ["localhost:6379/9", "localhost:6379/10"]
+        with pytest.raises(RedisError):
+            ShardedRedis([clients[0], clients[0]])
@@ -0,0 +1,93 @@
+import pytest
+
+from aioredis import slots
+from aioredis.exceptions import DataError
+from aioredis.slots import (
+    NUMPY_AVAILABLE,
+    NUMPY_MAX_KEY_LENGTH,
+    SLOT_COUNT,
+    crc16,
+    group_by_slot,
+    key_slot,
+    key_slots,
+    partition_keys,
+    partition_pairs,
+)
+
+from .compat import mock
+
+
+def test_crc16():
+    assert crc16(b"123456789") == 0x31C3
+    assert crc16(b"") == 0
+
+
+def test_key_slot():
+    assert key_slot(b"foo") == 12182
+    assert key_slot(b"123456789") == 0x31C3 % SLOT_COUNT
+    assert key_slot("foo") == key_slot(memoryview(b"foo")) == 12182
+    assert key_slot("é") == key_slot("é".encode())
+    assert key_slot(12) == key_slot(b"12")
+    with pytest.raises(DataError):
+        key_slot(True)
+
+
+def test_hash_tags():
+    assert key_slot(b"{user1000}.following") == key_slot(b"user1000")
+    assert key_slot(b"foo{bar}{zap}") == key_slot(b"bar")
+    assert key_slot(b"foo{{bar}}zap") == key_slot(b"{bar")
+    # empty or unterminated tags hash the whole key
+    assert key_slot(b"foo{}{bar}") == crc16(b"foo{}{bar}") % SLOT_COUNT
+    assert key_slot(b"foo{bar") == crc16(b"foo{bar") % SLOT_COUNT
+
+
+KEYS = [f"user:{i}" for i in range(500)] + [
+    b"",
+    b"{a}b",
+    memoryview(b"x" * 40),
+    b"z" * NUMPY_MAX_KEY_LENGTH,
+    b"z" * 1500,
+    b"y" * 2000,
+]
+
+
+@pytest.mark.parametrize(
+    "use_numpy",
+    [
+        False,
+        pytest.param(
+            True,
+            marks=pytest.mark.skipif(
+                not NUMPY_AVAILABLE, reason="numpy is not installed"
+            ),
+        ),
+    ],
+)
+def test_key_slots(use_numpy):
+    assert key_slots(KEYS, use_numpy) == [key_slot(key) for key in KEYS]
+    assert key_slots([], use_numpy) == []
+
+
+@pytest.mark.skipif(not NUMPY_AVAILABLE, reason="numpy is not installed")
+def test_numpy_key_slots_skip_long_keys():
+    with mock.patch.object(
+        slots, "_numpy_crc16", side_effect=slots._numpy_crc16
+    ) as numpy_crc16:
+        key_slots(KEYS, use_numpy=True)
+    hashed = [len(key) for call in numpy_crc16.call_args_list for key in call[0][0]]
+    assert max(hashed) == NUMPY_MAX_KEY_LENGTH
+
+
+def test_group_by_slot():
+    keys = ["{a}1", "b", "{a}2"]
+    assert group_by_slot(keys) == {key_slot("a"): [0, 2], key_slot("b"): [1]}
+    assert partition_keys(keys) == {
+        key_slot("a"): ["{a}1", "{a}2"],
+        key_slot("b"): ["b"],
+    }
+
+
+def test_partition_pairs():
+    expected = {key_slot("a"): ["{a}1", 1, "{a}2", 2], key_slot("b"): ["b", 3]}
+    assert partition_pairs({"{a}1": 1, "b": 3, "{a}2": 2}) == expected
+    assert partition_pairs([("{a}1", 1), ("b", 3), ("{a}2", 2)]) == expected